@@ -1,2 +1,9 @@
 # Archivo de inicialización del proyecto Logistica HR
 
+# Cargar Celery al iniciar Django para que shared_task use la configuración del proyecto
+try:
+    from .celery import app as celery_app
+except ImportError:  # Celery no se instala en la configuración simple de desarrollo
+    celery_app = None
+
+__all__ = ['celery_app']
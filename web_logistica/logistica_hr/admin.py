@@ -6,17 +6,30 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
+from logistica_hr.core.pagination import EstimatedCountPaginator
 from logistica_hr.users.models import User
-from logistica_hr.employees.models import Department, Position, Employee, WorkSchedule
-from logistica_hr.tasks.models import TaskCategory, Task, TaskTimeLog, TaskComment
+from logistica_hr.employees.models import Department, Position, Qualification, Employee, WorkSchedule
+from logistica_hr.tasks.models import TaskCategory, Task, TaskTimeLog, TaskComment, TaskStatusChange
 from logistica_hr.performance.models import (
-    PerformanceMetric, EmployeePerformance, DailyWorkLog, PerformanceEvaluation
+    PerformanceMetric, EmployeePerformance, DailyWorkLog, PerformanceEvaluation,
+    ProductivityRollup, ScoreRecomputeJob, AttendanceException, AttendanceReconciliationRun
 )
 from logistica_hr.reports.models import (
     ReportTemplate, ScheduledReport, GeneratedReport, ReportParameter
 )
 
 
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Admin base para tablas grandes
+
+    No ejecuta el COUNT(*) adicional del total al filtrar y, sin filtros,
+    usa el conteo estimado de PostgreSQL.
+    """
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     """
@@ -48,8 +61,9 @@ class DepartmentAdmin(admin.ModelAdmin):
     """
     list_display = ['name', 'manager', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at']
-    search_fields = ['name', 'description']
+    search_fields = ['^name']
     ordering = ['name']
+    list_select_related = ['manager']
 
 
 @admin.register(Position)
@@ -59,8 +73,21 @@ class PositionAdmin(admin.ModelAdmin):
     """
     list_display = ['name', 'department', 'base_salary', 'is_active']
     list_filter = ['department', 'is_active']
-    search_fields = ['name', 'description']
+    search_fields = ['^name']
     ordering = ['department', 'name']
+    list_select_related = ['department']
+
+
+@admin.register(Qualification)
+class QualificationAdmin(admin.ModelAdmin):
+    """
+    Admin para el modelo Qualification
+    """
+    list_display = ['name', 'kind', 'code', 'is_active']
+    list_filter = ['kind', 'is_active']
+    search_fields = ['^code', '^name']
+    ordering = ['kind', 'name']
+    readonly_fields = ['code']
 
 
 @admin.register(Employee)
@@ -73,9 +100,10 @@ class EmployeeAdmin(admin.ModelAdmin):
         'hire_date', 'is_active'
     ]
     list_filter = ['position__department', 'is_active', 'hire_date']
-    search_fields = ['employee_id', 'user__username', 'user__first_name', 'user__last_name']
+    search_fields = ['employee_id', '^user__username', '^user__first_name', '^user__last_name']
     ordering = ['employee_id']
     raw_id_fields = ['user', 'position', 'supervisor']
+    list_select_related = ['user', 'position__department', 'supervisor']
 
 
 @admin.register(WorkSchedule)
@@ -85,8 +113,16 @@ class WorkScheduleAdmin(admin.ModelAdmin):
     """
     list_display = ['employee', 'day_of_week', 'start_time', 'end_time', 'total_hours']
     list_filter = ['day_of_week', 'employee__position__department']
-    search_fields = ['employee__user__first_name', 'employee__user__last_name']
+    search_fields = ['employee__employee_id', '^employee__user__first_name', '^employee__user__last_name']
     ordering = ['employee', 'day_of_week']
+    list_select_related = ['employee__user']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_total_hours()
+
+    @admin.display(description=_('Total Horas'), ordering='total_hours_db')
+    def total_hours(self, obj):
+        return round(obj.total_hours_db, 2)
 
 
 @admin.register(TaskCategory)
@@ -96,12 +132,12 @@ class TaskCategoryAdmin(admin.ModelAdmin):
     """
     list_display = ['name', 'metric_type', 'priority', 'color', 'is_active']
     list_filter = ['metric_type', 'priority', 'is_active']
-    search_fields = ['name', 'description']
+    search_fields = ['^name']
     ordering = ['priority', 'name']
 
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(LargeTableAdmin):
     """
     Admin para el modelo Task
     """
@@ -110,34 +146,71 @@ class TaskAdmin(admin.ModelAdmin):
         'estimated_hours', 'actual_hours', 'is_overdue'
     ]
     list_filter = ['status', 'priority', 'category', 'assigned_to__position__department']
-    search_fields = ['title', 'description', 'assigned_to__user__first_name']
+    search_fields = ['title', 'assigned_to__employee_id', '^assigned_to__user__first_name']
     ordering = ['-due_date', 'priority']
     raw_id_fields = ['assigned_to', 'assigned_by']
     readonly_fields = ['start_date', 'completion_date', 'is_overdue']
+    list_select_related = ['assigned_to__user']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_is_overdue()
+
+    @admin.display(description=_('Vencida'), boolean=True, ordering='is_overdue_db')
+    def is_overdue(self, obj):
+        return obj.is_overdue_db
 
 
 @admin.register(TaskTimeLog)
-class TaskTimeLogAdmin(admin.ModelAdmin):
+class TaskTimeLogAdmin(LargeTableAdmin):
     """
     Admin para el modelo TaskTimeLog
     """
     list_display = ['task', 'employee', 'start_time', 'end_time', 'duration_hours', 'is_break']
-    list_filter = ['is_break', 'start_time__date', 'employee__position__department']
-    search_fields = ['task__title', 'employee__user__first_name']
+    list_filter = ['is_break', 'start_time', 'employee__position__department']
+    search_fields = ['task__title', 'employee__employee_id', '^employee__user__first_name']
     ordering = ['-start_time']
     raw_id_fields = ['task', 'employee']
+    list_select_related = ['task__assigned_to__user', 'employee__user']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_duration_hours()
+
+    @admin.display(description=_('Duración (horas)'), ordering='duration_hours_db')
+    def duration_hours(self, obj):
+        if obj.duration_hours_db is None:
+            return None
+        return round(obj.duration_hours_db, 2)
 
 
 @admin.register(TaskComment)
-class TaskCommentAdmin(admin.ModelAdmin):
+class TaskCommentAdmin(LargeTableAdmin):
     """
     Admin para el modelo TaskComment
     """
     list_display = ['task', 'author', 'is_internal', 'created_at']
     list_filter = ['is_internal', 'created_at']
-    search_fields = ['task__title', 'author__username', 'content']
+    search_fields = ['task__title', '^author__username']
     ordering = ['-created_at']
     raw_id_fields = ['task', 'author']
+    list_select_related = ['task__assigned_to__user', 'author']
+
+
+@admin.register(TaskStatusChange)
+class TaskStatusChangeAdmin(LargeTableAdmin):
+    """
+    Admin para el modelo TaskStatusChange (solo lectura)
+    """
+    list_display = ['task', 'from_status', 'to_status', 'changed_by', 'created_at']
+    list_filter = ['to_status', 'created_at']
+    search_fields = ['task__title', '^changed_by__username']
+    ordering = ['-created_at']
+    list_select_related = ['task__assigned_to__user', 'changed_by']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(PerformanceMetric)
@@ -147,12 +220,12 @@ class PerformanceMetricAdmin(admin.ModelAdmin):
     """
     list_display = ['name', 'metric_type', 'unit', 'target_value', 'weight', 'is_active']
     list_filter = ['metric_type', 'is_active']
-    search_fields = ['name', 'description']
+    search_fields = ['^name']
     ordering = ['metric_type', 'name']
 
 
 @admin.register(EmployeePerformance)
-class EmployeePerformanceAdmin(admin.ModelAdmin):
+class EmployeePerformanceAdmin(LargeTableAdmin):
     """
     Admin para el modelo EmployeePerformance
     """
@@ -161,14 +234,24 @@ class EmployeePerformanceAdmin(admin.ModelAdmin):
         'performance_score', 'is_above_target'
     ]
     list_filter = ['metric__metric_type', 'date', 'employee__position__department']
-    search_fields = ['employee__user__first_name', 'metric__name']
+    search_fields = ['employee__employee_id', '^employee__user__first_name', '^metric__name']
     ordering = ['-date', 'employee']
     raw_id_fields = ['employee', 'metric', 'evaluated_by']
     readonly_fields = ['performance_score', 'is_above_target']
+    list_select_related = ['employee__user', 'metric']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_performance_score()
+
+    @admin.display(description=_('Puntaje de Rendimiento'), ordering='performance_score_db')
+    def performance_score(self, obj):
+        if obj.performance_score_db is None:
+            return None
+        return round(obj.performance_score_db, 2)
 
 
 @admin.register(DailyWorkLog)
-class DailyWorkLogAdmin(admin.ModelAdmin):
+class DailyWorkLogAdmin(LargeTableAdmin):
     """
     Admin para el modelo DailyWorkLog
     """
@@ -177,9 +260,10 @@ class DailyWorkLogAdmin(admin.ModelAdmin):
         'packages_processed', 'trucks_received', 'productivity_score'
     ]
     list_filter = ['date', 'employee__position__department']
-    search_fields = ['employee__user__first_name', 'notes']
+    search_fields = ['employee__employee_id', '^employee__user__first_name']
     ordering = ['-date', 'employee']
     raw_id_fields = ['employee']
+    list_select_related = ['employee__user']
     readonly_fields = ['total_work_time', 'productivity_score', 'efficiency_percentage']
 
 
@@ -193,12 +277,96 @@ class PerformanceEvaluationAdmin(admin.ModelAdmin):
         'overall_score', 'evaluated_by'
     ]
     list_filter = ['evaluation_type', 'start_date', 'end_date']
-    search_fields = ['employee__user__first_name', 'strengths', 'areas_for_improvement']
+    search_fields = ['employee__employee_id', '^employee__user__first_name']
     ordering = ['-end_date', 'employee']
     raw_id_fields = ['employee', 'evaluated_by']
+    list_select_related = ['employee__user', 'evaluated_by']
     readonly_fields = ['duration_days']
 
 
+@admin.register(ProductivityRollup)
+class ProductivityRollupAdmin(LargeTableAdmin):
+    """
+    Admin para el modelo ProductivityRollup
+    """
+    list_display = [
+        'period', 'period_start', 'employee', 'department', 'log_count',
+        'packages_processed', 'avg_productivity_score', 'avg_efficiency_percentage'
+    ]
+    list_filter = ['period', 'department']
+    ordering = ['-period_start', 'period']
+    list_select_related = ['employee__user', 'department']
+    raw_id_fields = ['employee', 'department']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ScoreRecomputeJob)
+class ScoreRecomputeJobAdmin(admin.ModelAdmin):
+    """
+    Admin para el modelo ScoreRecomputeJob
+    """
+    list_display = [
+        'metric', 'status', 'processed_evaluations', 'total_evaluations',
+        'progress_percentage', 'created_at', 'finished_at'
+    ]
+    list_filter = ['status']
+    ordering = ['-created_at']
+    list_select_related = ['metric']
+    readonly_fields = ['progress_percentage']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(AttendanceException)
+class AttendanceExceptionAdmin(LargeTableAdmin):
+    """
+    Admin para el modelo AttendanceException
+    """
+    list_display = [
+        'employee', 'date', 'exception_type', 'minutes',
+        'scheduled_start', 'scheduled_end', 'actual_start', 'actual_end'
+    ]
+    list_filter = ['exception_type', 'date', 'employee__position__department']
+    search_fields = ['employee__employee_id', '^employee__user__first_name']
+    ordering = ['-date', 'employee']
+    raw_id_fields = ['employee']
+    list_select_related = ['employee__user']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(AttendanceReconciliationRun)
+class AttendanceReconciliationRunAdmin(admin.ModelAdmin):
+    """
+    Admin para el modelo AttendanceReconciliationRun
+    """
+    list_display = [
+        'started_at', 'status', 'reconciled_through', 'days_reconciled',
+        'exceptions_found', 'finished_at'
+    ]
+    list_filter = ['status']
+    ordering = ['-started_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(ReportTemplate)
 class ReportTemplateAdmin(admin.ModelAdmin):
     """
@@ -217,13 +385,14 @@ class ScheduledReportAdmin(admin.ModelAdmin):
     """
     list_display = ['name', 'template', 'frequency', 'next_generation', 'is_active']
     list_filter = ['frequency', 'is_active', 'template__report_type']
-    search_fields = ['name', 'template__name']
+    search_fields = ['^name', '^template__name']
     ordering = ['-next_generation']
     raw_id_fields = ['template']
+    list_select_related = ['template']
 
 
 @admin.register(GeneratedReport)
-class GeneratedReportAdmin(admin.ModelAdmin):
+class GeneratedReportAdmin(LargeTableAdmin):
     """
     Admin para el modelo GeneratedReport
     """
@@ -232,9 +401,10 @@ class GeneratedReportAdmin(admin.ModelAdmin):
         'file_size_mb', 'created_at'
     ]
     list_filter = ['status', 'template__report_type', 'created_at']
-    search_fields = ['name', 'template__name']
+    search_fields = ['^name', '^template__name']
     ordering = ['-created_at']
     raw_id_fields = ['template', 'scheduled_report', 'generated_by']
+    list_select_related = ['template', 'generated_by']
     readonly_fields = ['file_size_mb', 'is_successful']
 
 
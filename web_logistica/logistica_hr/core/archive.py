@@ -0,0 +1,148 @@
+"""
+Archivo de filas dadas de baja
+
+Mueve a tablas <tabla>_archive las filas con is_active = False que no se
+modifican hace más de cierto tiempo, para que las tablas de trabajo (y sus
+índices) contengan solo datos vigentes o recientes. Las tablas de archivo se
+crean al primer uso con las mismas columnas (sin restricciones ni índices) y
+se les agregan las columnas nuevas del modelo.
+
+Una fila solo se archiva si ninguna otra fila la referencia; por eso los
+modelos se procesan de hijos a padres y una tarea se archiva después de sus
+comentarios y registros de tiempo. Las tablas de ARCHIVE_DEPENDENTS (eventos
+sin is_active) se archivan en el mismo lote que su fila padre. Al terminar
+cada lote se emite la señal rows_archived para que las aplicaciones limpien
+sus datos derivados.
+"""
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+
+from .signals import rows_archived
+
+# Modelos archivables, en orden de hijos a padres
+ARCHIVE_MODELS = [
+    'tasks.TaskComment',
+    'tasks.TaskTimeLog',
+    'tasks.Task',
+    'performance.EmployeePerformance',
+    'performance.DailyWorkLog',
+]
+
+# Tablas de eventos sin borrado lógico que se archivan junto a su fila padre
+ARCHIVE_DEPENDENTS = {
+    'tasks.Task': ['tasks.TaskStatusChange'],
+}
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def archive_table_name(model):
+    """Nombre de la tabla de archivo de un modelo"""
+    return f'{model._meta.db_table}_archive'
+
+
+def archivable_models(labels=None):
+    """
+    Retorna los modelos archivables instalados, en orden de procesamiento
+    """
+    models = []
+    for label in ARCHIVE_MODELS:
+        if labels and label not in labels:
+            continue
+        if apps.is_installed(f"logistica_hr.{label.split('.')[0]}"):
+            models.append(apps.get_model(label))
+    return models
+
+
+def ensure_archive_table(model):
+    """
+    Crea la tabla de archivo del modelo o le agrega las columnas faltantes
+    """
+    table = archive_table_name(model)
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if table not in connection.introspection.table_names(cursor):
+            cursor.execute(
+                f'CREATE TABLE {quote(table)} AS SELECT * FROM {quote(model._meta.db_table)} WHERE 1 = 0'
+            )
+            return
+        existing = {column.name for column in connection.introspection.get_table_description(cursor, table)}
+        for field in model._meta.concrete_fields:
+            if field.column not in existing:
+                cursor.execute(
+                    f'ALTER TABLE {quote(table)} ADD COLUMN {quote(field.column)} {field.db_type(connection)}'
+                )
+
+
+def dependent_relations(model):
+    """
+    Relaciones del modelo hacia sus tablas dependientes (ARCHIVE_DEPENDENTS)
+    """
+    labels = ARCHIVE_DEPENDENTS.get(model._meta.label, [])
+    return [
+        relation for relation in model._meta.related_objects
+        if relation.related_model._meta.label in labels
+    ]
+
+
+def archivable_queryset(model, cutoff):
+    """
+    Filas dadas de baja antes de cutoff que ninguna otra fila referencia
+    (salvo sus tablas dependientes)
+    """
+    queryset = model.objects.inactive_since(cutoff)
+    dependents = dependent_relations(model)
+    for relation in model._meta.related_objects:
+        if relation in dependents:
+            continue
+        queryset = queryset.exclude(Exists(
+            relation.related_model._base_manager.filter(**{relation.field.name: OuterRef('pk')})
+        ))
+    return queryset.order_by('pk')
+
+
+def archive_rows(model, cutoff, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Archiva por lotes las filas de un modelo dadas de baja antes de cutoff
+
+    Cada lote copia y elimina las filas en una misma transacción. Retorna la
+    cantidad de filas archivadas (o archivables si dry_run).
+    """
+    queryset = archivable_queryset(model, cutoff)
+    if dry_run:
+        return queryset.count()
+
+    quote = connection.ops.quote_name
+    moves = []
+    for relation in dependent_relations(model) + [None]:
+        target = relation.related_model if relation else model
+        ensure_archive_table(target)
+        moves.append((
+            quote(target._meta.db_table),
+            quote(archive_table_name(target)),
+            ', '.join(quote(field.column) for field in target._meta.concrete_fields),
+            quote(relation.field.column if relation else model._meta.pk.column),
+        ))
+
+    total = 0
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            placeholders = ', '.join(['%s'] * len(ids))
+            with connection.cursor() as cursor:
+                # Primero las tablas dependientes (por su clave foránea) y al
+                # final el modelo (por su clave primaria)
+                for table, archive, columns, key_column in moves:
+                    cursor.execute(
+                        f'INSERT INTO {archive} ({columns}) SELECT {columns} FROM {table} '
+                        f'WHERE {key_column} IN ({placeholders})',
+                        ids
+                    )
+                    cursor.execute(f'DELETE FROM {table} WHERE {key_column} IN ({placeholders})', ids)
+            rows_archived.send(sender=model, ids=ids)
+        total += len(ids)
+    return total
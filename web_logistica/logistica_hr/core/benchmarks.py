@@ -0,0 +1,242 @@
+"""
+Benchmarks de vistas del admin, endpoints de la API, generación de reportes
+y algoritmos en memoria
+
+Cada benchmark se ejecuta varias rondas (después de una ronda de
+calentamiento que llena las cachés) y registra la mediana, el mínimo y el
+máximo del tiempo y la cantidad de consultas SQL. Los resultados se
+guardan como línea base en JSON; una ejecución posterior se compara con
+ella y marca como regresión un benchmark cuyo tiempo mínimo supera el de
+la línea base en más de la tolerancia o que ejecuta más consultas. Se
+compara el mínimo porque es el valor menos afectado por la carga de la
+máquina.
+
+Conviene ejecutarlos sobre una base de datos cargada con seed_warehouse_data
+y con la misma configuración (motor, caché, DEBUG) que la línea base.
+"""
+
+import json
+import platform
+import statistics
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .profiling import QueryCounter
+
+DEFAULT_ROUNDS = 5
+DEFAULT_TOLERANCE = 0.25
+
+# Diferencia mínima en milisegundos para considerar una regresión de tiempo;
+# evita falsos positivos en benchmarks de pocos milisegundos
+MIN_REGRESSION_MS = 5.0
+
+BENCHMARK_USERNAME = 'benchmark'
+
+# name: (tipo, aplicación requerida, nombre de URL, tipo de reporte o ruta de
+# la función que prepara el benchmark, parámetros)
+BENCHMARKS = {
+    'admin.employee_changelist': ('view', 'employees', 'admin:employees_employee_changelist', {}),
+    'admin.task_changelist': ('view', 'tasks', 'admin:tasks_task_changelist', {}),
+    'admin.task_changelist_search': ('view', 'tasks', 'admin:tasks_task_changelist', {'q': 'pallet'}),
+    'admin.tasktimelog_changelist': ('view', 'tasks', 'admin:tasks_tasktimelog_changelist', {}),
+    'admin.dailyworklog_changelist': ('view', 'performance', 'admin:performance_dailyworklog_changelist', {}),
+    'admin.employeeperformance_changelist': (
+        'view', 'performance', 'admin:performance_employeeperformance_changelist', {}
+    ),
+    'api.employee_list': ('view', 'employees', 'employees:employee-list', {}),
+    'api.task_list': ('view', 'tasks', 'tasks:task-list', {}),
+    'api.task_list_filtered': ('view', 'tasks', 'tasks:task-list', {'status': 'pending', 'priority': 'high'}),
+    'api.dashboard_summary': ('view', 'performance', 'performance:dashboard-summary', {}),
+    'api.performance_series': ('view', 'performance', 'performance:performance-series', {'group_by': 'department'}),
+    'api.search': ('view', 'search', 'search:search', {'q': 'camión'}),
+    'api.reference_data': ('view', 'core', 'reference-data', {}),
+    'api.schedule_coverage': (
+        'view', 'employees', 'employees:schedule-coverage', {'day': 1, 'group_by': 'department'}
+    ),
+    'dispatch.assign_10k_tasks_1k_employees': (
+        'function', 'tasks', 'logistica_hr.tasks.assignment.benchmark_assignment',
+        {'tasks': 10000, 'employees': 1000}
+    ),
+    'report.productivity': ('report', 'reports', 'productivity', {'days': 30}),
+    'report.performance': ('report', 'reports', 'performance', {'days': 90}),
+}
+
+
+def available_benchmarks(names=None):
+    """
+    Retorna los benchmarks cuyas aplicaciones están instaladas, filtrados por
+    nombre o prefijo (por ejemplo 'admin' o 'api.task_list')
+    """
+    selected = {}
+    for name, definition in BENCHMARKS.items():
+        if not apps.is_installed(f'logistica_hr.{definition[1]}'):
+            continue
+        if names and not any(name == prefix or name.startswith(f'{prefix}.') for prefix in names):
+            continue
+        selected[name] = definition
+    return selected
+
+
+@contextmanager
+def benchmark_client():
+    """
+    Cliente de pruebas autenticado con un superusuario de benchmarks
+
+    El superusuario se elimina al salir si lo creó esta ejecución, para no
+    dejar una cuenta con privilegios en la base de datos.
+    """
+    User = get_user_model()
+    user, created = User.objects.get_or_create(
+        username=BENCHMARK_USERNAME,
+        defaults={'is_staff': True, 'is_superuser': True},
+    )
+    if created:
+        user.set_unusable_password()
+        user.save(update_fields=['password'])
+    host = next(
+        (host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'),
+        'localhost'
+    )
+    client = Client(HTTP_HOST=host)
+    try:
+        client.force_login(user)
+        yield client
+    finally:
+        client.logout()
+        if created:
+            user.delete()
+
+
+def _view_runner(client, url_name, params):
+    url = reverse(url_name)
+
+    def run():
+        response = client.get(url, params)
+        if response.status_code != 200:
+            raise RuntimeError(f'{url} respondió {response.status_code}')
+    return run
+
+
+def _report_runner(report_type, params):
+    # core no depende de reports a nivel de módulo (settings_sqlite solo
+    # instala core)
+    from logistica_hr.reports.models import GeneratedReport, ReportTemplate
+    from logistica_hr.reports.services import generate_report
+    from logistica_hr.reports.storage import report_absolute_path
+
+    template, _ = ReportTemplate.objects.get_or_create(
+        name=f'Benchmark {report_type}',
+        defaults={'report_type': report_type, 'format': 'csv'},
+    )
+    end_date = timezone.localdate()
+    parameters = {
+        'start_date': (end_date - timedelta(days=params['days'])).isoformat(),
+        'end_date': end_date.isoformat(),
+    }
+
+    def run():
+        report = generate_report(template, parameters, use_cache=False)
+        try:
+            if report.status != 'completed':
+                raise RuntimeError(report.error_message)
+        finally:
+            if report.file_path:
+                report_absolute_path(report.file_path).unlink(missing_ok=True)
+            GeneratedReport.objects.filter(pk=report.pk).delete()
+    return run
+
+
+def measure(run, rounds=DEFAULT_ROUNDS, warmup=1):
+    """
+    Ejecuta run warmup + rounds veces y retorna las estadísticas de tiempo
+    (ms) y consultas de las rondas medidas
+    """
+    for _ in range(warmup):
+        run()
+    timings, queries = [], []
+    for _ in range(rounds):
+        counter = QueryCounter()
+        with counter.capture():
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(counter.count)
+    return {
+        'rounds': rounds,
+        'median_ms': round(statistics.median(timings), 2),
+        'min_ms': round(min(timings), 2),
+        'max_ms': round(max(timings), 2),
+        'queries': max(queries),
+    }
+
+
+def run_benchmarks(names=None, rounds=DEFAULT_ROUNDS, warmup=1):
+    """
+    Ejecuta los benchmarks seleccionados y retorna un diccionario con el
+    entorno y los resultados por benchmark
+    """
+    client = None
+    results = {}
+    with ExitStack() as stack:
+        for name, (kind, _, target, params) in available_benchmarks(names).items():
+            if kind == 'view':
+                client = client or stack.enter_context(benchmark_client())
+                run = _view_runner(client, target, params)
+            elif kind == 'function':
+                run = import_string(target)(**params)
+            else:
+                run = _report_runner(target, params)
+            results[name] = measure(run, rounds=rounds, warmup=warmup)
+    return {
+        'environment': {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'debug': settings.DEBUG,
+        },
+        'results': results,
+    }
+
+
+def load_baseline(path):
+    """Lee una línea base guardada con save_baseline"""
+    return json.loads(Path(path).read_text())
+
+
+def save_baseline(report, path):
+    """Guarda los resultados de run_benchmarks como línea base"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True))
+
+
+def compare_with_baseline(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compara los resultados con una línea base
+
+    Retorna una lista de regresiones (benchmark, métrica, valor de la línea
+    base, valor actual). Los benchmarks sin línea base no se comparan.
+    """
+    regressions = []
+    previous = baseline.get('results', {})
+    for name, current in report['results'].items():
+        if name not in previous:
+            continue
+        base = previous[name]
+        if current['queries'] > base['queries']:
+            regressions.append((name, 'queries', base['queries'], current['queries']))
+        limit = base['min_ms'] * (1 + tolerance)
+        if current['min_ms'] > limit and current['min_ms'] - base['min_ms'] >= MIN_REGRESSION_MS:
+            regressions.append((name, 'min_ms', base['min_ms'], current['min_ms']))
+    return regressions
@@ -0,0 +1,129 @@
+"""
+Caché de datos de referencia
+
+Departamentos, posiciones, habilidades, categorías de tareas, métricas y
+plantillas de reportes cambian poco y se leen en casi todas las peticiones. Cada modelo
+tiene un número de versión en la caché que forma parte de sus claves; al
+guardar o eliminar un objeto (señales de BaseModel) se incrementa la
+versión y las claves anteriores quedan huérfanas hasta expirar.
+
+Las actualizaciones masivas (QuerySet.update, bulk_create) no emiten
+señales: después de usarlas se debe llamar a invalidate_reference.
+"""
+
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+# Modelos de referencia y columnas expuestas por reference_data
+REFERENCE_MODELS = {
+    'employees.Department': ['id', 'name', 'manager_id'],
+    'employees.Position': ['id', 'name', 'department_id'],
+    'employees.Qualification': ['id', 'kind', 'code', 'name'],
+    'tasks.TaskCategory': ['id', 'name', 'priority', 'color', 'required_skills'],
+    'performance.PerformanceMetric': [
+        'id', 'name', 'metric_type', 'unit', 'target_value', 'min_value', 'weight'
+    ],
+    'reports.ReportTemplate': ['id', 'name', 'report_type', 'format'],
+}
+
+KEY_PREFIX = 'refdata'
+
+
+def is_reference_model(model):
+    """
+    Indica si el modelo se guarda en la caché de datos de referencia
+    """
+    return model._meta.label in REFERENCE_MODELS
+
+
+def _version_key(model):
+    return f'{KEY_PREFIX}:{model._meta.label_lower}:version'
+
+
+def _new_version():
+    # Basada en el reloj para no repetir una versión anterior si la clave
+    # de versión fue desalojada de la caché
+    return int(time.time() * 1000)
+
+
+def reference_version(model):
+    """
+    Retorna la versión actual de los datos de un modelo de referencia
+    """
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_reference(model):
+    """
+    Invalida todas las entradas en caché de un modelo de referencia y
+    retorna la nueva versión
+    """
+    key = _version_key(model)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _new_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def reference_key(model, name, version=None):
+    """
+    Clave en caché del valor name del modelo en una versión (por defecto
+    la vigente)
+    """
+    if version is None:
+        version = reference_version(model)
+    return f'{KEY_PREFIX}:{model._meta.label_lower}:v{version}:{name}'
+
+
+def cached_reference(model, name, builder, timeout=None):
+    """
+    Retorna el valor en caché name del modelo, calculándolo con builder si
+    la versión vigente aún no lo tiene
+    """
+    if timeout is None:
+        timeout = settings.REFERENCE_CACHE_TTL
+    key = reference_key(model, name)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout)
+    return value
+
+
+def active_reference_objects(model):
+    """
+    Retorna un diccionario pk -> objeto con las filas activas del modelo
+    """
+    return cached_reference(
+        model, 'active-objects',
+        lambda: {obj.pk: obj for obj in model.objects.active()}
+    )
+
+
+def reference_data(labels=None):
+    """
+    Retorna las filas activas de los modelos de referencia instalados como
+    listas de diccionarios, indexadas por el nombre del modelo
+    """
+    data = {}
+    for label in labels or REFERENCE_MODELS:
+        app_label = label.split('.')[0]
+        if label not in REFERENCE_MODELS or not apps.is_installed(f'logistica_hr.{app_label}'):
+            continue
+        model = apps.get_model(label)
+        fields = REFERENCE_MODELS[label]
+        data[model._meta.model_name] = cached_reference(
+            model, 'values',
+            lambda: list(model.objects.active().order_by('name').values(*fields))
+        )
+    return data
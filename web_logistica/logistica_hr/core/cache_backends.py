@@ -0,0 +1,124 @@
+"""
+Backends de caché del proyecto
+
+ResilientRedisCache usa Redis y, si no responde, atiende las operaciones con
+una caché LRU en memoria del proceso (LocMemCache) durante FALLBACK_RETRY
+segundos antes de volver a intentar. Las invalidaciones hechas sin conexión
+solo llegan a la caché local, por lo que al recuperar Redis se vacía su base
+de datos de caché antes de seguir usándola.
+
+FakeRedisCache ejecuta el mismo código contra fakeredis para las pruebas.
+"""
+
+import logging
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from django.core.exceptions import ImproperlyConfigured
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+logger = logging.getLogger(__name__)
+
+REDIS_ERRORS = (RedisConnectionError, RedisTimeoutError)
+
+
+class ResilientRedisCache(RedisCache):
+    """
+    Caché Redis con respaldo LRU en memoria
+
+    Opciones adicionales en OPTIONS: FALLBACK_RETRY (segundos sin intentar
+    Redis tras un error, 30 por defecto) y FALLBACK_MAX_ENTRIES (tamaño de
+    la caché local, 1000 por defecto).
+    """
+
+    def __init__(self, server, params):
+        params = dict(params)
+        options = dict(params.get('OPTIONS', {}))
+        self.retry_interval = options.pop('FALLBACK_RETRY', 30)
+        fallback_entries = options.pop('FALLBACK_MAX_ENTRIES', 1000)
+        params['OPTIONS'] = options
+        super().__init__(server, params)
+        self._fallback = LocMemCache(f'fallback:{server}', {
+            **params,
+            'OPTIONS': {'MAX_ENTRIES': fallback_entries},
+        })
+        self._retry_at = 0
+        self._degraded = False
+
+    def _call(self, method, *args, **kwargs):
+        """
+        Ejecuta la operación en Redis o, si no está disponible, en la caché local
+        """
+        if time.monotonic() < self._retry_at:
+            return getattr(self._fallback, method)(*args, **kwargs)
+        try:
+            if self._degraded:
+                super().clear()
+                self._fallback.clear()
+                self._degraded = False
+                logger.info('Conexión con Redis recuperada; caché vaciada')
+            return getattr(super(), method)(*args, **kwargs)
+        except REDIS_ERRORS as exc:
+            logger.warning('Redis no disponible, usando la caché local: %s', exc)
+            self._retry_at = time.monotonic() + self.retry_interval
+            self._degraded = True
+            return getattr(self._fallback, method)(*args, **kwargs)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('add', key, value, timeout, version)
+
+    def get(self, key, default=None, version=None):
+        return self._call('get', key, default, version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('set', key, value, timeout, version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('touch', key, timeout, version)
+
+    def delete(self, key, version=None):
+        return self._call('delete', key, version)
+
+    def get_many(self, keys, version=None):
+        return self._call('get_many', keys, version)
+
+    def has_key(self, key, version=None):
+        return self._call('has_key', key, version)
+
+    def incr(self, key, delta=1, version=None):
+        return self._call('incr', key, delta, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('set_many', data, timeout, version)
+
+    def delete_many(self, keys, version=None):
+        return self._call('delete_many', keys, version)
+
+    def clear(self):
+        return self._call('clear')
+
+
+# Servidores fakeredis compartidos por las instancias de una misma LOCATION
+_FAKE_SERVERS = {}
+
+
+class FakeRedisCache(ResilientRedisCache):
+    """
+    ResilientRedisCache sobre fakeredis, para pruebas sin servidor Redis
+    """
+
+    def __init__(self, server, params):
+        try:
+            import fakeredis
+        except ImportError as exc:
+            raise ImproperlyConfigured('FakeRedisCache requiere el paquete fakeredis') from exc
+        params = dict(params)
+        params['OPTIONS'] = {
+            **params.get('OPTIONS', {}),
+            'connection_class': fakeredis.FakeConnection,
+            'server': _FAKE_SERVERS.setdefault(str(server), fakeredis.FakeServer()),
+        }
+        super().__init__(server, params)
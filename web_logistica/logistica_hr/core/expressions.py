@@ -0,0 +1,41 @@
+"""
+Expresiones de base de datos compartidas por las aplicaciones del proyecto
+"""
+
+from django.db.models import FloatField, Func
+
+
+class DurationSeconds(Func):
+    """
+    Convierte una expresión de duración (intervalo) a segundos en punto flotante
+
+    PostgreSQL representa las duraciones como INTERVAL, mientras que SQLite y
+    MySQL las representan como un entero de microsegundos.
+    """
+    output_field = FloatField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template='((%(expressions)s) / 1000000.0)',
+            **extra_context
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template='EXTRACT(EPOCH FROM %(expressions)s)::double precision',
+            **extra_context
+        )
+
+
+class WindowAggregate(Func):
+    """
+    Función de ventana aplicada sobre un agregado de una consulta agrupada
+
+    Permite expresiones como AVG(AVG(valor)) OVER (...), que Django no admite
+    directamente con sus clases de agregación. La función se indica con el
+    argumento function.
+    """
+    window_compatible = True
+    output_field = FloatField()
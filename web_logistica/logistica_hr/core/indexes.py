@@ -0,0 +1,49 @@
+"""
+Índices compartidos por las aplicaciones del proyecto
+"""
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models
+from django.db.models.functions import Upper
+
+
+class TrigramIndex(GinIndex):
+    """
+    Índice GIN de trigramas (pg_trgm) sobre UPPER(campo)
+
+    Sirve las búsquedas icontains e istartswith de Django, que en PostgreSQL
+    se traducen a UPPER(campo) LIKE UPPER(...). En otros motores se crea un
+    índice B-tree sobre la misma expresión.
+    """
+
+    def __init__(self, *fields, name):
+        self.trigram_fields = fields
+        super().__init__(
+            *[OpClass(Upper(field), name='gin_trgm_ops') for field in fields],
+            name=name
+        )
+
+    def deconstruct(self):
+        path, _, kwargs = super().deconstruct()
+        return path, self.trigram_fields, {'name': kwargs['name']}
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            fallback = models.Index(*[Upper(field) for field in self.trigram_fields], name=self.name)
+            return fallback.create_sql(model, schema_editor, using=using, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+
+class SearchVectorIndex(GinIndex):
+    """
+    Índice GIN sobre una columna tsvector
+
+    Fuera de PostgreSQL la columna no se usa para buscar y se crea un índice
+    B-tree común para que las migraciones sigan siendo portables.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            fallback = models.Index(fields=self.fields, name=self.name)
+            return fallback.create_sql(model, schema_editor, using=using, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
@@ -0,0 +1,195 @@
+"""
+Utilidades para la carga masiva de registros (NDJSON / CSV)
+
+La validación se hace por columnas sobre todo el lote: primero se convierten
+los valores de cada campo con el campo del modelo y luego se resuelven las
+claves foráneas con una sola consulta por modelo relacionado. Las filas con
+errores se reportan individualmente sin abortar el resto del lote.
+"""
+
+import codecs
+import csv
+import io
+import json
+
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import models
+
+SUPPORTED_FORMATS = ['ndjson', 'csv']
+
+BOOLEAN_STRINGS = {
+    'true': True, 'yes': True, 'si': True, 'sí': True,
+    'false': False, 'no': False,
+}
+
+# Límite de valores por consulta IN al resolver claves foráneas
+LOOKUP_CHUNK_SIZE = 5000
+
+# Rango de un entero de 64 bits; SQLite no declara validadores de rango
+MAX_INTEGER_KEY = 2 ** 63 - 1
+
+CONTENT_TYPE_FORMATS = {
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/json': 'ndjson',
+    'text/csv': 'csv',
+}
+
+
+def detect_format(content_type, default='ndjson'):
+    """
+    Determina el formato de entrada a partir del Content-Type
+    """
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    return CONTENT_TYPE_FORMATS.get(media_type, default)
+
+
+def request_payload(request):
+    """
+    Obtiene el flujo y el formato de una petición de carga masiva
+
+    Acepta el cuerpo crudo (NDJSON o CSV según Content-Type) o un archivo
+    multipart en el campo file. El parámetro input_format fuerza el formato.
+    """
+    upload = request.FILES.get('file') if request.content_type.startswith('multipart/') else None
+    if upload is not None:
+        default = 'csv' if upload.name.lower().endswith('.csv') else 'ndjson'
+        file_format = request.query_params.get('input_format', default)
+        return upload.file, file_format
+    file_format = request.query_params.get('input_format') or detect_format(request.content_type)
+    return request.stream or io.BytesIO(), file_format
+
+
+def read_rows(stream, file_format):
+    """
+    Lee las filas de un flujo de texto o bytes en formato NDJSON o CSV
+
+    Retorna una lista de tuplas (número de fila, diccionario) y una lista de
+    errores de lectura. Las filas se numeran desde 1.
+    """
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Formato no soportado: {file_format}")
+    if isinstance(stream, (bytes, str)):
+        stream = io.BytesIO(stream) if isinstance(stream, bytes) else io.StringIO(stream)
+    if isinstance(stream, io.IOBase) and not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig')
+    elif not isinstance(stream, io.TextIOBase):
+        # Flujos no estándar como HttpRequest solo implementan read/readline
+        stream = codecs.getreader('utf-8-sig')(stream)
+
+    rows = []
+    errors = []
+    if file_format == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            rows.append((number, row))
+        return rows, errors
+
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            errors.append({'row': number, 'errors': {'__all__': [f'JSON inválido: {exc}']}})
+            continue
+        if not isinstance(row, dict):
+            errors.append({'row': number, 'errors': {'__all__': ['Se esperaba un objeto JSON']}})
+            continue
+        rows.append((number, row))
+    return rows, errors
+
+
+def clean_columns(model, rows, field_names, row_errors):
+    """
+    Convierte y valida columna por columna los campos indicados del modelo
+
+    Los valores vacíos toman el valor por defecto del campo. Los errores se
+    acumulan en row_errors indexados por número de fila.
+    """
+    cleaned = [{} for _ in rows]
+    for name in field_names:
+        field = model._meta.get_field(name)
+        is_duration = isinstance(field, models.DurationField)
+        is_boolean = isinstance(field, models.BooleanField)
+        for position, (number, row) in enumerate(rows):
+            raw = row.get(name)
+            if raw in (None, '') and field.has_default():
+                raw = field.get_default()
+            if is_duration and isinstance(raw, (int, float)) and not isinstance(raw, bool):
+                # Las duraciones numéricas se interpretan en segundos
+                raw = timedelta(seconds=raw)
+            elif is_boolean and isinstance(raw, str):
+                raw = BOOLEAN_STRINGS.get(raw.strip().lower(), raw)
+            if raw in (None, ''):
+                if field.null:
+                    cleaned[position][field.attname] = None
+                    continue
+                if field.blank:
+                    cleaned[position][field.attname] = ''
+                    continue
+            try:
+                cleaned[position][field.attname] = field.clean(raw, None)
+            except ValidationError as exc:
+                row_errors.setdefault(number, {})[name] = exc.messages
+    return cleaned
+
+
+def resolve_lookup(rows, column, queryset, lookup_field, row_errors, label):
+    """
+    Resuelve en una sola consulta los valores de una columna a claves primarias
+
+    Los valores se convierten antes con el campo de búsqueda, de modo que un
+    valor de tipo inválido (por ejemplo texto en una clave numérica) se
+    reporta como error de su fila en lugar de abortar la consulta.
+    """
+    opts = queryset.model._meta
+    field = opts.pk if lookup_field == 'pk' else opts.get_field(lookup_field)
+    keys = []
+    for number, row in rows:
+        raw = row.get(column)
+        if raw in (None, ''):
+            row_errors.setdefault(number, {})[column] = ['Este campo es obligatorio.']
+            keys.append(None)
+            continue
+        try:
+            key = field.to_python(str(raw).strip())
+            field.run_validators(key)
+            if isinstance(key, int) and abs(key) > MAX_INTEGER_KEY:
+                raise ValidationError('Fuera de rango')
+            keys.append(key)
+        except ValidationError:
+            row_errors.setdefault(number, {})[column] = [f'{label} inválido: {raw}']
+            keys.append(None)
+
+    values = sorted({key for key in keys if key is not None})
+    mapping = {}
+    for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+        chunk = values[start:start + LOOKUP_CHUNK_SIZE]
+        mapping.update(queryset.filter(**{f'{lookup_field}__in': chunk}).values_list(lookup_field, 'pk'))
+    resolved = []
+    for (number, _), key in zip(rows, keys):
+        if key is not None and key not in mapping:
+            row_errors.setdefault(number, {})[column] = [f'{label} inexistente: {key}']
+        resolved.append(mapping.get(key))
+    return resolved
+
+
+def build_report(received, written, row_errors, read_errors=()):
+    """
+    Construye el reporte de resultado de una carga masiva
+    """
+    errors = sorted(
+        list(read_errors) + [
+            {'row': number, 'errors': errors} for number, errors in row_errors.items()
+        ],
+        key=lambda error: error['row']
+    )
+    return {
+        'received': received,
+        'written': written,
+        'rejected': len(errors),
+        'errors': errors,
+    }
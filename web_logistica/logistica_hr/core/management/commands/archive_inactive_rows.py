@@ -0,0 +1,49 @@
+"""
+Comando para mover a las tablas de archivo las filas dadas de baja
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from logistica_hr.core.archive import ARCHIVE_MODELS, DEFAULT_BATCH_SIZE, archivable_models, archive_rows
+
+
+class Command(BaseCommand):
+    help = 'Mueve a tablas <tabla>_archive las filas inactivas sin modificaciones en los últimos días'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='Días sin modificaciones desde la baja para archivar una fila'
+        )
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=ARCHIVE_MODELS,
+            help='Modelo a archivar (se puede repetir; por defecto todos)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Cantidad de filas movidas por transacción'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo informa cuántas filas se archivarían'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        for model in archivable_models(options['model']):
+            count = archive_rows(
+                model, cutoff, batch_size=options['batch_size'], dry_run=options['dry_run']
+            )
+            action = 'archivables' if options['dry_run'] else 'archivadas'
+            self.stdout.write(f'{model._meta.label}: {count} filas {action}')
+        self.stdout.write(self.style.SUCCESS('Archivo de filas inactivas completado'))
@@ -0,0 +1,105 @@
+"""
+Comando para administrar las particiones mensuales en PostgreSQL
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from logistica_hr.core import partitioning
+
+
+def _month(value):
+    """Convierte YYYY-MM al primer día del mes"""
+    return date.fromisoformat(f'{value}-01')
+
+
+class Command(BaseCommand):
+    help = (
+        'Crea las particiones de los próximos meses y archiva (exporta a CSV '
+        'comprimido, separa y elimina) las anteriores al período de retención'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            help='Meses futuros con partición (por defecto PARTITION_MONTHS_AHEAD)'
+        )
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            help='Meses que permanecen en la base de datos; 0 no archiva (por defecto PARTITION_RETENTION_MONTHS)'
+        )
+        parser.add_argument(
+            '--restore',
+            type=_month,
+            metavar='YYYY-MM',
+            help='Restaura desde el archivo la partición del mes indicado'
+        )
+        parser.add_argument(
+            '--through',
+            type=_month,
+            metavar='YYYY-MM',
+            help='Con --restore, restaura también los meses archivados hasta este mes (inclusive)'
+        )
+        parser.add_argument(
+            '--model',
+            choices=list(partitioning.PARTITIONED_MODELS),
+            help='Modelo de la partición a restaurar'
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='Muestra los meses adjuntos y archivados de cada modelo'
+        )
+
+    def handle(self, *args, **options):
+        if not partitioning.is_supported():
+            raise CommandError('El particionamiento solo está disponible en PostgreSQL')
+
+        if options['list']:
+            for model in partitioning.partitioned_models():
+                if not partitioning.is_partitioned(model):
+                    self.stdout.write(f'{model._meta.label}: sin particionar')
+                    continue
+                attached = partitioning.attached_months(model)
+                archived = partitioning.archived_months(model)
+                self.stdout.write(
+                    f"{model._meta.label}: adjuntas {', '.join(f'{m:%Y-%m}' for m in attached) or '-'}; "
+                    f"archivadas {', '.join(f'{m:%Y-%m}' for m in archived) or '-'}"
+                )
+            return
+
+        if options['restore']:
+            if not options['model']:
+                raise CommandError('--restore requiere --model')
+            model = next(
+                model for model in partitioning.partitioned_models()
+                if model._meta.label == options['model']
+            )
+            if options['through']:
+                try:
+                    months = partitioning.restore_archived_range(model, options['restore'], options['through'])
+                except ValueError as exc:
+                    raise CommandError(str(exc))
+                self.stdout.write(self.style.SUCCESS(
+                    f"Particiones restauradas: {', '.join(f'{m:%Y-%m}' for m in months) or '-'}"
+                ))
+                return
+            if options['restore'] not in partitioning.archived_months(model):
+                raise CommandError(f"No hay una partición archivada de {options['restore']:%Y-%m}")
+            rows = partitioning.restore_partition(model, options['restore'])
+            self.stdout.write(self.style.SUCCESS(f'Partición restaurada: {rows or 0} filas'))
+            return
+
+        summary = partitioning.maintain_partitions(
+            months_ahead=options['months_ahead'],
+            retention_months=options['retention_months'],
+        )
+        for label, result in summary.items():
+            self.stdout.write(
+                f"{label}: {len(result['created'])} particiones creadas, "
+                f"{sum(result['archived'].values())} filas archivadas en {len(result['archived'])} particiones"
+            )
+        self.stdout.write(self.style.SUCCESS('Particiones actualizadas'))
@@ -0,0 +1,74 @@
+"""
+Comando para medir vistas, endpoints y reportes y compararlos con una línea base
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from logistica_hr.core.benchmarks import (
+    BENCHMARKS, DEFAULT_ROUNDS, DEFAULT_TOLERANCE, compare_with_baseline, load_baseline,
+    run_benchmarks, save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta los benchmarks del admin, la API y los reportes, registra tiempos '
+        'y consultas y marca las regresiones respecto de la línea base'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help=f"Benchmarks o prefijos a ejecutar (por defecto todos): {', '.join(BENCHMARKS)}"
+        )
+        parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS, help='Rondas medidas por benchmark')
+        parser.add_argument(
+            '--baseline',
+            default=settings.BENCHMARK_BASELINE,
+            help='Archivo JSON de la línea base'
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Guarda los resultados como nueva línea base en lugar de compararlos'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help='Aumento relativo del tiempo mínimo tolerado antes de marcar una regresión'
+        )
+
+    def handle(self, *args, **options):
+        report = run_benchmarks(options['names'], rounds=options['rounds'])
+        if not report['results']:
+            raise CommandError('Ningún benchmark coincide con los nombres indicados')
+
+        for name, result in report['results'].items():
+            self.stdout.write(
+                f"{name:<42} mediana {result['median_ms']:>9.2f} ms  "
+                f"min {result['min_ms']:>9.2f} ms  max {result['max_ms']:>9.2f} ms  "
+                f"consultas {result['queries']}"
+            )
+
+        if options['save_baseline']:
+            save_baseline(report, options['baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Línea base guardada en {options['baseline']}"))
+            return
+
+        try:
+            baseline = load_baseline(options['baseline'])
+        except FileNotFoundError:
+            self.stdout.write(self.style.WARNING(
+                f"No existe la línea base {options['baseline']}; use --save-baseline para crearla"
+            ))
+            return
+
+        regressions = compare_with_baseline(report, baseline, options['tolerance'])
+        for name, metric, before, after in regressions:
+            self.stderr.write(f'Regresión en {name}: {metric} {before} -> {after}')
+        if regressions:
+            raise CommandError(f'{len(regressions)} regresiones respecto de la línea base')
+        self.stdout.write(self.style.SUCCESS('Sin regresiones respecto de la línea base'))
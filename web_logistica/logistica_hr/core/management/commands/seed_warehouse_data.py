@@ -0,0 +1,56 @@
+"""
+Comando para generar datos sintéticos de bodega para pruebas de carga
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from logistica_hr.core.seeding import DEFAULT_BATCH_SIZE, SCALES, seed_exists, seed_warehouse_data
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera empleados, registros diarios, rendimiento, tareas, registros de '
+        'tiempo y comentarios sintéticos con bulk_create'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            choices=list(SCALES),
+            default='small',
+            help='Volumen predefinido; --employees, --years y --tasks lo sobrescriben'
+        )
+        parser.add_argument('--employees', type=int, help='Cantidad de empleados')
+        parser.add_argument('--years', type=int, help='Años de registros diarios y de rendimiento')
+        parser.add_argument('--tasks', type=int, help='Cantidad de tareas')
+        parser.add_argument('--time-logs-per-task', type=int, default=2, help='Registros de tiempo por tarea')
+        parser.add_argument('--comments-per-task', type=int, default=1, help='Comentarios por tarea')
+        parser.add_argument('--seed', type=int, default=0, help='Semilla del generador pseudoaleatorio')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Cantidad de filas por sentencia INSERT'
+        )
+
+    def handle(self, *args, **options):
+        if seed_exists():
+            raise CommandError('La base de datos ya tiene datos sintéticos')
+
+        volume = dict(SCALES[options['scale']])
+        for key in volume:
+            if options[key] is not None:
+                volume[key] = options[key]
+
+        created = seed_warehouse_data(
+            time_logs_per_task=options['time_logs_per_task'],
+            comments_per_task=options['comments_per_task'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            progress=self.stdout.write,
+            **volume,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Datos sintéticos generados: {sum(created.values())} filas. "
+            f"Ejecute rebuild_search_index para indexarlos."
+        ))
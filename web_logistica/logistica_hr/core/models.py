@@ -7,6 +7,27 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 
+class ActiveQuerySet(models.QuerySet):
+    """
+    QuerySet con filtros para el borrado lógico de BaseModel (is_active)
+
+    Los QuerySet propios de los modelos que heredan de BaseModel deben
+    heredar de esta clase para conservar active() e inactive().
+    """
+
+    def active(self):
+        """Filas vigentes; usa los índices parciales WHERE is_active"""
+        return self.filter(is_active=True)
+
+    def inactive(self):
+        """Filas dadas de baja"""
+        return self.filter(is_active=False)
+
+    def inactive_since(self, cutoff):
+        """Filas dadas de baja sin modificaciones desde la fecha indicada"""
+        return self.inactive().filter(updated_at__lt=cutoff)
+
+
 class BaseModel(models.Model):
     """
     Modelo base que incluye campos comunes para todos los modelos
@@ -24,6 +45,8 @@ class BaseModel(models.Model):
         verbose_name=_('Activo')
     )
 
+    objects = ActiveQuerySet.as_manager()
+
     class Meta:
         abstract = True
         ordering = ['-created_at']
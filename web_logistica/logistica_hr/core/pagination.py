@@ -0,0 +1,161 @@
+"""
+Clases de paginación compartidas por las APIs del proyecto
+"""
+
+import binascii
+import json
+
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class StandardCursorPagination(CursorPagination):
+    """
+    Paginación por cursor sobre una columna única e indexada
+
+    A diferencia de PageNumberPagination no usa OFFSET ni COUNT(*), por lo que
+    el costo de una página es el mismo al inicio o al final del listado.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = '-id'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por clave compuesta (keyset) sobre columnas indexadas
+
+    El cursor guarda los valores de keyset_fields de la última fila de la
+    página y la siguiente página se obtiene con una comparación de tuplas
+    (a > x OR (a = x AND b > y)), que se resuelve con un índice sobre las
+    mismas columnas sin importar la profundidad del listado.
+    """
+    keyset_fields = ('id',)
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = _('Cursor inválido')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, values):
+        # isoformat conserva los microsegundos que DjangoJSONEncoder trunca
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+        payload = json.dumps(values, default=str).encode('utf-8')
+        return b64encode(payload).decode('ascii')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if len(values) != len(self.keyset_fields):
+                raise ValueError
+            return self.parse_cursor_values(model, values)
+        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def parse_cursor_values(self, model, values):
+        """
+        Convierte los valores del cursor al tipo de cada campo; las
+        subclases sin modelo lanzan ValueError o TypeError si son inválidos
+        """
+        return [
+            model._meta.get_field(field).to_python(value)
+            for field, value in zip(self.keyset_fields, values)
+        ]
+
+    def keyset_filter(self, values):
+        """
+        Construye la condición "mayor que" sobre la tupla de columnas
+        """
+        condition = Q()
+        for position in range(len(self.keyset_fields)):
+            equal = {field: value for field, value in zip(
+                self.keyset_fields[:position], values[:position]
+            )}
+            greater = {f'{self.keyset_fields[position]}__gt': values[position]}
+            condition |= Q(**equal, **greater)
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        values = self.decode_cursor(request, queryset.model)
+        queryset = queryset.order_by(*self.keyset_fields)
+        if values is not None:
+            queryset = queryset.filter(self.keyset_filter(values))
+
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        results = results[:page_size]
+        self.next_values = (
+            [getattr(results[-1], field) for field in self.keyset_fields]
+            if self.has_next else None
+        )
+        return results
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_values))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador del admin que estima el total de tablas grandes
+
+    Sin filtros, en PostgreSQL usa la estimación del planificador
+    (pg_class.reltuples) en lugar de COUNT(*) cuando supera
+    estimate_threshold filas. Con filtros o en otros motores cuenta exacto.
+    """
+    estimate_threshold = 100000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is not None and not query.where and not query.distinct:
+            estimate = _estimated_row_count(queryset)
+            if estimate is not None and estimate > self.estimate_threshold:
+                return estimate
+        return super().count
+
+
+def _estimated_row_count(queryset):
+    """Retorna la estimación de filas de la tabla de un queryset o None"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)',
+            [queryset.model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
@@ -0,0 +1,498 @@
+"""
+Particionamiento por rango de fechas en PostgreSQL
+
+DailyWorkLog, EmployeePerformance y TaskTimeLog crecen sin límite. En
+PostgreSQL sus tablas se pueden convertir en tablas particionadas por mes
+(operación de migración PartitionByRange); el ORM sigue usando la tabla
+padre, por lo que los modelos no cambian. La clave primaria pasa a ser
+(id, columna de partición), ya que PostgreSQL exige que las restricciones
+únicas incluyan la clave de partición.
+
+manage_partitions crea las particiones de los meses siguientes y archiva
+las antiguas: exporta cada partición a <PARTITION_ARCHIVE_DIR>/<partición>.csv.gz
+con un manifiesto JSON, la separa y la elimina. Los reportes y las series de
+tiempo llaman a check_archived_range, que lanza ArchivedRangeError si el
+rango consultado incluye meses archivados: restaurar crea tablas, por lo
+que nunca se hace dentro de una petición, sino explícitamente con
+manage_partitions --restore (restore_archived_range, con un rango cerrado y
+acotado). Los meses restaurados no se vuelven a archivar durante
+PARTITION_RESTORE_HOLD_DAYS días.
+
+En otros motores todas las funciones son no-ops.
+"""
+
+import csv
+import gzip
+import hashlib
+import json
+import logging
+import re
+from datetime import date, datetime, time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.migrations.operations.base import Operation
+from django.utils import timezone
+
+from .signals import rows_archived
+
+logger = logging.getLogger(__name__)
+
+# Modelos particionables y su columna de partición
+PARTITIONED_MODELS = {
+    'performance.DailyWorkLog': 'date',
+    'performance.EmployeePerformance': 'date',
+    'tasks.TaskTimeLog': 'start_time',
+}
+
+PARTITION_SUFFIX = re.compile(r'_p(\d{4})(\d{2})$')
+
+
+class ArchivedRangeError(Exception):
+    """
+    El rango consultado incluye meses archivados que no están en la base de
+    datos
+    """
+
+    def __init__(self, model, months):
+        self.model = model
+        self.months = months
+        super().__init__(
+            f"El rango incluye meses archivados de {model._meta.label}: "
+            f"{', '.join(f'{month:%Y-%m}' for month in months)}. "
+            f"Se deben restaurar con manage_partitions --restore"
+        )
+
+
+def month_start(value):
+    """Primer día del mes de una fecha o fecha y hora"""
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    return value.replace(day=1)
+
+
+def add_months(month, count):
+    """Suma meses al primer día de un mes"""
+    years, index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def partition_field(model):
+    """Campo de partición de un modelo particionable"""
+    return model._meta.get_field(PARTITIONED_MODELS[model._meta.label])
+
+
+def partition_name(model, month):
+    """Nombre de la partición de un mes"""
+    return f'{model._meta.db_table}_p{month:%Y%m}'
+
+
+def default_partition_name(model):
+    """Partición que recibe las filas sin partición mensual"""
+    return f'{model._meta.db_table}_pdefault'
+
+
+def _bound(model, month):
+    """Límite de una partición como literal del tipo de la columna"""
+    if partition_field(model).get_internal_type() == 'DateTimeField':
+        return timezone.make_aware(datetime.combine(month, time.min)).isoformat()
+    return month.isoformat()
+
+
+def _range_sql(model, month):
+    return f"FOR VALUES FROM ('{_bound(model, month)}') TO ('{_bound(model, add_months(month, 1))}')"
+
+
+def is_supported():
+    return connection.vendor == 'postgresql'
+
+
+def partitioned_models():
+    """Modelos particionables de las aplicaciones instaladas"""
+    return [
+        apps.get_model(label) for label in PARTITIONED_MODELS
+        if apps.is_installed(f"logistica_hr.{label.split('.')[0]}")
+    ]
+
+
+def is_partitioned(model):
+    """Indica si la tabla del modelo ya está particionada"""
+    if not is_supported():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid '
+            'WHERE c.relname = %s AND pg_table_is_visible(c.oid)',
+            [model._meta.db_table]
+        )
+        return cursor.fetchone() is not None
+
+
+def attached_months(model):
+    """Meses con partición adjunta a la tabla del modelo"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid '
+            'JOIN pg_class p ON p.oid = i.inhparent '
+            'WHERE p.relname = %s AND pg_table_is_visible(p.oid)',
+            [model._meta.db_table]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = PARTITION_SUFFIX.search(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def _attach_month(model, month, cursor, source=None, columns=None):
+    """
+    Adjunta la partición de un mes, moviendo antes las filas del mes que
+    hayan caído en la partición por defecto
+
+    source es un archivo CSV opcional (con las columnas indicadas) con el
+    que se carga la tabla antes de adjuntarla.
+    """
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    name = quote(partition_name(model, month))
+    default = quote(default_partition_name(model))
+    column = quote(partition_field(model).column)
+    start, end = _bound(model, month), _bound(model, add_months(month, 1))
+
+    cursor.execute(f'CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    if source is not None:
+        column_list = ', '.join(quote(source_column) for source_column in columns)
+        cursor.cursor.copy_expert(
+            f'COPY {name} ({column_list}) FROM STDIN WITH (FORMAT csv, HEADER true)', source
+        )
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {default} WHERE {column} >= %s AND {column} < %s RETURNING *) '
+        f'INSERT INTO {name} SELECT * FROM moved',
+        [start, end]
+    )
+    cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {name} {_range_sql(model, month)}')
+
+
+def create_partitions(model, first_month, last_month):
+    """
+    Crea las particiones faltantes entre dos meses (inclusive)
+
+    Retorna los meses creados.
+    """
+    if not is_partitioned(model):
+        return []
+    existing = set(attached_months(model))
+    created = []
+    month = month_start(first_month)
+    with transaction.atomic(), connection.cursor() as cursor:
+        while month <= last_month:
+            if month not in existing:
+                _attach_month(model, month, cursor)
+                created.append(month)
+            month = add_months(month, 1)
+    return created
+
+
+def ensure_future_partitions(model, months_ahead=None, today=None):
+    """
+    Crea las particiones del mes actual y de los months_ahead meses siguientes
+    """
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+    current = month_start(today or timezone.localdate())
+    return create_partitions(model, current, add_months(current, months_ahead))
+
+
+def convert_to_partitioned(schema_editor, model, months_ahead=3):
+    """
+    Convierte la tabla de un modelo en una tabla particionada por mes
+
+    Copia las filas existentes, crea particiones desde el mes más antiguo
+    hasta months_ahead meses en el futuro más una partición por defecto, y
+    recrea la secuencia del id, la clave primaria (id, columna), los índices,
+    las restricciones y las claves foráneas del modelo.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    if model._meta.related_objects:
+        raise ValueError(f'{model._meta.label} es referenciado por otras tablas y no se puede particionar')
+
+    quote = connection.ops.quote_name
+    db_table = model._meta.db_table
+    table, legacy = quote(db_table), quote(f'{db_table}_legacy')
+    field = partition_field(model)
+    column = quote(field.column)
+    pk_column = quote(model._meta.pk.column)
+    sequence = quote(f'{db_table}_{model._meta.pk.column}_seq')
+
+    schema_editor.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+    schema_editor.execute(
+        f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING STORAGE) '
+        f'PARTITION BY RANGE ({column})'
+    )
+    schema_editor.execute(
+        f'CREATE TABLE {quote(default_partition_name(model))} PARTITION OF {table} DEFAULT'
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN({column}), MAX({pk_column}) FROM {legacy}')
+        oldest, last_id = cursor.fetchone()
+        current = month_start(timezone.localdate())
+        month = month_start(oldest) if oldest else current
+        while month <= add_months(current, months_ahead):
+            _attach_month(model, month, cursor)
+            month = add_months(month, 1)
+
+    schema_editor.execute(f'INSERT INTO {table} SELECT * FROM {legacy}')
+    schema_editor.execute(f'DROP TABLE {legacy}')
+
+    schema_editor.execute(f'CREATE SEQUENCE {sequence} OWNED BY {table}.{pk_column}')
+    schema_editor.execute('SELECT setval(%s, %s, %s)', [sequence, last_id or 1, last_id is not None])
+    schema_editor.execute(f"ALTER TABLE {table} ALTER COLUMN {pk_column} SET DEFAULT nextval('{sequence}')")
+    schema_editor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY ({pk_column}, {column})')
+
+    for fields in model._meta.unique_together:
+        schema_editor.execute(schema_editor._create_unique_sql(
+            model, [model._meta.get_field(name) for name in fields]
+        ))
+    for statement in schema_editor._model_indexes_sql(model):
+        schema_editor.execute(statement)
+    for constraint in model._meta.constraints:
+        schema_editor.add_constraint(model, constraint)
+    for related in model._meta.local_fields:
+        if related.remote_field and related.db_constraint:
+            schema_editor.execute(
+                schema_editor._create_fk_sql(model, related, '_fk_%(to_table)s_%(to_column)s')
+            )
+
+
+class PartitionByRange(Operation):
+    """
+    Operación de migración que particiona por mes la tabla de un modelo de
+    PARTITIONED_MODELS (solo PostgreSQL; en otros motores no hace nada)
+    """
+    reversible = False
+
+    def __init__(self, model_name, months_ahead=3):
+        self.model_name = model_name
+        self.months_ahead = months_ahead
+
+    def deconstruct(self):
+        return self.__class__.__name__, [self.model_name], {'months_ahead': self.months_ahead}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        convert_to_partitioned(schema_editor, model, self.months_ahead)
+
+    def describe(self):
+        return f'Particiona {self.model_name} por mes'
+
+
+def archive_dir():
+    path = Path(settings.PARTITION_ARCHIVE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _archive_paths(model, month):
+    base = archive_dir() / partition_name(model, month)
+    return base.with_suffix('.csv.gz'), base.with_suffix('.json')
+
+
+def archived_months(model):
+    """
+    Meses archivados del modelo (con manifiesto) que no están adjuntos
+    """
+    table = model._meta.db_table
+    months = set()
+    for manifest in archive_dir().glob(f'{table}_p*.json'):
+        match = PARTITION_SUFFIX.search(manifest.stem)
+        if match and manifest.stem[:match.start()] == table:
+            months.add(date(int(match.group(1)), int(match.group(2)), 1))
+    # Sin manifiestos no se consulta la base de datos: los reportes y las
+    # series llaman a esta función en cada petición
+    if not months or not is_partitioned(model):
+        return []
+    return sorted(months - set(attached_months(model)))
+
+
+def archive_partition(model, month):
+    """
+    Exporta una partición a CSV comprimido, la separa y la elimina
+
+    El manifiesto registra límites, columnas, filas y el hash SHA-256 del
+    archivo. Emite rows_archived con los ids exportados. Retorna la cantidad de filas exportadas.
+    """
+    quote = connection.ops.quote_name
+    name = quote(partition_name(model, month))
+    data_path, manifest_path = _archive_paths(model, month)
+    tmp_path = data_path.with_name(data_path.name + '.tmp')
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {name} IN SHARE MODE')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', newline='') as stream:
+            cursor.cursor.copy_expert(f'COPY {name} TO STDOUT WITH (FORMAT csv, HEADER true)', stream)
+        cursor.execute(f'SELECT {quote(model._meta.pk.column)} FROM {name}')
+        ids = [row[0] for row in cursor.fetchall()]
+        rows = len(ids)
+        tmp_path.replace(data_path)
+        manifest_path.write_text(json.dumps({
+            'model': model._meta.label,
+            'partition': partition_name(model, month),
+            'from': _bound(model, month),
+            'to': _bound(model, add_months(month, 1)),
+            'columns': [field.column for field in model._meta.concrete_fields],
+            'rows': rows,
+            'sha256': hashlib.sha256(data_path.read_bytes()).hexdigest(),
+            'archived_at': timezone.now().isoformat(),
+        }, indent=2))
+        cursor.execute(f'ALTER TABLE {quote(model._meta.db_table)} DETACH PARTITION {name}')
+        cursor.execute(f'DROP TABLE {name}')
+        rows_archived.send(sender=model, ids=ids)
+    logger.info('Partición %s archivada (%s filas)', partition_name(model, month), rows)
+    return rows
+
+
+def recently_restored(model, month, now=None):
+    """
+    Indica si la partición de un mes se restauró hace menos de
+    PARTITION_RESTORE_HOLD_DAYS días
+    """
+    manifest_path = _archive_paths(model, month)[1]
+    if not manifest_path.exists():
+        return False
+    restored_at = json.loads(manifest_path.read_text()).get('restored_at')
+    if not restored_at:
+        return False
+    held = (now or timezone.now()) - datetime.fromisoformat(restored_at)
+    return held.days < settings.PARTITION_RESTORE_HOLD_DAYS
+
+
+def archive_partitions_before(model, before_month):
+    """
+    Archiva las particiones de los meses anteriores a before_month, salvo
+    las restauradas recientemente
+
+    Retorna un diccionario mes -> filas archivadas.
+    """
+    if not is_partitioned(model):
+        return {}
+    return {
+        month: archive_partition(model, month)
+        for month in attached_months(model)
+        if month < before_month and not recently_restored(model, month)
+    }
+
+
+def restore_partition(model, month):
+    """
+    Vuelve a importar y adjuntar una partición archivada
+
+    Retorna la cantidad de filas restauradas, o None si otro proceso ya la
+    restauró.
+    """
+    data_path, manifest_path = _archive_paths(model, month)
+    manifest = json.loads(manifest_path.read_text())
+    if hashlib.sha256(data_path.read_bytes()).hexdigest() != manifest['sha256']:
+        raise ValueError(f'El archivo {data_path.name} no coincide con su manifiesto')
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [manifest['partition']])
+        if month in attached_months(model):
+            return None
+        with gzip.open(data_path, 'rt', encoding='utf-8', newline='') as stream:
+            header = next(csv.reader([stream.readline()]))
+            # Las columnas agregadas al modelo después de archivar toman su
+            # valor por defecto; las eliminadas impiden restaurar
+            unknown = set(header) - {field.column for field in model._meta.concrete_fields}
+            if unknown:
+                raise ValueError(
+                    f"Columnas de {data_path.name} inexistentes en {model._meta.label}: {', '.join(sorted(unknown))}"
+                )
+            stream.seek(0)
+            _attach_month(model, month, cursor, source=stream, columns=header)
+        manifest['restored_at'] = timezone.now().isoformat()
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+    logger.info('Partición %s restaurada (%s filas)', manifest['partition'], manifest['rows'])
+    return manifest['rows']
+
+
+def archived_months_in_range(model, start=None, end=None):
+    """
+    Meses archivados del modelo dentro del rango [start, end] (extremos
+    opcionales: un extremo abierto incluye todos los meses de ese lado)
+    """
+    if not is_supported() or model._meta.label not in PARTITIONED_MODELS:
+        return []
+    first = month_start(start) if start else None
+    last = month_start(end) if end else None
+    return [
+        month for month in archived_months(model)
+        if (first is None or month >= first) and (last is None or month <= last)
+    ]
+
+
+def check_archived_range(model, start=None, end=None):
+    """
+    Lanza ArchivedRangeError si el rango incluye meses archivados
+
+    Sin manifiestos no consulta la base de datos, por lo que se puede llamar
+    en cada petición.
+    """
+    months = archived_months_in_range(model, start, end)
+    if months:
+        raise ArchivedRangeError(model, months)
+
+
+def restore_archived_range(model, start, end, max_months=None):
+    """
+    Restaura las particiones archivadas que cubren el rango [start, end]
+    para que el ORM vea todas sus filas
+
+    El rango debe ser cerrado y abarcar como máximo max_months meses (por
+    defecto PARTITION_RESTORE_MAX_MONTHS). Retorna los meses restaurados.
+    """
+    if start is None or end is None:
+        raise ValueError('El rango a restaurar debe tener inicio y fin')
+    if max_months is None:
+        max_months = settings.PARTITION_RESTORE_MAX_MONTHS
+    first, last = month_start(start), month_start(end)
+    span = (last.year - first.year) * 12 + last.month - first.month + 1
+    if span < 1 or span > max_months:
+        raise ValueError(f'El rango a restaurar debe abarcar entre 1 y {max_months} meses')
+    restored = []
+    for month in archived_months_in_range(model, first, last):
+        restore_partition(model, month)
+        restored.append(month)
+    return restored
+
+
+def maintain_partitions(months_ahead=None, retention_months=None, today=None):
+    """
+    Crea las particiones futuras de todos los modelos particionados y, si
+    retention_months es mayor que cero, archiva las de meses anteriores
+
+    Retorna un diccionario por modelo con los meses creados y archivados.
+    """
+    if retention_months is None:
+        retention_months = settings.PARTITION_RETENTION_MONTHS
+    current = month_start(today or timezone.localdate())
+    summary = {}
+    for model in partitioned_models():
+        if not is_partitioned(model):
+            continue
+        created = ensure_future_partitions(model, months_ahead, today=current)
+        archived = {}
+        if retention_months > 0:
+            archived = archive_partitions_before(model, add_months(current, -retention_months))
+        summary[model._meta.label] = {'created': created, 'archived': archived}
+    return summary
@@ -0,0 +1,224 @@
+"""
+Perfilado de peticiones: cantidad de consultas SQL, tiempo en base de datos,
+tiempo total y memoria asignada por vista
+
+El middleware registra cada petición en el logger logistica_hr.profiling,
+acumula estadísticas por nombre de URL (por proceso) y compara la cantidad
+de consultas con el presupuesto declarado en QUERY_BUDGETS.
+"""
+
+import logging
+import threading
+import time
+import tracemalloc
+
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('logistica_hr.profiling')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Una vista o bloque de código superó su presupuesto de consultas
+    """
+
+
+class QueryCounter:
+    """
+    Cuenta las consultas y el tiempo en base de datos de todas las conexiones
+
+    Usa execute_wrapper, por lo que funciona con DEBUG desactivado.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements.append(sql)
+
+    @contextmanager
+    def capture(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+
+class ProfileStore:
+    """
+    Estadísticas acumuladas por vista en memoria del proceso
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, profile):
+        with self._lock:
+            stats = self._views.setdefault(view_name, {
+                'requests': 0,
+                'queries_total': 0,
+                'queries_max': 0,
+                'db_ms_total': 0.0,
+                'total_ms_total': 0.0,
+                'total_ms_max': 0.0,
+                'alloc_kb_max': 0.0,
+                'budget_exceeded': 0,
+            })
+            stats['requests'] += 1
+            stats['queries_total'] += profile['queries']
+            stats['queries_max'] = max(stats['queries_max'], profile['queries'])
+            stats['db_ms_total'] += profile['db_ms']
+            stats['total_ms_total'] += profile['total_ms']
+            stats['total_ms_max'] = max(stats['total_ms_max'], profile['total_ms'])
+            if profile['alloc_kb'] is not None:
+                stats['alloc_kb_max'] = max(stats['alloc_kb_max'], profile['alloc_kb'])
+            if profile['over_budget']:
+                stats['budget_exceeded'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            views = {name: dict(stats) for name, stats in self._views.items()}
+        for name, stats in views.items():
+            requests = stats['requests']
+            stats['queries_avg'] = round(stats['queries_total'] / requests, 2)
+            stats['db_ms_avg'] = round(stats['db_ms_total'] / requests, 2)
+            stats['total_ms_avg'] = round(stats['total_ms_total'] / requests, 2)
+            stats['query_budget'] = query_budget(name)
+            for key in ['db_ms_total', 'total_ms_total', 'total_ms_max', 'alloc_kb_max']:
+                stats[key] = round(stats[key], 2)
+        return views
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+profile_store = ProfileStore()
+
+
+def query_budget(view_name):
+    """
+    Retorna el presupuesto de consultas declarado para una vista o None
+    """
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(view_name)
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match._func_path
+
+
+class RequestProfilingMiddleware:
+    """
+    Middleware que mide cada petición y la registra por nombre de URL
+
+    La medición de memoria (PERFORMANCE_TRACE_ALLOCATIONS) usa tracemalloc,
+    que es global al proceso y encarece cada asignación; se recomienda solo
+    en desarrollo o con un único hilo por proceso.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PERFORMANCE_PROFILING', False)
+        self.trace_allocations = getattr(settings, 'PERFORMANCE_TRACE_ALLOCATIONS', False)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        baseline = _start_tracing() if self.trace_allocations else None
+        start = time.perf_counter()
+        counter = QueryCounter()
+        with counter.capture():
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+        alloc_kb = _allocated_kb(baseline) if baseline is not None else None
+
+        view_name = _view_name(request)
+        budget = query_budget(view_name)
+        profile = {
+            'view': view_name,
+            'queries': counter.count,
+            'db_ms': counter.duration * 1000,
+            'total_ms': total * 1000,
+            'alloc_kb': alloc_kb,
+            'query_budget': budget,
+            'over_budget': budget is not None and counter.count > budget,
+        }
+        request.profile = profile
+        profile_store.record(view_name, profile)
+
+        level = logging.WARNING if profile['over_budget'] else logging.INFO
+        logger.log(
+            level,
+            'view=%s method=%s status=%s queries=%s budget=%s db_ms=%.1f total_ms=%.1f alloc_kb=%s',
+            view_name, request.method, response.status_code, counter.count, budget,
+            profile['db_ms'], profile['total_ms'],
+            f'{alloc_kb:.1f}' if alloc_kb is not None else '-',
+        )
+        response['Server-Timing'] = (
+            f"db;dur={profile['db_ms']:.1f}, total;dur={profile['total_ms']:.1f}"
+        )
+        return response
+
+
+def _start_tracing():
+    """Inicia tracemalloc si es necesario y retorna la memoria trazada actual"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _allocated_kb(baseline):
+    """Pico de memoria asignada desde la línea base, en KB"""
+    return max(0, tracemalloc.get_traced_memory()[1] - baseline) / 1024
+
+
+@contextmanager
+def max_queries(limit, label='bloque'):
+    """
+    Falla con QueryBudgetExceeded si el bloque ejecuta más de limit consultas
+
+    Uso en pruebas:
+        with max_queries(3):
+            client.get(url)
+    """
+    counter = QueryCounter()
+    with counter.capture():
+        yield counter
+    if counter.count > limit:
+        raise QueryBudgetExceeded(
+            f'{label} ejecutó {counter.count} consultas (presupuesto {limit}):\n'
+            + '\n'.join(counter.statements)
+        )
+
+
+def assert_within_budget(response):
+    """
+    Falla si la petición de una respuesta del cliente de pruebas superó el
+    presupuesto de consultas declarado para su vista en QUERY_BUDGETS
+    """
+    profile = getattr(response.wsgi_request, 'profile', None)
+    if profile is None:
+        raise AssertionError('La petición no fue perfilada (PERFORMANCE_PROFILING desactivado)')
+    if profile['over_budget']:
+        raise QueryBudgetExceeded(
+            f"{profile['view']} ejecutó {profile['queries']} consultas "
+            f"(presupuesto {profile['query_budget']})"
+        )
+    return profile
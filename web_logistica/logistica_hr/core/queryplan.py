@@ -0,0 +1,46 @@
+"""
+Inspección de planes de consulta
+
+Permite verificar que las consultas de un listado se resuelven con índices
+y no con lecturas secuenciales de la tabla completa.
+"""
+
+import re
+
+from django.db import connections, transaction
+
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN (?:TABLE )?"?(\w+)"?(?!.*\bUSING\b)')
+POSTGRESQL_FULL_SCAN = re.compile(r'Seq Scan on "?(\w+)"?')
+
+
+def explain(queryset):
+    """
+    Retorna el plan de ejecución de un queryset como lista de líneas
+
+    En PostgreSQL se desactivan las lecturas secuenciales durante el EXPLAIN
+    para que el planificador elija un índice siempre que exista uno
+    utilizable, independiente del tamaño actual de la tabla.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.explain().splitlines()
+    with transaction.atomic(using=queryset.db):
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain().splitlines()
+
+
+def full_table_scans(queryset, tables=None):
+    """
+    Retorna las líneas del plan que leen completa alguna de las tablas
+
+    Si no se indican tablas se revisa la tabla principal del queryset.
+    """
+    tables = set(tables or [queryset.model._meta.db_table])
+    pattern = POSTGRESQL_FULL_SCAN if connections[queryset.db].vendor == 'postgresql' else SQLITE_FULL_SCAN
+    scans = []
+    for line in explain(queryset):
+        match = pattern.search(line)
+        if match and match.group(1) in tables:
+            scans.append(line.strip())
+    return scans
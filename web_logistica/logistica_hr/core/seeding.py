@@ -0,0 +1,400 @@
+"""
+Generador de datos sintéticos de bodega
+
+Crea con bulk_create departamentos, posiciones, empleados (con sus usuarios
+y horarios), años de registros diarios y de rendimiento, y tareas con
+registros de tiempo y comentarios, para pruebas de carga y benchmarks. Los
+valores salen de un generador pseudoaleatorio con semilla, por lo que dos
+ejecuciones con los mismos parámetros producen los mismos datos.
+
+Las filas se construyen y escriben por lotes: la memoria depende del tamaño
+del lote y no del volumen total. bulk_create no emite señales, por lo que
+al terminar se reconstruyen los agregados de productividad del rango y se
+invalida la caché de datos de referencia; el índice de búsqueda se debe
+reconstruir con rebuild_search_index.
+"""
+
+import random
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import invalidate_reference
+
+# Prefijo de los usuarios y códigos de empleado generados
+SEED_PREFIX = 'seed'
+
+# Volúmenes predefinidos
+SCALES = {
+    'small': {'employees': 50, 'years': 1, 'tasks': 5000},
+    'medium': {'employees': 1000, 'years': 2, 'tasks': 200000},
+    'large': {'employees': 5000, 'years': 3, 'tasks': 2000000},
+}
+
+DEFAULT_BATCH_SIZE = 5000
+
+DEPARTMENTS = {
+    'Recepción': ['Operario de Recepción', 'Inspector de Calidad'],
+    'Almacenamiento': ['Operador de Montacargas', 'Operario de Almacén'],
+    'Picking': ['Preparador de Pedidos', 'Líder de Picking'],
+    'Empaque': ['Empacador', 'Etiquetador'],
+    'Despacho': ['Operario de Despacho', 'Coordinador de Transporte'],
+    'Inventario': ['Auxiliar de Inventario', 'Analista de Inventario'],
+    'Mantenimiento': ['Técnico de Mantenimiento'],
+}
+
+TASK_CATEGORIES = [
+    ('Recepción de camiones', 3, '#17a2b8'),
+    ('Almacenamiento', 2, '#28a745'),
+    ('Preparación de pedidos', 3, '#ffc107'),
+    ('Despacho', 4, '#dc3545'),
+    ('Conteo cíclico', 1, '#6c757d'),
+    ('Mantenimiento', 2, '#007bff'),
+]
+
+METRICS = [
+    ('Paquetes por hora', 'productivity', 'paquetes/h', Decimal('120'), Decimal('60'), Decimal('1.00')),
+    ('Precisión de picking', 'quality', '%', Decimal('99.5'), Decimal('95'), Decimal('0.80')),
+    ('Utilización', 'efficiency', '%', Decimal('85'), Decimal('50'), Decimal('0.60')),
+    ('Puntualidad', 'attendance', '%', Decimal('98'), Decimal('80'), Decimal('0.50')),
+    ('Incidentes', 'safety', 'incidentes', Decimal('0'), Decimal('3'), Decimal('0.70')),
+]
+
+SKILLS = ['montacargas', 'picking', 'inventario', 'despacho', 'recepción', 'empaque', 'radiofrecuencia']
+CERTIFICATIONS = ['montacargas', 'primeros auxilios', 'materiales peligrosos', 'trabajo en altura']
+
+TASK_ACTIONS = ['Descargar', 'Ubicar', 'Preparar', 'Cargar', 'Contar', 'Revisar', 'Reabastecer']
+TASK_OBJECTS = ['camión', 'pedido', 'pallet', 'pasillo', 'contenedor', 'muelle', 'rack']
+COMMENTS = [
+    'Se completó sin novedades.',
+    'Faltan unidades en la ubicación indicada.',
+    'El camión llegó con retraso.',
+    'Se requiere apoyo de montacargas.',
+    'Mercadería con embalaje dañado.',
+    'Pendiente de confirmación del supervisor.',
+]
+
+# Modelos con filas masivas generadas
+SEEDED_MODELS = [
+    'employees.Employee', 'employees.EmployeeQualification', 'employees.ReportingLine',
+    'employees.WorkSchedule', 'performance.DailyWorkLog',
+    'performance.EmployeePerformance', 'tasks.Task', 'tasks.TaskTimeLog', 'tasks.TaskComment',
+]
+
+SHIFTS = [(time(6), time(14)), (time(14), time(22)), (time(8), time(17))]
+
+
+def _batches(iterable, size):
+    """Divide un iterable en listas de hasta size elementos"""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _bulk_create(model, objects, batch_size):
+    """Inserta por lotes los objetos de un generador; retorna la cantidad"""
+    total = 0
+    for batch in _batches(objects, batch_size):
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        total += len(batch)
+    return total
+
+
+def _shift(employee):
+    """Turno fijo de un empleado"""
+    return SHIFTS[employee.pk % len(SHIFTS)]
+
+
+def _working_days(start, end):
+    """Días de lunes a sábado entre dos fechas (inclusive)"""
+    day = start
+    while day <= end:
+        if day.weekday() < 6:
+            yield day
+        day += timedelta(days=1)
+
+
+def seed_exists():
+    """Indica si la base de datos ya tiene datos sintéticos"""
+    return get_user_model().objects.filter(username__startswith=f'{SEED_PREFIX}_').exists()
+
+
+def seed_reference_data():
+    """
+    Crea (o reutiliza) departamentos, posiciones, categorías y métricas
+
+    Retorna (posiciones, categorías, métricas).
+    """
+    Department = apps.get_model('employees', 'Department')
+    Position = apps.get_model('employees', 'Position')
+    TaskCategory = apps.get_model('tasks', 'TaskCategory')
+    PerformanceMetric = apps.get_model('performance', 'PerformanceMetric')
+
+    positions = []
+    for department_name, position_names in DEPARTMENTS.items():
+        department, _ = Department.objects.get_or_create(name=department_name)
+        for position_name in position_names:
+            position, _ = Position.objects.get_or_create(
+                name=position_name, department=department,
+                defaults={'base_salary': Decimal('650000')}
+            )
+            positions.append(position)
+    categories = [
+        TaskCategory.objects.get_or_create(name=name, defaults={'priority': priority, 'color': color})[0]
+        for name, priority, color in TASK_CATEGORIES
+    ]
+    metrics = [
+        PerformanceMetric.objects.get_or_create(name=name, defaults={
+            'metric_type': metric_type, 'unit': unit, 'target_value': target,
+            'min_value': minimum, 'weight': weight,
+        })[0]
+        for name, metric_type, unit, target, minimum, weight in METRICS
+    ]
+    return positions, categories, metrics
+
+
+def seed_employees(count, positions, rng, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Crea count empleados con sus usuarios y horarios semanales
+
+    Uno de cada veinte empleados es supervisor de los siguientes. Retorna la
+    lista de empleados creados.
+    """
+    from logistica_hr.employees.hierarchy import rebuild_reporting_lines
+    from logistica_hr.employees.qualifications import sync_employee_qualifications
+
+    User = get_user_model()
+    Employee = apps.get_model('employees', 'Employee')
+    WorkSchedule = apps.get_model('employees', 'WorkSchedule')
+
+    # Todos los usuarios sintéticos comparten la contraseña 'seed'
+    password = make_password(SEED_PREFIX)
+    users = User.objects.bulk_create([
+        User(
+            username=f'{SEED_PREFIX}_{index:07d}',
+            first_name=f'Nombre{index}',
+            last_name=f'Apellido{index % 500}',
+            email=f'{SEED_PREFIX}{index}@example.com',
+            password=password,
+        )
+        for index in range(count)
+    ], batch_size=batch_size)
+
+    today = timezone.localdate()
+    supervisor = None
+    employees = []
+    for index, user in enumerate(users):
+        if index % 20 == 0:
+            supervisor = user
+        employees.append(Employee(
+            user=user,
+            employee_id=f'{SEED_PREFIX.upper()}{index:07d}',
+            position=rng.choice(positions),
+            hire_date=today - timedelta(days=rng.randint(30, 3650)),
+            supervisor=None if supervisor is user else supervisor,
+            skills=rng.sample(SKILLS, rng.randint(1, 3)),
+            certifications=rng.sample(CERTIFICATIONS, rng.randint(0, 2)),
+        ))
+    employees = Employee.objects.bulk_create(employees, batch_size=batch_size)
+    # bulk_create no emite las señales que mantienen el índice de habilidades
+    # y la jerarquía de supervisión
+    sync_employee_qualifications(
+        [(employee.pk, employee.skills, employee.certifications) for employee in employees],
+        chunk_size=batch_size,
+    )
+    rebuild_reporting_lines()
+
+    def schedules():
+        for employee in employees:
+            start, end = _shift(employee)
+            for day in range(6):
+                yield WorkSchedule(
+                    employee=employee, day_of_week=day, start_time=start, end_time=end,
+                    break_start=time(start.hour + 4), break_end=time(start.hour + 4, 30),
+                )
+
+    _bulk_create(WorkSchedule, schedules(), batch_size)
+    return employees
+
+
+def seed_daily_logs(employees, start, end, rng, batch_size=DEFAULT_BATCH_SIZE):
+    """Crea un registro diario por empleado y día laboral del rango"""
+    DailyWorkLog = apps.get_model('performance', 'DailyWorkLog')
+
+    def rows():
+        for day in _working_days(start, end):
+            for employee in employees:
+                if rng.random() < 0.05:
+                    continue  # Ausencias
+                shift_start, shift_end = _shift(employee)
+                yield DailyWorkLog(
+                    employee=employee,
+                    date=day,
+                    start_time=shift_start,
+                    end_time=shift_end,
+                    total_break_time=timedelta(minutes=rng.choice([30, 45, 60])),
+                    packages_processed=max(0, int(rng.gauss(400, 90))),
+                    trucks_received=rng.randint(0, 6),
+                    trucks_dispatched=rng.randint(0, 6),
+                    quality_score=Decimal(f'{min(1.0, max(0.5, rng.gauss(0.93, 0.04))):.2f}'),
+                    safety_incidents=1 if rng.random() < 0.01 else 0,
+                    notes='Incidente reportado' if rng.random() < 0.02 else '',
+                )
+
+    return _bulk_create(DailyWorkLog, rows(), batch_size)
+
+
+def seed_performance(employees, metrics, start, end, rng, batch_size=DEFAULT_BATCH_SIZE):
+    """Crea una medición semanal (lunes) por empleado y métrica"""
+    EmployeePerformance = apps.get_model('performance', 'EmployeePerformance')
+    monday = start + timedelta(days=-start.weekday() % 7)
+
+    def rows():
+        day = monday
+        while day <= end:
+            for employee in employees:
+                for metric in metrics:
+                    spread = max(float(metric.target_value - metric.min_value), 1.0)
+                    value = rng.gauss(float(metric.target_value) - spread * 0.2, spread * 0.3)
+                    yield EmployeePerformance(
+                        employee=employee,
+                        metric=metric,
+                        date=day,
+                        actual_value=Decimal(f'{max(0.0, value):.2f}'),
+                        evaluated_by=employee.supervisor,
+                    )
+            day += timedelta(days=7)
+
+    return _bulk_create(EmployeePerformance, rows(), batch_size)
+
+
+def seed_tasks(count, employees, categories, start, end, rng, time_logs_per_task=2,
+               comments_per_task=1, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Crea count tareas repartidas entre start y end con sus registros de
+    tiempo y comentarios
+
+    Retorna (tareas, registros de tiempo, comentarios) creados.
+    """
+    Task = apps.get_model('tasks', 'Task')
+    TaskTimeLog = apps.get_model('tasks', 'TaskTimeLog')
+    TaskComment = apps.get_model('tasks', 'TaskComment')
+
+    now = timezone.now()
+    first = timezone.make_aware(datetime.combine(start, time(6)))
+    span = max(1, int((timezone.make_aware(datetime.combine(end, time(22))) - first).total_seconds()))
+    statuses = [status for status, _ in Task.STATUS_CHOICES]
+    priorities = [priority for priority, _ in Task.PRIORITY_CHOICES]
+
+    def tasks():
+        for index in range(count):
+            created = first + timedelta(seconds=rng.randrange(span))
+            estimated = Decimal(rng.choice(['0.50', '1.00', '2.00', '4.00', '8.00']))
+            # Las tareas antiguas en su mayoría están cerradas
+            status = 'completed' if created < now - timedelta(days=14) and rng.random() < 0.85 else rng.choice(statuses)
+            started = created + timedelta(minutes=rng.randint(5, 240)) if status != 'pending' else None
+            actual = (estimated * Decimal(f'{rng.uniform(0.6, 1.6):.2f}')).quantize(Decimal('0.01'))
+            employee = rng.choice(employees)
+            yield Task(
+                title=f'{rng.choice(TASK_ACTIONS)} {rng.choice(TASK_OBJECTS)} {index}',
+                description=f'Tarea sintética {index} de {employee.position}',
+                category=rng.choice(categories),
+                assigned_to=employee,
+                assigned_by=employee.supervisor,
+                status=status,
+                priority=rng.choices(priorities, weights=[3, 5, 2, 1])[0],
+                due_date=created + timedelta(hours=rng.randint(2, 72)),
+                estimated_hours=estimated,
+                actual_hours=actual if status == 'completed' else None,
+                start_date=started,
+                completion_date=started + timedelta(hours=float(actual)) if status == 'completed' else None,
+            )
+
+    totals = [0, 0, 0]
+    for batch in _batches(tasks(), batch_size):
+        with transaction.atomic():
+            created_tasks = Task.objects.bulk_create(batch)
+            time_logs, comments = [], []
+            for task in created_tasks:
+                moment = task.start_date or task.due_date - timedelta(hours=2)
+                for _ in range(time_logs_per_task):
+                    minutes = rng.randint(15, 180)
+                    time_logs.append(TaskTimeLog(
+                        task=task, employee=task.assigned_to, start_time=moment,
+                        end_time=moment + timedelta(minutes=minutes),
+                        description='Trabajo en la tarea', is_break=rng.random() < 0.1,
+                    ))
+                    moment += timedelta(minutes=minutes + rng.randint(0, 60))
+                for _ in range(comments_per_task):
+                    comments.append(TaskComment(
+                        task=task, author=task.assigned_by or task.assigned_to.user,
+                        content=rng.choice(COMMENTS), is_internal=rng.random() < 0.2,
+                    ))
+            TaskTimeLog.objects.bulk_create(time_logs, batch_size=batch_size)
+            TaskComment.objects.bulk_create(comments, batch_size=batch_size)
+        totals[0] += len(created_tasks)
+        totals[1] += len(time_logs)
+        totals[2] += len(comments)
+    return tuple(totals)
+
+
+def seed_warehouse_data(employees=50, years=1, tasks=5000, time_logs_per_task=2,
+                        comments_per_task=1, seed=0, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Genera un conjunto completo de datos sintéticos de bodega
+
+    progress es una función opcional que recibe mensajes de avance. Retorna
+    un diccionario con la cantidad de filas creadas por modelo.
+    """
+    progress = progress or (lambda message: None)
+    rng = random.Random(seed)
+    end = timezone.localdate()
+    start = end - timedelta(days=365 * years - 1)
+
+    positions, categories, metrics = seed_reference_data()
+    created = {}
+
+    with transaction.atomic():
+        staff = seed_employees(employees, positions, rng, batch_size)
+    created['employees'] = len(staff)
+    progress(f'Empleados: {len(staff)}')
+
+    created['daily_work_logs'] = seed_daily_logs(staff, start, end, rng, batch_size)
+    progress(f"Registros diarios: {created['daily_work_logs']}")
+
+    created['performance'] = seed_performance(staff, metrics, start, end, rng, batch_size)
+    progress(f"Mediciones de rendimiento: {created['performance']}")
+
+    # core no depende de performance a nivel de módulo (settings_sqlite solo
+    # instala core)
+    from logistica_hr.performance.services import rebuild_productivity_rollups
+    rebuild_productivity_rollups(start, end, chunk_size=batch_size)
+    progress('Agregados de productividad reconstruidos')
+
+    created['tasks'], created['time_logs'], created['comments'] = seed_tasks(
+        tasks, staff, categories, start, end, rng,
+        time_logs_per_task=time_logs_per_task,
+        comments_per_task=comments_per_task,
+        batch_size=batch_size,
+    )
+    progress(f"Tareas: {created['tasks']}, registros de tiempo: {created['time_logs']}, "
+             f"comentarios: {created['comments']}")
+
+    if connection.vendor == 'postgresql':
+        # Estadísticas del planificador (y conteos estimados del admin)
+        # actualizadas después de la carga masiva
+        with connection.cursor() as cursor:
+            for label in SEEDED_MODELS:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(apps.get_model(label)._meta.db_table)}')
+
+    # WorkSchedule invalida el índice de cobertura de turnos
+    for label in ['employees.Department', 'employees.Position', 'employees.WorkSchedule',
+                  'tasks.TaskCategory', 'performance.PerformanceMetric']:
+        invalidate_reference(apps.get_model(label))
+    return created
@@ -0,0 +1,47 @@
+"""
+Señales de la aplicación core
+"""
+
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_save, pre_migrate
+from django.dispatch import Signal, receiver
+
+from .cache import invalidate_reference, is_reference_model
+from .models import BaseModel
+
+# Se emite después de mover filas a las tablas de archivo (core.archive) o
+# de archivar una partición (core.partitioning);
+# argumentos: sender (modelo) e ids (claves primarias archivadas)
+rows_archived = Signal()
+
+# Extensiones de PostgreSQL que requieren los índices del proyecto
+POSTGRESQL_EXTENSIONS = ['pg_trgm']
+
+
+@receiver(pre_migrate)
+def create_postgresql_extensions(sender, using='default', **kwargs):
+    """
+    Crea las extensiones de PostgreSQL antes de aplicar las migraciones
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for extension in POSTGRESQL_EXTENSIONS:
+            cursor.execute(f'CREATE EXTENSION IF NOT EXISTS {extension}')
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_reference_cache(sender, instance, using=None, **kwargs):
+    """
+    Invalida la caché de datos de referencia al guardar o eliminar un objeto
+
+    Se invalida de inmediato y nuevamente al confirmar la transacción, para
+    descartar lo que otra petición haya guardado con los datos anteriores
+    mientras la transacción seguía abierta.
+    """
+    if not isinstance(instance, BaseModel) or not is_reference_model(sender):
+        return
+    invalidate_reference(sender)
+    transaction.on_commit(lambda: invalidate_reference(sender), using=using)
@@ -0,0 +1,27 @@
+"""
+Tareas de Celery para la aplicación core
+"""
+
+import logging
+
+from celery import shared_task
+
+from .partitioning import maintain_partitions
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def maintain_table_partitions():
+    """
+    Crea las particiones de los próximos meses y archiva las que superan
+    PARTITION_RETENTION_MONTHS
+    """
+    summary = maintain_partitions()
+    for label, result in summary.items():
+        if result['created'] or result['archived']:
+            logger.info(
+                '%s: %s particiones creadas, %s archivadas',
+                label, len(result['created']), len(result['archived'])
+            )
+    return {label: {key: len(value) for key, value in result.items()} for label, result in summary.items()}
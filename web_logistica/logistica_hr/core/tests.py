@@ -0,0 +1,232 @@
+"""
+Pruebas para la aplicación core
+"""
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from logistica_hr.employees.models import Department, Employee, Position, Qualification, WorkSchedule
+from logistica_hr.performance.models import (
+    DailyWorkLog, EmployeePerformance, PerformanceMetric, ProductivityRollup,
+)
+from logistica_hr.tasks.models import Task, TaskComment, TaskTimeLog
+from .benchmarks import BENCHMARK_USERNAME, run_benchmarks
+from .cache import _version_key, active_reference_objects, invalidate_reference, reference_version
+from .cache_backends import _FAKE_SERVERS, FakeRedisCache
+from .profiling import assert_within_budget
+from .seeding import seed_warehouse_data
+
+
+class ResilientRedisCacheTests(SimpleTestCase):
+    """
+    La caché usa la LRU local mientras Redis no responde y vuelve a Redis,
+    vaciándolo, al recuperarse
+    """
+
+    def setUp(self):
+        self.cache = FakeRedisCache('redis://fake-tests:6379/1', {
+            'TIMEOUT': 300, 'OPTIONS': {'FALLBACK_RETRY': 30},
+        })
+        self.server = _FAKE_SERVERS['redis://fake-tests:6379/1']
+        self.server.connected = True
+        self.cache.clear()
+
+    def ttl(self, key):
+        redis_key = self.cache.make_and_validate_key(key)
+        return self.cache._cache.get_client(redis_key).ttl(redis_key)
+
+    def test_none_timeout_never_expires(self):
+        self.cache.set('forever', 1, timeout=None)
+        self.cache.add('added', 1, timeout=None)
+        self.cache.set_many({'many': 1}, timeout=None)
+        self.cache.set('touched', 1)
+        self.cache.touch('touched', timeout=None)
+        for key in ['forever', 'added', 'many', 'touched']:
+            with self.subTest(key):
+                self.assertEqual(self.ttl(key), -1)
+        self.cache.set('default', 1)
+        self.assertTrue(0 < self.ttl('default') <= 300)
+
+    def test_reference_version_key_never_expires(self):
+        with mock.patch('logistica_hr.core.cache.cache', self.cache):
+            reference_version(Department)
+            self.assertEqual(self.ttl(_version_key(Department)), -1)
+            invalidate_reference(Position)
+            self.assertEqual(self.ttl(_version_key(Position)), -1)
+
+    def test_outage_uses_local_cache_and_recovery_clears_redis(self):
+        self.cache.set('before', 'redis')
+        self.server.connected = False
+        with self.assertLogs('logistica_hr.core.cache_backends', 'WARNING'):
+            self.assertIsNone(self.cache.get('before'))
+        self.cache.set('during', 'local')
+        self.assertEqual(self.cache.get('during'), 'local')
+        self.assertTrue(self.cache._degraded)
+
+        # Al reintentar con Redis disponible se vacían ambas cachés
+        self.server.connected = True
+        self.cache._retry_at = 0
+        with self.assertLogs('logistica_hr.core.cache_backends', 'INFO'):
+            self.assertIsNone(self.cache.get('during'))
+        self.assertIsNone(self.cache.get('before'))
+        self.assertFalse(self.cache._degraded)
+        self.cache.set('after', 'redis')
+        self.assertGreater(self.ttl('after'), 0)
+
+    def test_local_cache_is_bounded(self):
+        cache = FakeRedisCache('redis://fake-tests-lru:6379/1', {'OPTIONS': {'FALLBACK_MAX_ENTRIES': 5}})
+        _FAKE_SERVERS['redis://fake-tests-lru:6379/1'].connected = False
+        try:
+            with self.assertLogs('logistica_hr.core.cache_backends', 'WARNING'):
+                for index in range(20):
+                    cache.set(f'key-{index}', index)
+            self.assertLessEqual(len(cache._fallback._cache), 5)
+        finally:
+            _FAKE_SERVERS['redis://fake-tests-lru:6379/1'].connected = True
+
+
+class ReferenceVersionTests(TestCase):
+    """
+    Guardar o eliminar un modelo de referencia cambia su versión en la caché
+    """
+
+    def test_save_and_delete_bump_version(self):
+        initial = reference_version(Department)
+        department = Department.objects.create(name='Bodega')
+        created = reference_version(Department)
+        self.assertNotEqual(created, initial)
+        department.name = 'Despacho'
+        department.save()
+        updated = reference_version(Department)
+        self.assertNotEqual(updated, created)
+        department.delete()
+        self.assertNotEqual(reference_version(Department), updated)
+
+
+@override_settings(PERFORMANCE_PROFILING=True)
+class QueryBudgetTests(TestCase):
+    """
+    Cada vista de QUERY_BUDGETS respeta su presupuesto de consultas con
+    varios registros en cada tabla
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create(username='admin', is_staff=True, is_superuser=True)
+        metric = PerformanceMetric.objects.create(
+            name='Paquetes', metric_type='productivity', unit='u',
+            target_value=Decimal('100'), min_value=Decimal('10'),
+        )
+        today = timezone.localdate()
+        for index in range(5):
+            department = Department.objects.create(name=f'Departamento {index}', manager=cls.admin)
+            position = Position.objects.create(name='Operario', department=department)
+            employee = Employee.objects.create(
+                user=User.objects.create(username=f'user_{index}', first_name='Operario'),
+                employee_id=f'E{index:03d}', position=position, supervisor=cls.admin,
+                hire_date=date(2020, 1, 1), skills=['Montacargas'], certifications=['Seguridad'],
+            )
+            WorkSchedule.objects.create(employee=employee, day_of_week=0, start_time=time(8), end_time=time(16))
+            task = Task.objects.create(
+                title=f'Inventario {index}', description='Conteo de bodega', assigned_to=employee,
+                assigned_by=cls.admin, due_date=timezone.now() + timedelta(days=index - 2),
+            )
+            TaskTimeLog.objects.create(
+                task=task, employee=employee, start_time=timezone.now() - timedelta(hours=3),
+                end_time=timezone.now() - timedelta(hours=1),
+            )
+            TaskComment.objects.create(task=task, author=cls.admin, content='Revisar pasillo 3')
+            for days in range(3):
+                DailyWorkLog.objects.create(
+                    employee=employee, date=today - timedelta(days=days), start_time=time(8),
+                    end_time=time(16), total_break_time=timedelta(minutes=30), packages_processed=20,
+                )
+                EmployeePerformance.objects.create(
+                    employee=employee, date=today - timedelta(days=days), metric=metric,
+                    actual_value=Decimal('50'),
+                )
+        cls.task = task
+
+    def setUp(self):
+        cache.clear()
+        # Los presupuestos suponen cargados los datos de referencia, que se
+        # mantienen en caché entre peticiones
+        active_reference_objects(Qualification)
+        self.client.force_login(self.admin)
+
+    def budget_requests(self):
+        """Petición de prueba (argumentos y parámetros) de cada vista"""
+        return {
+            'employees:employee-list': ([], {}),
+            'employees:department-list': ([], {}),
+            'employees:position-list': ([], {}),
+            'employees:workschedule-list': ([], {}),
+            'employees:schedule-coverage': ([], {'day': 0, 'start': '08:00', 'end': '16:00'}),
+            'employees:employee-match': ([], {'skills': 'montacargas', 'certifications': 'seguridad'}),
+            'tasks:task-list': ([], {}),
+            'tasks:task-timeline': ([self.task.pk], {}),
+            'performance:dashboard-summary': ([], {}),
+            'performance:performance-series': ([], {'group_by': 'employee'}),
+            'search:search': ([], {'q': 'inventario'}),
+            'health-check': ([], {}),
+            'admin:employees_employee_changelist': ([], {}),
+            'admin:tasks_task_changelist': ([], {}),
+            'admin:tasks_tasktimelog_changelist': ([], {}),
+            'admin:performance_employeeperformance_changelist': ([], {}),
+            'admin:performance_dailyworklog_changelist': ([], {}),
+        }
+
+    def test_every_budgeted_view_is_requested(self):
+        self.assertEqual(set(self.budget_requests()), set(settings.QUERY_BUDGETS))
+
+    def test_views_within_budget(self):
+        for view_name, (args, params) in self.budget_requests().items():
+            with self.subTest(view_name):
+                response = self.client.get(reverse(view_name, args=args), params)
+                self.assertEqual(response.status_code, 200)
+                profile = assert_within_budget(response)
+                self.assertEqual(profile['view'], view_name)
+
+
+class SeedWarehouseDataTests(TestCase):
+    """
+    Los agregados de productividad reflejan los registros diarios creados
+    por carga masiva, que no emite señales
+    """
+
+    def test_rollups_match_seeded_logs(self):
+        created = seed_warehouse_data(employees=3, years=1, tasks=5)
+        self.assertEqual(DailyWorkLog.objects.count(), created['daily_work_logs'])
+        for period in ['day', 'week', 'month']:
+            with self.subTest(period):
+                rollups = ProductivityRollup.objects.filter(period=period, employee__isnull=False)
+                self.assertEqual(
+                    rollups.aggregate(logs=Sum('log_count'), packages=Sum('packages_processed')),
+                    DailyWorkLog.objects.aggregate(logs=Count('pk'), packages=Sum('packages_processed')),
+                )
+
+
+class RunBenchmarksTests(TestCase):
+    """
+    El superusuario de benchmarks solo existe durante la ejecución
+    """
+
+    def test_benchmark_user_is_removed(self):
+        report = run_benchmarks(['api.reference_data'], rounds=1, warmup=0)
+        self.assertEqual(list(report['results']), ['api.reference_data'])
+        self.assertFalse(get_user_model().objects.filter(username=BENCHMARK_USERNAME).exists())
+
+    def test_existing_user_is_kept(self):
+        user = get_user_model().objects.create(username=BENCHMARK_USERNAME, is_staff=True, is_superuser=True)
+        run_benchmarks(['api.reference_data'], rounds=1, warmup=0)
+        self.assertTrue(get_user_model().objects.filter(pk=user.pk).exists())
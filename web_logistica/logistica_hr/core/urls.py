@@ -18,4 +18,6 @@ urlpatterns = [
     # API endpoints
     path('api/v1/', views.api_root, name='api-root'),  # API root
     path('api/v1/health/', views.health_check, name='health-check'),
+    path('api/v1/metrics/', views.metrics, name='metrics'),
+    path('api/v1/reference-data/', views.reference_data_view, name='reference-data'),
 ]
@@ -2,12 +2,27 @@
 Vistas de la aplicación core
 """
 
+from django.conf import settings
 from django.shortcuts import render
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
+from rest_framework import status
 from rest_framework.reverse import reverse
 
+from .cache import reference_data
+from .profiling import profile_store
+
+
+def archived_range_response(exc):
+    """
+    Respuesta 409 para una consulta sobre meses archivados (ArchivedRangeError)
+    """
+    return Response(
+        {'detail': str(exc), 'archived_months': [f'{month:%Y-%m}' for month in exc.months]},
+        status=status.HTTP_409_CONFLICT
+    )
+
 
 def home(request):
     """
@@ -72,3 +87,30 @@ def health_check(request):
         'message': 'Logistica HR API está funcionando correctamente'
     })
 
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    """
+    Estadísticas de consultas y latencia por vista del proceso actual
+
+    DELETE reinicia las estadísticas.
+    """
+    if request.method == 'DELETE':
+        profile_store.reset()
+    return Response({
+        'profiling_enabled': getattr(settings, 'PERFORMANCE_PROFILING', False),
+        'views': profile_store.snapshot(),
+    })
+
+
+@api_view(['GET'])
+def reference_data_view(request):
+    """
+    Catálogos de referencia activos (departamentos, posiciones, categorías
+    de tareas, métricas y plantillas de reportes) servidos desde la caché
+
+    ?models=employees.Department,tasks.TaskCategory limita los catálogos.
+    """
+    labels = [label for label in request.query_params.get('models', '').split(',') if label]
+    return Response(reference_data(labels or None))
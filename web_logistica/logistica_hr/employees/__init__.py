@@ -0,0 +1 @@
+# Aplicación de empleados del proyecto Logistica HR
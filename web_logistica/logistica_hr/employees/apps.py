@@ -6,5 +6,8 @@ class EmployeesConfig(AppConfig):
     name = 'logistica_hr.employees'
     verbose_name = 'Empleados'
 
+    def ready(self):
+        from . import signals  # noqa: F401
+
 
 
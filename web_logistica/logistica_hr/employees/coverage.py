@@ -0,0 +1,347 @@
+"""
+Cobertura de turnos a partir de WorkSchedule
+
+CoverageIndex guarda, para cada segmento (toda la empresa, departamento,
+posición y habilidad por departamento), un arreglo de NumPy con la cantidad
+de empleados en turno en cada minuto de la semana (7 x 1440 minutos, lunes
+00:00 = 0). Los descansos se descuentan y los turnos nocturnos continúan al
+día siguiente (el domingo continúa el lunes). Con el índice en memoria, las
+consultas de cobertura, brechas y superposición sobre cualquier ventana son
+operaciones sobre cortes del arreglo.
+
+El índice se guarda en la caché compartida con la versión de WorkSchedule
+(core.cache). Los cambios de un horario reemplazan solo su aporte al índice
+(señales de employees) y se publica la nueva versión; los cambios de
+empleados o posiciones invalidan la versión y el índice se reconstruye en
+la próxima lectura con una sola consulta.
+"""
+
+import threading
+
+import numpy as np
+
+from django.conf import settings
+from django.core.cache import cache
+
+from logistica_hr.core.cache import invalidate_reference, reference_key, reference_version
+from .models import Employee, WorkSchedule
+from .qualifications import normalize_qualification
+
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+CACHE_NAME = 'coverage-index'
+
+# Campos de WorkSchedule que definen su aporte a la cobertura
+SCHEDULE_FIELDS = ['employee_id', 'day_of_week', 'start_time', 'end_time', 'break_start', 'break_end']
+
+
+def _minute(value):
+    return value.hour * 60 + value.minute
+
+
+def schedule_intervals(day_of_week, start_time, end_time, break_start=None, break_end=None):
+    """
+    Retorna los intervalos [inicio, fin) en minutos de la semana de un turno
+    y su peso: +1 para el turno y -1 para el descanso
+
+    Los minutos pueden superar WEEK_MINUTES en los turnos que terminan
+    después del domingo; _week_segments los separa.
+    """
+    start = day_of_week * DAY_MINUTES + _minute(start_time)
+    length = (_minute(end_time) - _minute(start_time)) % DAY_MINUTES
+    if not length:
+        return []
+    intervals = [(start, start + length, 1)]
+    if break_start and break_end:
+        # El descanso se ubica dentro del turno aunque pase la medianoche
+        offset = (_minute(break_start) - _minute(start_time)) % DAY_MINUTES
+        duration = (_minute(break_end) - _minute(break_start)) % DAY_MINUTES
+        end = min(offset + duration, length)
+        if duration and offset < length:
+            intervals.append((start + offset, start + end, -1))
+    return intervals
+
+
+def _week_segments(start, end):
+    """Divide un intervalo que pasa del domingo al lunes"""
+    if end <= WEEK_MINUTES:
+        return [(start, end)]
+    if start >= WEEK_MINUTES:
+        return [(start - WEEK_MINUTES, end - WEEK_MINUTES)]
+    return [(start, WEEK_MINUTES), (0, end - WEEK_MINUTES)]
+
+
+def employee_segments(department_id, position_id, skills):
+    """
+    Segmentos a los que aporta un empleado, sin repetir
+
+    Las habilidades se normalizan como en el catálogo de calificaciones; un
+    empleado sin departamento aporta una sola vez a ('skill', None, ...).
+    """
+    segments = [('all',), ('department', department_id)]
+    if position_id is not None:
+        segments.append(('position', position_id))
+    for skill in map(normalize_qualification, skills or []):
+        if skill:
+            segments.append(('skill', None, skill))
+            segments.append(('skill', department_id, skill))
+    return list(dict.fromkeys(segments))
+
+
+class CoverageIndex:
+    """
+    Ocupación por minuto de la semana de cada segmento
+    """
+
+    def __init__(self, segments, occupancy, employees, schedules):
+        # segments: clave de segmento -> fila de occupancy
+        # employees: id de empleado -> filas a las que aporta
+        # schedules: id de horario -> (empleado, día, inicio, fin, descanso)
+        # incluidos en occupancy
+        self.segments = segments
+        self.occupancy = occupancy
+        self.employees = employees
+        self.schedules = schedules
+
+    @classmethod
+    def build(cls, employees, schedules):
+        """
+        Construye el índice a partir de filas (id, departamento, posición,
+        habilidades) de empleados y (id, empleado, día, inicio, fin, inicio
+        y fin de descanso) de horarios
+        """
+        segments = {}
+        employee_rows = {}
+        for employee_id, department_id, position_id, skills in employees:
+            rows = []
+            for segment in employee_segments(department_id, position_id, skills):
+                rows.append(segments.setdefault(segment, len(segments)))
+            employee_rows[employee_id] = rows
+
+        # Arreglo de diferencias: +peso al inicio y -peso al fin de cada
+        # intervalo; la suma acumulada da la ocupación por minuto
+        included = {}
+        rows, positions, weights = [], [], []
+        for schedule_id, employee_id, *schedule in schedules:
+            if employee_id not in employee_rows:
+                continue
+            included[schedule_id] = (employee_id, *schedule)
+            for start, end, weight in schedule_intervals(*schedule):
+                for segment_start, segment_end in _week_segments(start, end):
+                    for row in employee_rows[employee_id]:
+                        rows += [row, row]
+                        positions += [segment_start, segment_end]
+                        weights += [weight, -weight]
+        diff = np.zeros((len(segments), WEEK_MINUTES + 1), dtype=np.int32)
+        if rows:
+            np.add.at(diff, (np.array(rows), np.array(positions)), np.array(weights))
+        occupancy = np.cumsum(diff[:, :WEEK_MINUTES], axis=1).astype(np.int16)
+        return cls(segments, occupancy, employee_rows, included)
+
+    def _add(self, values, sign):
+        employee_id, *schedule = values
+        rows = self.employees[employee_id]
+        for start, end, weight in schedule_intervals(*schedule):
+            for segment_start, segment_end in _week_segments(start, end):
+                self.occupancy[rows, segment_start:segment_end] += sign * weight
+
+    def update(self, schedule_id, values):
+        """
+        Reemplaza el aporte de un horario por values (empleado, día,
+        inicio, fin, inicio y fin de descanso), o lo quita si values es None
+
+        El índice recuerda qué horarios incluye, así que aplicar dos veces el
+        mismo cambio no lo altera. Retorna False si el empleado no está en
+        el índice, en cuyo caso se debe reconstruir.
+        """
+        if values is not None and values[0] not in self.employees:
+            return False
+        previous = self.schedules.pop(schedule_id, None)
+        if previous is not None:
+            self._add(previous, -1)
+        if values is not None:
+            self._add(values, 1)
+            self.schedules[schedule_id] = tuple(values)
+        return True
+
+    def series(self, segment, start, end):
+        """
+        Ocupación por minuto de un segmento entre dos minutos de la semana;
+        si end <= start la ventana continúa en la semana siguiente
+        """
+        row = self.segments.get(segment)
+        if row is None:
+            return np.zeros((end - start) % WEEK_MINUTES or WEEK_MINUTES, dtype=np.int16)
+        values = self.occupancy[row]
+        if start < end:
+            return values[start:end]
+        return np.concatenate([values[start:], values[:end]])
+
+    def headcount(self, segment, minute):
+        """Empleados en turno de un segmento en un minuto de la semana"""
+        row = self.segments.get(segment)
+        return 0 if row is None else int(self.occupancy[row, minute % WEEK_MINUTES])
+
+    def summary(self, segment, start, end):
+        """Mínimo, máximo y promedio de empleados en turno en la ventana"""
+        values = self.series(segment, start, end)
+        return {
+            'min': int(values.min()),
+            'max': int(values.max()),
+            'avg': round(float(values.mean()), 2),
+        }
+
+    def gaps(self, segment, start, end, minimum=1):
+        """Intervalos de la ventana con menos de minimum empleados en turno"""
+        return _runs(self.series(segment, start, end) < minimum, start)
+
+    def overlaps(self, segment, start, end, maximum):
+        """Intervalos de la ventana con más de maximum empleados en turno"""
+        return _runs(self.series(segment, start, end) > maximum, start)
+
+    def departments(self):
+        """Ids de departamento presentes en el índice"""
+        return [segment[1] for segment in self.segments if segment[0] == 'department']
+
+    def state(self):
+        return {
+            'segments': self.segments,
+            'occupancy': self.occupancy,
+            'employees': self.employees,
+            'schedules': self.schedules,
+        }
+
+
+def _runs(mask, offset):
+    """
+    Intervalos [inicio, fin) (en minutos de la semana) donde mask es
+    verdadero
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).astype(np.int8)))
+    return [
+        ((offset + int(start)) % WEEK_MINUTES, (offset + int(end)) % WEEK_MINUTES or WEEK_MINUTES)
+        for start, end in zip(edges[::2], edges[1::2])
+    ]
+
+
+def build_coverage_index():
+    """
+    Construye el índice con los horarios vigentes de los empleados activos
+    """
+    employees = Employee.objects.active().values_list('pk', 'position__department_id', 'position_id', 'skills')
+    schedules = WorkSchedule.objects.active().filter(employee__is_active=True).values_list(
+        'pk', 'employee_id', 'day_of_week', 'start_time', 'end_time', 'break_start', 'break_end'
+    )
+    return CoverageIndex.build(employees, schedules)
+
+
+_local = threading.local()
+
+
+def coverage_index():
+    """
+    Retorna el índice de la versión vigente
+
+    Usa la copia del proceso si la versión no cambió; si no, la copia de la
+    caché compartida y, si no existe, lo reconstruye desde la base de datos.
+    """
+    version = reference_version(WorkSchedule)
+    if getattr(_local, 'version', None) == version:
+        return _local.index
+    state = cache.get(reference_key(WorkSchedule, CACHE_NAME, version))
+    if state is not None:
+        index = CoverageIndex(**state)
+    else:
+        index = build_coverage_index()
+        cache.set(reference_key(WorkSchedule, CACHE_NAME, version), index.state(), settings.REFERENCE_CACHE_TTL)
+    _local.version, _local.index = version, index
+    return index
+
+
+def apply_schedule_change(schedule_id, values):
+    """
+    Aplica al índice el cambio de un horario y publica la nueva versión
+
+    values es la tupla de SCHEDULE_FIELDS del horario, o None si fue
+    eliminado o desactivado. Si el índice no puede actualizarse (empleado
+    que no está en el índice o cambios concurrentes) solo se invalida y se
+    reconstruye en la próxima lectura.
+    """
+    index = coverage_index()
+    version = _local.version
+    applied = index.update(schedule_id, values)
+    new_version = invalidate_reference(WorkSchedule)
+    _local.version = None
+    if applied and new_version == version + 1:
+        # Ningún otro proceso cambió la versión entre la lectura y el
+        # incremento: el índice con el cambio es el de la nueva versión
+        cache.set(reference_key(WorkSchedule, CACHE_NAME, new_version), index.state(), settings.REFERENCE_CACHE_TTL)
+        _local.version = new_version
+
+
+def _format_minute(minute):
+    day, minute = divmod(minute % WEEK_MINUTES, DAY_MINUTES)
+    return {'day': day, 'time': f'{minute // 60:02d}:{minute % 60:02d}'}
+
+
+def _format_runs(runs):
+    return [{'start': _format_minute(start), 'end': _format_minute(end)} for start, end in runs]
+
+
+def coverage_segment(department_id=None, position_id=None, skill=None):
+    """
+    Clave del segmento para un filtro; la posición no se combina con otros
+    filtros porque ya determina el departamento
+    """
+    if position_id is not None:
+        if skill or department_id is not None:
+            raise ValueError('position no se combina con department ni skill')
+        return ('position', position_id)
+    if skill:
+        return ('skill', department_id, normalize_qualification(skill))
+    if department_id is not None:
+        return ('department', department_id)
+    return ('all',)
+
+
+def schedule_coverage(day, start, end, department_id=None, position_id=None, skill=None,
+                      minimum=1, maximum=None, group_by=None):
+    """
+    Cobertura de un segmento en una ventana del día day (0 = lunes) entre
+    los minutos start y end del día; si end <= start la ventana termina al
+    día siguiente
+
+    Retorna el mínimo, máximo y promedio de empleados en turno, los
+    intervalos con menos de minimum empleados (gaps) y, si se indica
+    maximum, los intervalos con más de maximum (overlaps). Con
+    group_by='department' agrega el resumen de cada departamento.
+    """
+    segment = coverage_segment(department_id, position_id, skill)
+    index = coverage_index()
+    window_start = day * DAY_MINUTES + start
+    window_end = (window_start + ((end - start) % DAY_MINUTES or DAY_MINUTES)) % WEEK_MINUTES
+    result = {
+        'window': {'start': _format_minute(window_start), 'end': _format_minute(window_end)},
+        'coverage': index.summary(segment, window_start, window_end),
+        'gaps': _format_runs(index.gaps(segment, window_start, window_end, minimum)),
+    }
+    if maximum is not None:
+        result['overlaps'] = _format_runs(index.overlaps(segment, window_start, window_end, maximum))
+    if group_by == 'department':
+        result['departments'] = [
+            {
+                'department': department,
+                **index.summary(
+                    ('skill', department, segment[2]) if skill else ('department', department),
+                    window_start, window_end
+                ),
+            }
+            for department in sorted(index.departments(), key=lambda value: (value is None, value))
+        ]
+    return result
+
+
+def invalidate_coverage():
+    """Invalida el índice; se reconstruye en la próxima lectura"""
+    invalidate_reference(WorkSchedule)
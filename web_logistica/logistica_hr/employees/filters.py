@@ -0,0 +1,31 @@
+"""
+Filtros para la aplicación employees
+"""
+
+import django_filters
+
+from .hierarchy import subtree_q
+from .models import Employee
+
+
+class EmployeeFilter(django_filters.FilterSet):
+    """
+    Filtros del listado de empleados
+
+    manager (usuario) filtra los subordinados directos e indirectos desde
+    la clausura ReportingLine; max_depth limita los niveles.
+    """
+    manager = django_filters.NumberFilter(method='filter_manager')
+    max_depth = django_filters.NumberFilter(method='filter_noop')
+
+    class Meta:
+        model = Employee
+        fields = ['is_active', 'position', 'position__department', 'supervisor', 'qualifications']
+
+    def filter_manager(self, queryset, name, value):
+        max_depth = self.form.cleaned_data.get('max_depth')
+        return queryset.filter(subtree_q(int(value), max_depth=int(max_depth) if max_depth else None))
+
+    def filter_noop(self, queryset, name, value):
+        # Se aplica junto a manager
+        return queryset
@@ -0,0 +1,198 @@
+"""
+Jerarquía de supervisión de los empleados
+
+El jefe directo de un empleado es Employee.supervisor o, si no tiene, el
+gerente del departamento de su posición (salvo que sea el mismo empleado).
+Los jefes son usuarios, así que la cadena continúa por el empleado de ese
+usuario, si existe.
+
+ReportingLine guarda la clausura de esa relación: una fila por cada par
+(jefe, empleado) con su distancia. Los tableros, permisos y reportes
+filtran el subárbol de un jefe con una sola consulta sobre la clausura
+(uniq_reporting_line comienza por el jefe). La clausura se calcula con una
+consulta recursiva (WITH RECURSIVE) sobre las tablas de empleados,
+posiciones y departamentos; las señales de employees recalculan solo los
+empleados afectados por un cambio y sus subordinados.
+
+Las escrituras masivas (bulk_create, QuerySet.update) y la eliminación de
+usuarios supervisores (SET_NULL sin señales) no la actualizan: después de
+ellas se debe llamar a rebuild_reporting_lines o al comando
+rebuild_reporting_lines.
+"""
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Department, Employee, Position, ReportingLine
+
+# Niveles máximos recorridos; también corta los ciclos de supervisión
+MAX_DEPTH = 32
+
+# Empleados recalculados por sentencia
+REFRESH_CHUNK_SIZE = 500
+
+
+def _lines_cte(employee_ids=None):
+    """
+    Consulta recursiva con las líneas de supervisión calculadas desde las
+    tablas de empleados, opcionalmente solo para los empleados indicados
+
+    Retorna (sql, params) de la cláusula WITH, que define lines (manager_id,
+    employee_id, depth) con una fila por camino.
+    """
+    quote = connection.ops.quote_name
+    employee_table = quote(Employee._meta.db_table)
+    position_table = quote(Position._meta.db_table)
+    department_table = quote(Department._meta.db_table)
+    anchor, params = '', []
+    if employee_ids is not None:
+        anchor = f"AND employee_id IN ({', '.join(['%s'] * len(employee_ids))})"
+        params = list(employee_ids)
+    sql = (
+        f'WITH RECURSIVE edges (employee_id, user_id, manager_id) AS ('
+        f'SELECT e.id, e.user_id, CASE '
+        f'WHEN e.supervisor_id IS NOT NULL AND e.supervisor_id <> e.user_id THEN e.supervisor_id '
+        f'WHEN d.manager_id <> e.user_id THEN d.manager_id END '
+        f'FROM {employee_table} e '
+        f'LEFT JOIN {position_table} p ON p.id = e.position_id '
+        f'LEFT JOIN {department_table} d ON d.id = p.department_id'
+        f'), lines (manager_id, employee_id, user_id, depth) AS ('
+        f'SELECT manager_id, employee_id, user_id, 1 FROM edges '
+        f'WHERE manager_id IS NOT NULL {anchor} '
+        f'UNION ALL '
+        f'SELECT m.manager_id, l.employee_id, l.user_id, l.depth + 1 '
+        f'FROM lines l JOIN edges m ON m.user_id = l.manager_id '
+        f'WHERE m.manager_id IS NOT NULL AND m.manager_id <> l.user_id AND l.depth < %s'
+        f') '
+    )
+    return sql, params + [MAX_DEPTH]
+
+
+def computed_reporting_lines(employee_ids=None):
+    """
+    Líneas de supervisión calculadas desde las tablas de empleados, sin
+    usar la clausura
+
+    Retorna un conjunto de tuplas (jefe, empleado, niveles).
+    """
+    sql, params = _lines_cte(employee_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'{sql}SELECT manager_id, employee_id, MIN(depth) FROM lines GROUP BY manager_id, employee_id',
+            params
+        )
+        return set(cursor.fetchall())
+
+
+def _delete_reporting_lines(employee_ids=None):
+    """
+    Elimina las líneas de los empleados indicados (o todas) con una sola
+    sentencia: QuerySet.delete recorre las filas una a una porque hay
+    receptores de post_delete para todos los modelos
+    """
+    table = connection.ops.quote_name(ReportingLine._meta.db_table)
+    sql, params = f'DELETE FROM {table}', []
+    if employee_ids is not None:
+        sql += f" WHERE employee_id IN ({', '.join(['%s'] * len(employee_ids))})"
+        params = list(employee_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def _insert_reporting_lines(employee_ids=None):
+    sql, params = _lines_cte(employee_ids)
+    table = connection.ops.quote_name(ReportingLine._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'{sql}INSERT INTO {table} (manager_id, employee_id, depth) '
+            f'SELECT manager_id, employee_id, MIN(depth) FROM lines GROUP BY manager_id, employee_id',
+            params
+        )
+        return cursor.rowcount
+
+
+def refresh_reporting_lines(employee_ids=(), user_ids=()):
+    """
+    Recalcula las líneas de supervisión de los empleados indicados y de los
+    subordinados de los usuarios indicados
+
+    user_ids son los usuarios cuya posición en la jerarquía cambió (por
+    ejemplo, el usuario de un empleado que cambió de supervisor): sus
+    subordinados heredan la nueva cadena de jefes.
+    """
+    affected = set(employee_ids)
+    if user_ids:
+        affected.update(
+            ReportingLine.objects.filter(manager_id__in=set(user_ids)).values_list('employee_id', flat=True)
+        )
+    affected = sorted(affected)
+    created = 0
+    with transaction.atomic():
+        for index in range(0, len(affected), REFRESH_CHUNK_SIZE):
+            chunk = affected[index:index + REFRESH_CHUNK_SIZE]
+            _delete_reporting_lines(chunk)
+            created += _insert_reporting_lines(chunk)
+    return created
+
+
+def rebuild_reporting_lines():
+    """
+    Reconstruye la clausura completa; retorna la cantidad de líneas
+    """
+    with transaction.atomic():
+        _delete_reporting_lines()
+        _insert_reporting_lines()
+    return ReportingLine.objects.count()
+
+
+def reporting_line_differences():
+    """
+    Compara la clausura con las líneas calculadas desde las tablas de
+    empleados
+
+    Retorna (faltantes, sobrantes) como conjuntos de tuplas (jefe,
+    empleado, niveles).
+    """
+    stored = set(ReportingLine.objects.values_list('manager_id', 'employee_id', 'depth'))
+    computed = computed_reporting_lines()
+    return computed - stored, stored - computed
+
+
+def subtree_q(manager_id, lookup='pk', max_depth=None):
+    """
+    Condición para filtrar un queryset por los subordinados directos e
+    indirectos de un jefe
+
+    lookup es el camino hasta el empleado desde el modelo filtrado (por
+    ejemplo 'employee' en DailyWorkLog o 'assigned_to' en Task). La
+    condición es una subconsulta sobre la clausura, por lo que el queryset
+    sigue siendo una sola consulta.
+    """
+    lines = ReportingLine.objects.filter(manager_id=manager_id)
+    if max_depth is not None:
+        lines = lines.filter(depth__lte=max_depth)
+    return Q(**{f'{lookup}__in': lines.values('employee_id')})
+
+
+def subordinates(manager_id, max_depth=None):
+    """
+    Empleados activos bajo un jefe, directa o indirectamente
+    """
+    return Employee.objects.active().filter(subtree_q(manager_id, max_depth=max_depth))
+
+
+def manages(manager_id, employee_id):
+    """
+    Indica si el usuario es jefe directo o indirecto del empleado
+    """
+    return ReportingLine.objects.filter(manager_id=manager_id, employee_id=employee_id).exists()
+
+
+def management_chain(employee_id):
+    """
+    Ids de los usuarios jefes del empleado, del directo al más alto
+    """
+    return list(
+        ReportingLine.objects.filter(employee_id=employee_id)
+        .order_by('depth').values_list('manager_id', flat=True)
+    )
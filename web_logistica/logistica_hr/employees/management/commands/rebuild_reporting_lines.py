@@ -0,0 +1,30 @@
+"""
+Comando para reconstruir la clausura de la jerarquía de supervisión
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from logistica_hr.employees.hierarchy import rebuild_reporting_lines, reporting_line_differences
+
+
+class Command(BaseCommand):
+    help = ('Reconstruye las líneas de supervisión (ReportingLine) desde los empleados '
+            '(necesario tras cargas masivas)')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Solo compara la clausura con la jerarquía actual, sin modificarla'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            missing, stale = reporting_line_differences()
+            self.stdout.write(f'Líneas faltantes: {len(missing)}, sobrantes: {len(stale)}')
+            if missing or stale:
+                raise CommandError('La clausura de la jerarquía está desactualizada')
+            self.stdout.write(self.style.SUCCESS('Clausura de la jerarquía al día'))
+            return
+        count = rebuild_reporting_lines()
+        self.stdout.write(self.style.SUCCESS(f'Clausura de la jerarquía reconstruida: {count} líneas'))
@@ -0,0 +1,25 @@
+"""
+Comando para reconstruir el índice de habilidades y certificaciones
+"""
+
+from django.core.management.base import BaseCommand
+
+from logistica_hr.employees.qualifications import SYNC_CHUNK_SIZE, rebuild_qualification_index
+
+
+class Command(BaseCommand):
+    help = ('Sincroniza el índice de habilidades y certificaciones con los empleados '
+            '(necesario tras cargas masivas)')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=SYNC_CHUNK_SIZE,
+            help='Cantidad de empleados sincronizados por transacción'
+        )
+
+    def handle(self, *args, **options):
+        created, deleted = rebuild_qualification_index(chunk_size=options['chunk_size'])
+        self.stdout.write(f'Vínculos creados: {created}, eliminados: {deleted}')
+        self.stdout.write(self.style.SUCCESS('Índice de habilidades sincronizado'))
@@ -3,10 +3,13 @@ Modelos para la aplicación employees
 """
 
 from django.db import models
+from django.db.models import Case, ExpressionWrapper, F, Q, When
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator
 
-from logistica_hr.core.models import BaseModel
+from logistica_hr.core.expressions import DurationSeconds
+from logistica_hr.core.indexes import TrigramIndex
+from logistica_hr.core.models import ActiveQuerySet, BaseModel
 from logistica_hr.users.models import User
 
 
@@ -77,6 +80,45 @@ class Position(BaseModel):
         return f"{self.name} - {self.department.name}"
 
 
+class Qualification(BaseModel):
+    """
+    Modelo para el catálogo de habilidades y certificaciones
+
+    Se completa automáticamente con los valores de Employee.skills y
+    Employee.certifications (qualifications.py); code es el nombre
+    normalizado que se usa para buscar.
+    """
+    KIND_CHOICES = [
+        ('skill', _('Habilidad')),
+        ('certification', _('Certificación')),
+    ]
+
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        verbose_name=_('Tipo')
+    )
+    code = models.CharField(
+        max_length=100,
+        verbose_name=_('Código')
+    )
+    name = models.CharField(
+        max_length=100,
+        verbose_name=_('Nombre')
+    )
+
+    class Meta:
+        verbose_name = _('Habilidad o Certificación')
+        verbose_name_plural = _('Habilidades y Certificaciones')
+        ordering = ['kind', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'code'], name='uniq_qualification_kind_code'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_kind_display()})"
+
+
 class Employee(BaseModel):
     """
     Modelo principal para empleados
@@ -131,11 +173,27 @@ class Employee(BaseModel):
         blank=True,
         verbose_name=_('Certificaciones')
     )
+    # Índice de skills y certifications, sincronizado al guardar
+    qualifications = models.ManyToManyField(
+        Qualification,
+        through='EmployeeQualification',
+        related_name='employees',
+        blank=True,
+        verbose_name=_('Habilidades y Certificaciones')
+    )
 
     class Meta:
         verbose_name = _('Empleado')
         verbose_name_plural = _('Empleados')
         ordering = ['employee_id']
+        indexes = [
+            TrigramIndex('employee_id', name='employee_code_trgm'),
+            models.Index(
+                fields=['position'],
+                condition=Q(is_active=True),
+                name='employee_active_position_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.get_full_name()} ({self.employee_id})"
@@ -153,6 +211,96 @@ class Employee(BaseModel):
         )
 
 
+class EmployeeQualification(models.Model):
+    """
+    Modelo para la relación entre empleados y el catálogo de habilidades y
+    certificaciones
+
+    La restricción única comienza por la calificación para resolver la
+    búsqueda de empleados por habilidad con el índice.
+    """
+    qualification = models.ForeignKey(
+        Qualification,
+        on_delete=models.CASCADE,
+        related_name='employee_links',
+        verbose_name=_('Habilidad o Certificación')
+    )
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='qualification_links',
+        verbose_name=_('Empleado')
+    )
+
+    class Meta:
+        verbose_name = _('Habilidad de Empleado')
+        verbose_name_plural = _('Habilidades de Empleados')
+        constraints = [
+            models.UniqueConstraint(fields=['qualification', 'employee'], name='uniq_employee_qualification'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.qualification_id}"
+
+
+class ReportingLine(models.Model):
+    """
+    Modelo para la tabla de clausura de la jerarquía de supervisión
+
+    Una fila por cada par (jefe, empleado) con jefe directo o indirecto,
+    donde depth es la cantidad de niveles entre ambos. El jefe directo es
+    Employee.supervisor o, si no tiene, el gerente del departamento de su
+    posición. Se mantiene desde las señales de employees (hierarchy.py).
+    """
+    manager = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='reporting_lines',
+        verbose_name=_('Jefe')
+    )
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='reporting_lines',
+        verbose_name=_('Empleado')
+    )
+    depth = models.PositiveSmallIntegerField(
+        verbose_name=_('Niveles')
+    )
+
+    class Meta:
+        verbose_name = _('Línea de Supervisión')
+        verbose_name_plural = _('Líneas de Supervisión')
+        constraints = [
+            models.UniqueConstraint(fields=['manager', 'employee'], name='uniq_reporting_line'),
+        ]
+        indexes = [
+            models.Index(fields=['employee', 'depth'], name='reporting_line_employee_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.manager_id} -> {self.employee_id} ({self.depth})"
+
+
+class WorkScheduleQuerySet(ActiveQuerySet):
+    """
+    QuerySet para horarios de trabajo con cálculos en base de datos
+    """
+
+    def with_total_hours(self):
+        """Anota total_hours_db, equivalente a WorkSchedule.total_hours"""
+        seconds = DurationSeconds(
+            ExpressionWrapper(F('end_time') - F('start_time'), output_field=models.DurationField())
+        )
+        return self.annotate(
+            total_hours_db=Case(
+                When(end_time__lt=F('start_time'), then=(seconds + 86400) / 3600),
+                default=seconds / 3600,
+                output_field=models.FloatField(),
+            )
+        )
+
+
 class WorkSchedule(BaseModel):
     """
     Modelo para horarios de trabajo
@@ -192,6 +340,8 @@ class WorkSchedule(BaseModel):
         verbose_name=_('Fin de Descanso')
     )
 
+    objects = WorkScheduleQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Horario de Trabajo')
         verbose_name_plural = _('Horarios de Trabajo')
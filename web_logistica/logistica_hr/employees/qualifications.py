@@ -0,0 +1,217 @@
+"""
+Catálogo de habilidades y certificaciones de los empleados
+
+Employee.skills y Employee.certifications siguen siendo listas libres en
+JSON; al guardar un empleado (señales de employees) sus valores se
+normalizan y se reflejan en Qualification y EmployeeQualification. La
+búsqueda de empleados por habilidad lee esa tabla por su índice
+(calificación, empleado) en lugar de recorrer el JSON de todos los
+empleados, y funciona igual en PostgreSQL y SQLite.
+
+Las escrituras masivas de empleados (bulk_create, QuerySet.update) no
+emiten señales: después de usarlas se debe llamar a
+sync_employee_qualifications o al comando sync_qualifications.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from logistica_hr.core.cache import active_reference_objects, invalidate_reference
+from .models import Employee, EmployeeQualification, Qualification
+
+DEFAULT_MATCH_LIMIT = 20
+MAX_MATCH_LIMIT = 200
+
+SYNC_CHUNK_SIZE = 1000
+
+
+def normalize_qualification(value):
+    """
+    Código de una habilidad o certificación: sin espacios sobrantes y sin
+    distinguir mayúsculas
+    """
+    return ' '.join(str(value).split()).casefold()[:100]
+
+
+def employee_qualification_keys(skills, certifications):
+    """
+    Retorna un diccionario (tipo, código) -> nombre con los valores de un
+    empleado
+    """
+    keys = {}
+    for kind, values in [('skill', skills), ('certification', certifications)]:
+        for value in values or []:
+            code = normalize_qualification(value)
+            if code:
+                keys.setdefault((kind, code), ' '.join(str(value).split())[:100])
+    return keys
+
+
+def qualification_ids(keys):
+    """
+    Retorna (tipo, código) -> id, creando las entradas que faltan en el
+    catálogo
+    """
+    if not keys:
+        return {}
+
+    def existing():
+        return {
+            (kind, code): pk
+            for pk, kind, code in Qualification.objects.filter(
+                code__in={code for _, code in keys}
+            ).values_list('pk', 'kind', 'code')
+        }
+
+    ids = existing()
+    missing = [key for key in keys if key not in ids]
+    if missing:
+        Qualification.objects.bulk_create(
+            [Qualification(kind=kind, code=code, name=keys[kind, code]) for kind, code in missing],
+            ignore_conflicts=True,
+        )
+        # bulk_create no emite las señales que invalidan la caché de
+        # referencia; como en core.signals, se invalida también al confirmar
+        # la transacción para descartar lo que otra petición haya guardado
+        # con el catálogo anterior mientras seguía abierta
+        invalidate_reference(Qualification)
+        transaction.on_commit(lambda: invalidate_reference(Qualification))
+        ids = existing()
+    return ids
+
+
+def sync_employee_qualifications(rows, chunk_size=SYNC_CHUNK_SIZE):
+    """
+    Sincroniza el índice con las habilidades y certificaciones de varios
+    empleados
+
+    rows son tuplas (id de empleado, skills, certifications). Cada bloque
+    usa un número fijo de consultas independientemente de la cantidad de
+    empleados. Retorna la cantidad de vínculos creados y eliminados.
+    """
+    rows = list(rows)
+    created = deleted = 0
+    for index in range(0, len(rows), chunk_size):
+        chunk = rows[index:index + chunk_size]
+        wanted = {
+            employee_id: employee_qualification_keys(skills, certifications)
+            for employee_id, skills, certifications in chunk
+        }
+        names = {}
+        for keys in wanted.values():
+            for key, name in keys.items():
+                names.setdefault(key, name)
+        with transaction.atomic():
+            ids = qualification_ids(names)
+            target = {
+                (employee_id, ids[key]) for employee_id, keys in wanted.items() for key in keys
+            }
+            current = set(
+                EmployeeQualification.objects.filter(employee_id__in=wanted)
+                .values_list('employee_id', 'qualification_id')
+            )
+            stale = current - target
+            if stale:
+                condition = Q()
+                for employee_id, qualification_id in stale:
+                    condition |= Q(employee_id=employee_id, qualification_id=qualification_id)
+                deleted += EmployeeQualification.objects.filter(condition).delete()[0]
+            new = target - current
+            EmployeeQualification.objects.bulk_create(
+                [
+                    EmployeeQualification(employee_id=employee_id, qualification_id=qualification_id)
+                    for employee_id, qualification_id in new
+                ],
+                ignore_conflicts=True,
+            )
+            created += len(new)
+    return created, deleted
+
+
+def rebuild_qualification_index(chunk_size=SYNC_CHUNK_SIZE):
+    """
+    Sincroniza el índice de todos los empleados
+    """
+    rows = Employee.objects.order_by('pk').values_list('pk', 'skills', 'certifications')
+    return sync_employee_qualifications(rows.iterator(chunk_size=chunk_size), chunk_size=chunk_size)
+
+
+def _catalog_ids(kind, values):
+    """
+    Ids del catálogo para los valores indicados; los valores desconocidos
+    se omiten
+    """
+    by_code = {
+        (qualification.kind, qualification.code): pk
+        for pk, qualification in active_reference_objects(Qualification).items()
+    }
+    codes = {normalize_qualification(value) for value in values or []} - {''}
+    return codes, [by_code[kind, code] for code in codes if (kind, code) in by_code]
+
+
+def match_employees(skills=None, certifications=None, require_all_skills=False,
+                    department_id=None, limit=DEFAULT_MATCH_LIMIT):
+    """
+    Empleados activos ordenados por la cantidad de habilidades indicadas
+    que tienen
+
+    Las certificaciones indicadas son obligatorias; las habilidades
+    ordenan el resultado (o también son obligatorias con
+    require_all_skills). Usa tres consultas: el ranking agrupado sobre
+    EmployeeQualification, las calificaciones coincidentes y los datos de
+    los empleados de la página.
+    """
+    skill_codes, skill_ids = _catalog_ids('skill', skills)
+    certification_codes, certification_ids = _catalog_ids('certification', certifications)
+    if not skill_codes and not certification_codes:
+        return []
+    if len(certification_ids) < len(certification_codes):
+        return []
+    if require_all_skills and len(skill_ids) < len(skill_codes):
+        return []
+
+    links = EmployeeQualification.objects.filter(
+        qualification_id__in=skill_ids + certification_ids, employee__is_active=True
+    )
+    if department_id is not None:
+        links = links.filter(employee__position__department_id=department_id)
+    ranking = links.values('employee_id').annotate(
+        matched_skills=Count('qualification_id', filter=Q(qualification_id__in=skill_ids)),
+        matched_certifications=Count('qualification_id', filter=Q(qualification_id__in=certification_ids)),
+    )
+    if certification_ids:
+        ranking = ranking.filter(matched_certifications=len(certification_ids))
+    if require_all_skills and skill_ids:
+        ranking = ranking.filter(matched_skills=len(skill_ids))
+    elif skill_ids and not certification_ids:
+        ranking = ranking.filter(matched_skills__gt=0)
+    ranking = list(ranking.order_by('-matched_skills', 'employee_id')[:limit])
+    if not ranking:
+        return []
+
+    employee_ids = [row['employee_id'] for row in ranking]
+    catalog = active_reference_objects(Qualification)
+    matched = {}
+    for employee_id, qualification_id in EmployeeQualification.objects.filter(
+        employee_id__in=employee_ids, qualification_id__in=skill_ids + certification_ids
+    ).values_list('employee_id', 'qualification_id'):
+        qualification = catalog[qualification_id]
+        matched.setdefault(employee_id, {'skill': [], 'certification': []})[qualification.kind].append(
+            qualification.name
+        )
+    employees = Employee.objects.select_related('user', 'position').in_bulk(employee_ids)
+
+    results = []
+    for row in ranking:
+        employee = employees[row['employee_id']]
+        names = matched.get(employee.pk, {'skill': [], 'certification': []})
+        results.append({
+            'employee': employee.pk,
+            'employee_id': employee.employee_id,
+            'full_name': employee.user.get_full_name(),
+            'department': employee.position.department_id if employee.position else None,
+            'matched_skills': sorted(names['skill']),
+            'matched_certifications': sorted(names['certification']),
+            'skill_score': round(row['matched_skills'] / len(skill_codes), 4) if skill_codes else None,
+        })
+    return results
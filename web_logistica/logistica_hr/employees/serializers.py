@@ -0,0 +1,87 @@
+"""
+Serializadores para la aplicación employees
+"""
+
+from rest_framework import serializers
+
+from .models import Department, Position, Employee, Qualification, WorkSchedule
+
+
+class DepartmentSerializer(serializers.ModelSerializer):
+    """
+    Serializador para departamentos
+    """
+    manager_name = serializers.CharField(source='manager.get_full_name', read_only=True, default=None)
+
+    class Meta:
+        model = Department
+        fields = [
+            'id', 'name', 'description', 'manager', 'manager_name',
+            'is_active', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['created_at', 'updated_at']
+
+
+class PositionSerializer(serializers.ModelSerializer):
+    """
+    Serializador para posiciones
+    """
+    department_name = serializers.CharField(source='department.name', read_only=True)
+
+    class Meta:
+        model = Position
+        fields = [
+            'id', 'name', 'department', 'department_name', 'description',
+            'base_salary', 'is_active', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['created_at', 'updated_at']
+
+
+class EmployeeSerializer(serializers.ModelSerializer):
+    """
+    Serializador para empleados
+    """
+    full_name = serializers.CharField(source='user.get_full_name', read_only=True)
+    position_name = serializers.CharField(source='position.name', read_only=True, default=None)
+    department = serializers.IntegerField(source='position.department_id', read_only=True, default=None)
+    department_name = serializers.CharField(source='position.department.name', read_only=True, default=None)
+    supervisor_name = serializers.CharField(source='supervisor.get_full_name', read_only=True, default=None)
+    years_of_service = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Employee
+        fields = [
+            'id', 'user', 'full_name', 'employee_id', 'position', 'position_name',
+            'department', 'department_name', 'hire_date', 'years_of_service',
+            'supervisor', 'supervisor_name', 'emergency_contact', 'emergency_phone',
+            'skills', 'certifications', 'is_active', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['created_at', 'updated_at']
+
+
+class QualificationSerializer(serializers.ModelSerializer):
+    """
+    Serializador para el catálogo de habilidades y certificaciones
+    """
+
+    class Meta:
+        model = Qualification
+        fields = ['id', 'kind', 'code', 'name', 'is_active']
+
+
+class WorkScheduleSerializer(serializers.ModelSerializer):
+    """
+    Serializador para horarios de trabajo
+    """
+    employee_code = serializers.CharField(source='employee.employee_id', read_only=True)
+    day_of_week_display = serializers.CharField(source='get_day_of_week_display', read_only=True)
+    total_hours = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = WorkSchedule
+        fields = [
+            'id', 'employee', 'employee_code', 'day_of_week', 'day_of_week_display',
+            'start_time', 'end_time', 'break_start', 'break_end', 'total_hours',
+            'is_active', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['created_at', 'updated_at']
@@ -0,0 +1,167 @@
+"""
+Señales para la aplicación employees
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .coverage import SCHEDULE_FIELDS, apply_schedule_change, invalidate_coverage
+from .hierarchy import refresh_reporting_lines
+from .models import Department, Employee, Position, WorkSchedule
+from .qualifications import sync_employee_qualifications
+
+# Campos del empleado que definen los segmentos del índice de cobertura
+EMPLOYEE_COVERAGE_FIELDS = ['position_id', 'skills', 'is_active']
+
+# Campos del empleado reflejados en el índice de habilidades y certificaciones
+EMPLOYEE_QUALIFICATION_FIELDS = ['skills', 'certifications']
+
+# Campos que definen el jefe directo de los empleados (jerarquía de supervisión)
+EMPLOYEE_HIERARCHY_FIELDS = ['user_id', 'supervisor_id', 'position_id']
+
+# Valores anteriores que se guardan antes de modificar cada modelo
+PREVIOUS_FIELDS = {
+    Employee: list(dict.fromkeys(
+        EMPLOYEE_COVERAGE_FIELDS + EMPLOYEE_QUALIFICATION_FIELDS + EMPLOYEE_HIERARCHY_FIELDS
+    )),
+    Position: ['department_id'],
+    Department: ['manager_id'],
+}
+
+
+@receiver(post_save, sender=WorkSchedule)
+def update_coverage_on_schedule_save(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Aplica el horario al índice de cobertura al confirmar la transacción
+    """
+    if raw:
+        return
+    values = tuple(getattr(instance, field) for field in SCHEDULE_FIELDS) if instance.is_active else None
+    transaction.on_commit(lambda: apply_schedule_change(instance.pk, values), using=using)
+
+
+@receiver(post_delete, sender=WorkSchedule)
+def update_coverage_on_schedule_delete(sender, instance, using=None, **kwargs):
+    """
+    Quita el horario eliminado del índice de cobertura
+    """
+    schedule_id = instance.pk
+    transaction.on_commit(lambda: apply_schedule_change(schedule_id, None), using=using)
+
+
+@receiver(pre_save, sender=Employee)
+@receiver(pre_save, sender=Position)
+@receiver(pre_save, sender=Department)
+def remember_previous_values(sender, instance, **kwargs):
+    """
+    Guarda los valores anteriores de los campos de PREVIOUS_FIELDS
+    """
+    instance._previous_values = None
+    if instance.pk:
+        instance._previous_values = sender.objects.filter(pk=instance.pk).values(
+            *PREVIOUS_FIELDS[sender]
+        ).first()
+
+
+def _changed(instance, fields):
+    previous = getattr(instance, '_previous_values', None)
+    return previous is None or any(previous[field] != getattr(instance, field) for field in fields)
+
+
+@receiver(post_save, sender=Employee)
+def invalidate_coverage_on_employee_save(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Invalida el índice de cobertura si cambian los segmentos del empleado
+    """
+    if raw or not _changed(instance, EMPLOYEE_COVERAGE_FIELDS):
+        return
+    transaction.on_commit(invalidate_coverage, using=using)
+
+
+@receiver(post_save, sender=Employee)
+def sync_qualifications_on_employee_save(sender, instance, raw=False, **kwargs):
+    """
+    Refleja las habilidades y certificaciones del empleado en el índice
+    """
+    if raw or not _changed(instance, EMPLOYEE_QUALIFICATION_FIELDS):
+        return
+    sync_employee_qualifications([(instance.pk, instance.skills, instance.certifications)])
+
+
+@receiver(post_save, sender=Employee)
+def refresh_hierarchy_on_employee_save(sender, instance, raw=False, **kwargs):
+    """
+    Recalcula las líneas de supervisión del empleado y sus subordinados si
+    cambia su jefe directo
+    """
+    if raw or not _changed(instance, EMPLOYEE_HIERARCHY_FIELDS):
+        return
+    previous = getattr(instance, '_previous_values', None) or {}
+    refresh_reporting_lines([instance.pk], {instance.user_id, previous.get('user_id')} - {None})
+
+
+@receiver(post_delete, sender=Employee)
+def refresh_hierarchy_on_employee_delete(sender, instance, **kwargs):
+    """
+    Recalcula las líneas de los subordinados del empleado eliminado
+    """
+    refresh_reporting_lines(user_ids=[instance.user_id])
+
+
+def _refresh_hierarchy_for(employees):
+    rows = list(employees.values_list('pk', 'user_id'))
+    refresh_reporting_lines([pk for pk, _ in rows], [user_id for _, user_id in rows])
+
+
+@receiver(post_save, sender=Department)
+def refresh_hierarchy_on_department_save(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Recalcula las líneas de los empleados del departamento si cambia su
+    gerente
+    """
+    if raw or created or not _changed(instance, ['manager_id']):
+        return
+    _refresh_hierarchy_for(Employee.objects.filter(position__department=instance))
+
+
+@receiver(post_save, sender=Position)
+def refresh_hierarchy_on_position_save(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Recalcula las líneas de los empleados de la posición si cambia de
+    departamento
+    """
+    if raw or created or not _changed(instance, ['department_id']):
+        return
+    _refresh_hierarchy_for(Employee.objects.filter(position=instance))
+
+
+@receiver(pre_delete, sender=Position)
+def remember_position_employees(sender, instance, **kwargs):
+    """
+    Guarda los empleados de la posición antes de que se les quite
+    """
+    instance._hierarchy_employees = list(instance.employees.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Position)
+def refresh_hierarchy_on_position_delete(sender, instance, **kwargs):
+    """
+    Recalcula las líneas de los empleados de la posición eliminada
+    """
+    employee_ids = getattr(instance, '_hierarchy_employees', [])
+    if employee_ids:
+        _refresh_hierarchy_for(Employee.objects.filter(pk__in=employee_ids))
+
+
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+@receiver(post_delete, sender=Employee)
+def invalidate_coverage_on_change(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Invalida el índice de cobertura al modificar posiciones o eliminar
+    empleados
+    """
+    if raw:
+        return
+    transaction.on_commit(invalidate_coverage, using=using)
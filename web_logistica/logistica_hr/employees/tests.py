@@ -0,0 +1,329 @@
+"""
+Pruebas para la aplicación employees
+"""
+
+from datetime import date, time
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .coverage import DAY_MINUTES, CoverageIndex, coverage_segment
+from .hierarchy import management_chain, reporting_line_differences
+from .models import Department, Employee, EmployeeQualification, Position, Qualification, WorkSchedule
+from .qualifications import match_employees, qualification_ids
+
+LIST_ENDPOINTS = [
+    'employees:department-list',
+    'employees:position-list',
+    'employees:employee-list',
+    'employees:workschedule-list',
+    'employees:qualification-list',
+]
+
+
+class WorkScheduleAnnotationParityTests(TestCase):
+    """
+    with_total_hours debe coincidir con WorkSchedule.total_hours, incluidos
+    los turnos nocturnos y de duración cero
+    """
+
+    def test_total_hours(self):
+        employee = Employee.objects.create(
+            user=get_user_model().objects.create(username='operario'),
+            employee_id='E1', hire_date=date(2020, 1, 1),
+        )
+        cases = [
+            (time(8), time(16, 30)),
+            (time(22), time(6)),
+            (time(9), time(9)),
+            (time(23, 45), time(0, 15)),
+            (time(0), time(23, 59)),
+        ]
+        for day_of_week, (start, end) in enumerate(cases):
+            WorkSchedule.objects.create(employee=employee, day_of_week=day_of_week, start_time=start, end_time=end)
+        for schedule in WorkSchedule.objects.with_total_hours():
+            with self.subTest(start=schedule.start_time, end=schedule.end_time):
+                self.assertAlmostEqual(schedule.total_hours_db, schedule.total_hours)
+
+
+class CoverageIndexTests(SimpleTestCase):
+    """
+    Ocupación por minuto con turnos nocturnos, descansos y empleados con
+    habilidades repetidas; el índice construido coincide con el actualizado
+    horario por horario
+    """
+
+    # (id, departamento, posición, habilidades)
+    EMPLOYEES = [
+        (1, 10, 100, ['Montacargas', ' montacargas ', 'MONTACARGAS']),
+        (2, 10, 101, ['Picking']),
+        (3, None, None, ['Montacargas', 'Picking']),
+    ]
+    # (id, empleado, día, inicio, fin, inicio y fin de descanso)
+    SCHEDULES = [
+        (1, 1, 0, time(8), time(16), time(12), time(12, 30)),
+        (2, 2, 0, time(8), time(16), None, None),
+        (3, 3, 6, time(22), time(6), None, None),
+        (4, 1, 2, time(20), time(4), time(23, 45), time(0, 15)),
+        (5, 3, 0, time(10), time(10), None, None),
+    ]
+
+    def minute(self, day, hour, minute=0):
+        return day * DAY_MINUTES + hour * 60 + minute
+
+    def test_breaks_and_overnight_shifts(self):
+        index = CoverageIndex.build(self.EMPLOYEES, self.SCHEDULES)
+        cases = [
+            ('all', 0, 11, 59, 2),
+            ('all', 0, 12, 15, 1),
+            ('all', 0, 12, 30, 2),
+            ('all', 0, 16, 0, 0),
+            # Domingo 22:00 a lunes 06:00
+            ('all', 6, 23, 0, 1),
+            ('all', 0, 5, 59, 1),
+            ('all', 0, 6, 0, 0),
+            # Descanso que cruza la medianoche del miércoles al jueves
+            ('all', 2, 23, 50, 0),
+            ('all', 3, 0, 10, 0),
+            ('all', 3, 0, 20, 1),
+            ('all', 3, 4, 0, 0),
+        ]
+        for segment, day, hour, minute, expected in cases:
+            with self.subTest(day=day, hour=hour, minute=minute):
+                self.assertEqual(index.headcount((segment,), self.minute(day, hour, minute)), expected)
+
+    def test_repeated_skills_count_once(self):
+        index = CoverageIndex.build(self.EMPLOYEES, self.SCHEDULES)
+        monday = self.minute(0, 9)
+        self.assertEqual(index.headcount(coverage_segment(skill='Montacargas'), monday), 1)
+        self.assertEqual(index.headcount(coverage_segment(department_id=10, skill='montacargas'), monday), 1)
+        # El empleado sin departamento aporta una sola vez a ('skill', None, ...)
+        self.assertEqual(index.headcount(coverage_segment(skill='picking'), self.minute(6, 23)), 1)
+        self.assertEqual(index.headcount(coverage_segment(skill='picking'), monday), 1)
+
+    def test_build_matches_incremental_updates(self):
+        expected = CoverageIndex.build(self.EMPLOYEES, self.SCHEDULES)
+        index = CoverageIndex.build(self.EMPLOYEES, [])
+        for schedule_id, *values in self.SCHEDULES:
+            self.assertTrue(index.update(schedule_id, values))
+        # Repetir un cambio o quitar y volver a agregar no altera el índice
+        index.update(1, self.SCHEDULES[0][1:])
+        index.update(4, None)
+        index.update(4, self.SCHEDULES[3][1:])
+        self.assertEqual(index.segments, expected.segments)
+        np.testing.assert_array_equal(index.occupancy, expected.occupancy)
+
+        for schedule_id, *_ in self.SCHEDULES:
+            index.update(schedule_id, None)
+        self.assertFalse(index.occupancy.any())
+        self.assertFalse(index.update(6, (99, 0, time(8), time(9), None, None)))
+
+
+class EmployeeListQueryCountTests(TestCase):
+    """
+    Los listados de employees ejecutan la misma cantidad de consultas sin
+    importar el tamaño de la página
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create(username='admin', is_staff=True)
+        for index in range(30):
+            manager = User.objects.create(username=f'manager_{index}', first_name='Jefe')
+            department = Department.objects.create(name=f'Departamento {index}', manager=manager)
+            position = Position.objects.create(name='Operario', department=department)
+            employee = Employee.objects.create(
+                user=User.objects.create(username=f'user_{index}', first_name='Operario'),
+                employee_id=f'E{index:03d}', position=position, supervisor=manager,
+                hire_date=date(2020, 1, 1), skills=[f'Habilidad {index}'], certifications=[f'Cert {index}'],
+            )
+            WorkSchedule.objects.create(employee=employee, day_of_week=0, start_time=time(8), end_time=time(16))
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def count_queries(self, url_name, page_size):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(url_name), {'page_size': page_size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), page_size)
+        return len(context.captured_queries)
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        for url_name in LIST_ENDPOINTS:
+            with self.subTest(url_name):
+                self.assertEqual(self.count_queries(url_name, 5), self.count_queries(url_name, 25))
+
+
+class ReportingLineSignalTests(TestCase):
+    """
+    Las señales mantienen la clausura de supervisión igual a la calculada
+    desde las tablas de empleados
+    """
+
+    def setUp(self):
+        User = get_user_model()
+        self.ceo, self.manager = User.objects.create(username='gerente'), User.objects.create(username='jefe2')
+        self.warehouse = Department.objects.create(name='Bodega', manager=self.ceo)
+        self.operator = Position.objects.create(name='Operario', department=self.warehouse)
+        self.boss = self.create_employee('JEFE')
+        self.lead = self.create_employee('LIDER', supervisor=self.boss.user)
+        self.worker = self.create_employee('OPERARIO', supervisor=self.lead.user)
+        self.unsupervised = self.create_employee('SIN-JEFE')
+
+    def create_employee(self, code, position=None, **values):
+        user = get_user_model().objects.create(username=code.lower())
+        return Employee.objects.create(
+            user=user, employee_id=code, position=position or self.operator, hire_date=date(2020, 1, 1), **values
+        )
+
+    def assert_consistent(self):
+        self.assertEqual(reporting_line_differences(), (set(), set()))
+
+    def test_changes_keep_closure_consistent(self):
+        self.assert_consistent()
+        self.assertEqual(management_chain(self.worker.pk), [self.lead.user_id, self.boss.user_id, self.ceo.pk])
+
+        # Cambio de supervisor: los subordinados heredan la nueva cadena
+        self.lead.supervisor = self.ceo
+        self.lead.save()
+        self.assert_consistent()
+        self.assertEqual(management_chain(self.worker.pk), [self.lead.user_id, self.ceo.pk])
+
+        # Cambio de gerente del departamento
+        self.warehouse.manager = self.manager
+        self.warehouse.save()
+        self.assert_consistent()
+        self.assertEqual(management_chain(self.unsupervised.pk), [self.manager.pk])
+
+        # Cambio de departamento de la posición
+        dispatch = Department.objects.create(name='Despacho', manager=self.ceo)
+        self.operator.department = dispatch
+        self.operator.save()
+        self.assert_consistent()
+        self.assertEqual(management_chain(self.boss.pk), [self.ceo.pk])
+
+        # Cambio de posición del empleado
+        self.unsupervised.position = Position.objects.create(name='Bodeguero', department=self.warehouse)
+        self.unsupervised.save()
+        self.assert_consistent()
+        self.assertEqual(management_chain(self.unsupervised.pk), [self.manager.pk])
+
+        # Eliminación de un empleado con subordinados: su usuario sigue
+        # siendo el supervisor, pero la cadena termina en él
+        self.lead.delete()
+        self.assert_consistent()
+        self.assertEqual(management_chain(self.worker.pk), [self.lead.user_id])
+
+        # Eliminación de la posición y del departamento (en cascada)
+        self.operator.delete()
+        self.assert_consistent()
+        self.assertEqual(management_chain(self.boss.pk), [])
+        self.warehouse.delete()
+        self.assert_consistent()
+        self.assertEqual(management_chain(self.unsupervised.pk), [])
+
+    def test_supervision_cycles(self):
+        first, second, third = [self.create_employee(f'CICLO-{index}') for index in range(3)]
+        first.supervisor = second.user
+        first.save()
+        second.supervisor = third.user
+        second.save()
+        third.supervisor = first.user
+        third.save()
+        self.assert_consistent()
+        self.assertEqual(management_chain(first.pk), [second.user_id, third.user_id])
+        self.assertEqual(management_chain(third.pk), [first.user_id, second.user_id])
+
+        # Supervisarse a sí mismo cae al gerente del departamento
+        first.supervisor = first.user
+        first.save()
+        self.assert_consistent()
+        self.assertEqual(management_chain(first.pk), [self.ceo.pk])
+
+
+class QualificationIndexTests(TestCase):
+    """
+    El índice de habilidades y certificaciones se sincroniza al guardar un
+    empleado y match_employees lo usa para el ranking
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        warehouse = Department.objects.create(name='Bodega')
+        cls.position = Position.objects.create(name='Operario', department=warehouse)
+        cls.other_position = Position.objects.create(name='Chofer', department=Department.objects.create(name='Ruta'))
+        cls.both = cls.create_employee('AMBAS', ['Montacargas', 'Picking'], ['Seguridad'])
+        cls.forklift = cls.create_employee('MONTACARGAS', [' montacargas '], [])
+        cls.picking = cls.create_employee('PICKING', ['PICKING'], ['seguridad'], position=cls.other_position)
+        cls.inactive = cls.create_employee('INACTIVO', ['Montacargas', 'Picking'], ['Seguridad'], is_active=False)
+
+    @classmethod
+    def create_employee(cls, code, skills, certifications, position=None, **values):
+        return Employee.objects.create(
+            user=get_user_model().objects.create(username=code.lower()), employee_id=code,
+            position=position or cls.position, hire_date=date(2020, 1, 1),
+            skills=skills, certifications=certifications, **values,
+        )
+
+    def codes(self, employee):
+        return set(EmployeeQualification.objects.filter(employee=employee).values_list(
+            'qualification__kind', 'qualification__code'
+        ))
+
+    def matched(self, **params):
+        return [(result['employee_id'], result['skill_score']) for result in match_employees(**params)]
+
+    def test_sync_on_save(self):
+        self.assertEqual(
+            self.codes(self.both),
+            {('skill', 'montacargas'), ('skill', 'picking'), ('certification', 'seguridad')},
+        )
+        self.assertEqual(self.codes(self.forklift), {('skill', 'montacargas')})
+        self.assertEqual(Qualification.objects.filter(code='montacargas').count(), 1)
+
+        self.forklift.skills = ['Picking', 'Inventario']
+        self.forklift.certifications = ['Primeros auxilios']
+        self.forklift.save()
+        self.assertEqual(
+            self.codes(self.forklift),
+            {('skill', 'picking'), ('skill', 'inventario'), ('certification', 'primeros auxilios')},
+        )
+        self.assertEqual(Qualification.objects.get(code='primeros auxilios').name, 'Primeros auxilios')
+
+    def test_ranking(self):
+        self.assertEqual(
+            self.matched(skills=['montacargas', 'picking']),
+            [('AMBAS', 1.0), ('MONTACARGAS', 0.5), ('PICKING', 0.5)],
+        )
+        self.assertEqual(self.matched(skills=['Montacargas'], department_id=self.other_position.department_id), [])
+        self.assertEqual(self.matched(skills=['desconocida']), [])
+
+    def test_required_certifications(self):
+        self.assertEqual(
+            self.matched(skills=['montacargas'], certifications=['SEGURIDAD']),
+            [('AMBAS', 1.0), ('PICKING', 0.0)],
+        )
+        self.assertEqual(self.matched(certifications=['seguridad', 'desconocida']), [])
+
+    def test_require_all_skills(self):
+        self.assertEqual(self.matched(skills=['montacargas', 'picking'], require_all_skills=True), [('AMBAS', 1.0)])
+        self.assertEqual(self.matched(skills=['picking', 'desconocida'], require_all_skills=True), [])
+
+    def test_new_catalog_entries_invalidate_on_commit(self):
+        with mock.patch('logistica_hr.employees.qualifications.invalidate_reference') as invalidate:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                qualification_ids({('skill', 'empaque'): 'Empaque'})
+                invalidate.assert_called_once_with(Qualification)
+            self.assertEqual(len(callbacks), 1)
+            self.assertEqual(invalidate.call_count, 2)
+            # Sin entradas nuevas no se invalida
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                qualification_ids({('skill', 'empaque'): 'Empaque'})
+            self.assertEqual((len(callbacks), invalidate.call_count), (0, 2))
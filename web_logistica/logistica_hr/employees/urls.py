@@ -9,12 +9,17 @@ from . import views
 app_name = 'employees'
 
 router = DefaultRouter()
-# router.register(r'', views.EmployeeViewSet)  # Comentado hasta crear las vistas
+# La vista raíz del router ocuparía la ruta vacía usada por el listado de empleados
+router.include_root_view = False
+router.register(r'departments', views.DepartmentViewSet)
+router.register(r'positions', views.PositionViewSet)
+router.register(r'schedules', views.WorkScheduleViewSet)
+router.register(r'qualifications', views.QualificationViewSet)
+router.register(r'', views.EmployeeViewSet)
 
 urlpatterns = [
+    # Antes del router: el registro vacío de empleados capturaría estas rutas como pk
+    path('coverage/', views.ScheduleCoverageView.as_view(), name='schedule-coverage'),
+    path('match/', views.EmployeeMatchView.as_view(), name='employee-match'),
     path('', include(router.urls)),
 ]
-
-
-
-
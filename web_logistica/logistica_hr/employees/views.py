@@ -1,23 +1,188 @@
 """
-Vistas básicas para la aplicación employees
+Vistas para la aplicación employees
 """
 
-from rest_framework import viewsets
-from .models import Department, Position, Employee, WorkSchedule
+from datetime import time
 
-# ViewSets básicos (se implementarán después)
-class DepartmentViewSet(viewsets.ModelViewSet):
-    pass
+from rest_framework import status, viewsets
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-class PositionViewSet(viewsets.ModelViewSet):
-    pass
+from logistica_hr.core.pagination import StandardCursorPagination
+from .coverage import schedule_coverage
+from .filters import EmployeeFilter
+from .models import Department, Position, Employee, Qualification, WorkSchedule
+from .qualifications import DEFAULT_MATCH_LIMIT, MAX_MATCH_LIMIT, match_employees
+from .serializers import (
+    DepartmentSerializer, PositionSerializer, EmployeeSerializer, QualificationSerializer,
+    WorkScheduleSerializer
+)
 
-class EmployeeViewSet(viewsets.ModelViewSet):
-    pass
+# Acciones que serializan objetos y necesitan las relaciones precargadas
+READ_ACTIONS = ['list', 'retrieve', 'create', 'update', 'partial_update']
 
-class WorkScheduleViewSet(viewsets.ModelViewSet):
-    pass
 
+class RelatedQuerySetMixin:
+    """
+    Aplica select_related solo en las acciones que serializan relaciones,
+    evitando consultas N+1 en los listados sin encarecer las eliminaciones
+    """
+    list_select_related = []
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in READ_ACTIONS and self.list_select_related:
+            queryset = queryset.select_related(*self.list_select_related)
+        return queryset
 
 
+class DepartmentViewSet(RelatedQuerySetMixin, viewsets.ModelViewSet):
+    """
+    API de departamentos
+    """
+    queryset = Department.objects.all()
+    serializer_class = DepartmentSerializer
+    pagination_class = StandardCursorPagination
+    list_select_related = ['manager']
+    filterset_fields = ['is_active', 'manager']
+    search_fields = ['name']
+    ordering_fields = ['id', 'name']
+    ordering = ['name']
+
+
+class PositionViewSet(RelatedQuerySetMixin, viewsets.ModelViewSet):
+    """
+    API de posiciones
+    """
+    queryset = Position.objects.all()
+    serializer_class = PositionSerializer
+    pagination_class = StandardCursorPagination
+    list_select_related = ['department']
+    filterset_fields = ['is_active', 'department']
+    search_fields = ['name']
+    ordering_fields = ['id']
+    ordering = ['-id']
+
+
+class EmployeeViewSet(RelatedQuerySetMixin, viewsets.ModelViewSet):
+    """
+    API de empleados
+    """
+    queryset = Employee.objects.all()
+    serializer_class = EmployeeSerializer
+    pagination_class = StandardCursorPagination
+    list_select_related = ['user', 'position__department', 'supervisor']
+    filterset_class = EmployeeFilter
+    search_fields = ['employee_id', 'user__first_name', 'user__last_name']
+    ordering_fields = ['id', 'employee_id']
+    ordering = ['employee_id']
+
+
+class WorkScheduleViewSet(RelatedQuerySetMixin, viewsets.ModelViewSet):
+    """
+    API de horarios de trabajo
+    """
+    queryset = WorkSchedule.objects.all()
+    serializer_class = WorkScheduleSerializer
+    pagination_class = StandardCursorPagination
+    list_select_related = ['employee']
+    filterset_fields = ['is_active', 'employee', 'day_of_week']
+    ordering_fields = ['id']
+    ordering = ['-id']
+
+
+class QualificationViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API de solo lectura del catálogo de habilidades y certificaciones (se
+    mantiene desde los empleados)
+    """
+    queryset = Qualification.objects.all()
+    serializer_class = QualificationSerializer
+    pagination_class = StandardCursorPagination
+    filterset_fields = ['is_active', 'kind']
+    search_fields = ['name']
+    ordering_fields = ['id']
+    ordering = ['-id']
+
+
+def _parse_minute(value, default):
+    """Convierte HH:MM en minutos desde la medianoche"""
+    if not value:
+        return default
+    parsed = time.fromisoformat(value)
+    return parsed.hour * 60 + parsed.minute
+
+
+class ScheduleCoverageView(APIView):
+    """
+    Cobertura de turnos según los horarios de trabajo vigentes
+
+    Parámetros: day (0 = lunes), start y end (HH:MM; si end <= start la
+    ventana termina al día siguiente, por defecto el día completo),
+    department, position, skill, minimum (brechas con menos empleados,
+    por defecto 1), maximum (superposición con más empleados) y
+    group_by=department.
+    """
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            day = int(params.get('day', 0))
+            start = _parse_minute(params.get('start'), 0)
+            end = _parse_minute(params.get('end'), start)
+            department = int(params['department']) if params.get('department') else None
+            position = int(params['position']) if params.get('position') else None
+            minimum = int(params.get('minimum', 1))
+            maximum = int(params['maximum']) if params.get('maximum') else None
+            group_by = params.get('group_by') or None
+            if not 0 <= day <= 6 or group_by not in (None, 'department'):
+                raise ValueError('Parámetros de cobertura inválidos')
+            return Response(schedule_coverage(
+                day, start, end,
+                department_id=department,
+                position_id=position,
+                skill=params.get('skill') or None,
+                minimum=minimum,
+                maximum=maximum,
+                group_by=group_by,
+            ))
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _parse_list(value):
+    """Convierte una lista separada por comas, omitiendo los vacíos"""
+    return [item for item in (value or '').split(',') if item.strip()]
+
+
+class EmployeeMatchView(APIView):
+    """
+    Empleados activos con las habilidades y certificaciones indicadas
+
+    Parámetros: skills y certifications (separadas por comas; no distinguen
+    mayúsculas), match (any, por defecto, ordena por habilidades
+    coincidentes; all exige todas), department y limit. Las
+    certificaciones siempre son obligatorias.
+    """
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            skills = _parse_list(params.get('skills'))
+            certifications = _parse_list(params.get('certifications'))
+            match = params.get('match', 'any')
+            department = int(params['department']) if params.get('department') else None
+            limit = int(params.get('limit', DEFAULT_MATCH_LIMIT))
+            if not skills and not certifications:
+                raise ValueError('Se debe indicar skills o certifications')
+            if match not in ('any', 'all') or not 1 <= limit <= MAX_MATCH_LIMIT:
+                raise ValueError('Parámetros de búsqueda inválidos')
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'results': match_employees(
+            skills=skills,
+            certifications=certifications,
+            require_all_skills=match == 'all',
+            department_id=department,
+            limit=limit,
+        )})
@@ -5,6 +5,9 @@ class PerformanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'logistica_hr.performance'
 
+    def ready(self):
+        from . import signals  # noqa: F401
+
 
 
 
@@ -0,0 +1,228 @@
+"""
+Conciliación de asistencia entre WorkSchedule y DailyWorkLog
+
+Para un conjunto de fechas, las llegadas tardías y salidas anticipadas se
+obtienen con una consulta que une cada registro diario con el horario del
+mismo día de la semana y calcula las diferencias en minutos en la base de
+datos; las inasistencias, con una consulta que cruza las fechas con los
+horarios y descarta las que tienen registro (NOT EXISTS). Solo las
+excepciones llegan a Python, y se guardan reemplazando las de esas fechas.
+
+La ejecución incremental concilia los días completos posteriores a la
+última ejecución y las fechas de los registros modificados desde entonces.
+Los cambios de horario no recalculan días anteriores: cada día se concilia
+con el horario vigente cuando se procesa. QuerySet.update no modifica
+updated_at, por lo que los registros actualizados así solo se concilian con
+reconcile_dates o el comando reconcile_attendance --start.
+"""
+
+import logging
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import ExtractHour, ExtractIsoWeekDay, ExtractMinute, Mod
+from django.utils import timezone
+
+from logistica_hr.employees.models import Employee, WorkSchedule
+from .models import AttendanceException, AttendanceReconciliationRun, DailyWorkLog
+
+logger = logging.getLogger(__name__)
+
+# Fechas conciliadas por transacción
+RECONCILE_CHUNK_DAYS = 31
+
+DAY_MINUTES = 24 * 60
+
+
+def _minutes(expression):
+    """Minutos desde la medianoche de una expresión de hora"""
+    return ExtractHour(expression) * 60 + ExtractMinute(expression)
+
+
+def _deviation(later, earlier):
+    """
+    Diferencia en minutos entre dos horas, entre -720 y 719, considerando
+    que pueden estar a ambos lados de la medianoche
+    """
+    return Mod(_minutes(later) - _minutes(earlier) + DAY_MINUTES + DAY_MINUTES // 2, DAY_MINUTES) - DAY_MINUTES // 2
+
+
+def _shift_minutes(start_time, end_time):
+    return ((end_time.hour * 60 + end_time.minute) - (start_time.hour * 60 + start_time.minute)) % DAY_MINUTES
+
+
+def late_and_early_rows(dates, grace_minutes):
+    """
+    Registros diarios de las fechas indicadas que comenzaron o terminaron
+    más de grace_minutes fuera del horario planificado
+
+    Retorna tuplas (empleado, fecha, inicio y fin planificados, inicio y fin
+    registrados, minutos de atraso, minutos de salida anticipada).
+    """
+    schedule = 'employee__work_schedules__'
+    return (
+        DailyWorkLog.objects.active()
+        .filter(date__in=dates, employee__is_active=True)
+        .annotate(weekday=ExtractIsoWeekDay('date') - 1)
+        # Un solo filter() para que las tres condiciones usen el mismo JOIN
+        # con el horario del día (único por empleado y día de la semana)
+        .filter(**{
+            f'{schedule}day_of_week': F('weekday'),
+            f'{schedule}is_active': True,
+        })
+        .annotate(
+            scheduled_start=F(f'{schedule}start_time'),
+            scheduled_end=F(f'{schedule}end_time'),
+        )
+        .annotate(
+            late_minutes=_deviation(F('start_time'), F('scheduled_start')),
+            early_minutes=_deviation(F('scheduled_end'), F('end_time')),
+        )
+        .filter(Q(late_minutes__gt=grace_minutes) | Q(early_minutes__gt=grace_minutes))
+        .order_by()
+        .values_list(
+            'employee_id', 'date', 'scheduled_start', 'scheduled_end',
+            'start_time', 'end_time', 'late_minutes', 'early_minutes'
+        )
+    )
+
+
+def missing_day_rows(dates):
+    """
+    Empleados activos con horario en alguna de las fechas indicadas y sin
+    registro diario en ella
+
+    Retorna tuplas (empleado, fecha, inicio planificado, fin planificado).
+    """
+    if not dates:
+        return []
+    quote = connection.ops.quote_name
+    schedule_table = quote(WorkSchedule._meta.db_table)
+    employee_table = quote(Employee._meta.db_table)
+    log_table = quote(DailyWorkLog._meta.db_table)
+    values = ', '.join(['(%s, %s)'] * len(dates))
+    params = []
+    for day in dates:
+        params += [day, day.weekday()]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'WITH days (day, weekday) AS (VALUES {values}) '
+            f'SELECT s.employee_id, d.day, s.start_time, s.end_time '
+            f'FROM days d '
+            f'JOIN {schedule_table} s ON s.day_of_week = d.weekday AND s.is_active '
+            f'JOIN {employee_table} e ON e.id = s.employee_id AND e.is_active AND e.hire_date <= d.day '
+            f'WHERE NOT EXISTS ('
+            f'SELECT 1 FROM {log_table} l '
+            f'WHERE l.employee_id = s.employee_id AND l.date = d.day AND l.is_active)',
+            params
+        )
+        rows = cursor.fetchall()
+    # SQLite retorna las fechas de la lista VALUES como texto
+    return [
+        (employee_id, date.fromisoformat(day) if isinstance(day, str) else day, start, end)
+        for employee_id, day, start, end in rows
+    ]
+
+
+def _exceptions_for(dates, grace_minutes):
+    exceptions = []
+    for employee_id, day, scheduled_start, scheduled_end, start, end, late, early in late_and_early_rows(
+        dates, grace_minutes
+    ):
+        for exception_type, minutes in [('late_arrival', late), ('early_exit', early)]:
+            if minutes > grace_minutes:
+                exceptions.append(AttendanceException(
+                    employee_id=employee_id, date=day, exception_type=exception_type,
+                    scheduled_start=scheduled_start, scheduled_end=scheduled_end,
+                    actual_start=start, actual_end=end, minutes=int(minutes),
+                ))
+    for employee_id, day, scheduled_start, scheduled_end in missing_day_rows(dates):
+        exceptions.append(AttendanceException(
+            employee_id=employee_id, date=day, exception_type='missing_day',
+            scheduled_start=scheduled_start, scheduled_end=scheduled_end,
+            minutes=_shift_minutes(scheduled_start, scheduled_end),
+        ))
+    return exceptions
+
+
+def reconcile_dates(dates, grace_minutes=None, chunk_days=RECONCILE_CHUNK_DAYS):
+    """
+    Concilia las fechas indicadas para todos los empleados, reemplazando sus
+    excepciones de asistencia
+
+    Cada bloque de chunk_days fechas se procesa en una transacción con
+    tres consultas (DELETE, atrasos y salidas, inasistencias) más los
+    INSERT por lotes. Retorna la cantidad de
+    excepciones guardadas.
+    """
+    if grace_minutes is None:
+        grace_minutes = settings.ATTENDANCE_GRACE_MINUTES
+    dates = sorted(set(dates))
+    total = 0
+    for index in range(0, len(dates), chunk_days):
+        chunk = dates[index:index + chunk_days]
+        with transaction.atomic():
+            AttendanceException.objects.filter(date__in=chunk).delete()
+            exceptions = _exceptions_for(chunk, grace_minutes)
+            # Una ejecución concurrente de las mismas fechas inserta las
+            # mismas filas; la restricción única descarta las repetidas
+            AttendanceException.objects.bulk_create(exceptions, batch_size=2000, ignore_conflicts=True)
+        total += len(exceptions)
+    return total
+
+
+def date_range(start_date, end_date):
+    """Fechas entre start_date y end_date, ambas incluidas"""
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+def pending_dates(last_run, today):
+    """
+    Fechas que debe conciliar la ejecución incremental: los días completos
+    posteriores a la última ejecución y las fechas anteriores de los
+    registros diarios modificados desde que comenzó
+    """
+    through = today - timedelta(days=1)
+    if last_run is None:
+        return date_range(through - timedelta(days=settings.ATTENDANCE_INITIAL_DAYS - 1), through)
+    dates = set(date_range(last_run.reconciled_through + timedelta(days=1), through))
+    dates.update(
+        DailyWorkLog.objects.filter(
+            updated_at__gte=last_run.started_at, date__lte=last_run.reconciled_through
+        ).order_by().values_list('date', flat=True).distinct()
+    )
+    return sorted(dates)
+
+
+def reconcile_attendance(today=None):
+    """
+    Ejecución incremental de la conciliación de asistencia
+
+    Registra la ejecución en AttendanceReconciliationRun y retorna la fila.
+    """
+    today = today or timezone.localdate()
+    last_run = AttendanceReconciliationRun.objects.filter(status='completed').order_by('-started_at').first()
+    dates = pending_dates(last_run, today)
+    through = today - timedelta(days=1)
+    if last_run is not None:
+        through = max(through, last_run.reconciled_through)
+    run = AttendanceReconciliationRun.objects.create(
+        started_at=timezone.now(),
+        reconciled_through=through,
+        days_reconciled=len(dates),
+    )
+    try:
+        run.exceptions_found = reconcile_dates(dates)
+    except Exception as exc:
+        logger.exception('Error conciliando la asistencia')
+        run.status = 'failed'
+        run.error_message = str(exc)
+        run.finished_at = timezone.now()
+        run.save(update_fields=['status', 'error_message', 'finished_at', 'updated_at'])
+        raise
+    run.status = 'completed'
+    run.finished_at = timezone.now()
+    run.save(update_fields=['status', 'exceptions_found', 'finished_at', 'updated_at'])
+    return run
@@ -0,0 +1,74 @@
+"""
+Caché del resumen del dashboard
+
+El resumen se guarda por departamento (y uno global), opcionalmente
+limitado a los subordinados de un jefe, con un TTL corto, y las señales de
+Task y DailyWorkLog eliminan las entradas afectadas al guardar o eliminar
+registros: las globales, las del departamento del empleado y las de sus
+jefes (leídos de la clausura ReportingLine).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from logistica_hr.employees.models import Employee, ReportingLine
+from .selectors import dashboard_summary
+
+DASHBOARD_CACHE_PREFIX = 'dashboard-summary'
+
+
+def dashboard_cache_key(department_id=None, manager_id=None):
+    """
+    Retorna la clave de caché del resumen de un departamento o global,
+    opcionalmente limitado a los subordinados de un jefe
+    """
+    key = f"{DASHBOARD_CACHE_PREFIX}:{department_id if department_id is not None else 'all'}"
+    if manager_id is not None:
+        key = f"{key}:manager:{manager_id}"
+    return key
+
+
+def _summary_keys(department_ids, manager_ids):
+    department_ids = [None] + list(department_ids)
+    return [
+        dashboard_cache_key(department_id, manager_id)
+        for department_id in department_ids
+        for manager_id in [None] + list(manager_ids)
+    ]
+
+
+def cached_dashboard_summary(department_id=None, manager_id=None):
+    """
+    Retorna el resumen del dashboard desde la caché o lo calcula
+    """
+    key = dashboard_cache_key(department_id, manager_id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = dashboard_summary(department_id, manager_id=manager_id)
+        cache.set(key, summary, settings.DASHBOARD_SUMMARY_TTL)
+    return summary
+
+
+def invalidate_dashboard_summary(employee_id):
+    """
+    Elimina el resumen global y los del departamento y los jefes de un
+    empleado
+
+    Una reasignación entre departamentos o jefes deja los resúmenes
+    anteriores desactualizados como máximo hasta que expire su TTL.
+    """
+    invalidate_dashboard_summaries([employee_id])
+
+
+def invalidate_dashboard_summaries(employee_ids):
+    """
+    Elimina el resumen global y los de los departamentos y los jefes de
+    varios empleados
+    """
+    department_ids = Employee.objects.filter(
+        pk__in=employee_ids, position__isnull=False
+    ).values_list('position__department_id', flat=True).distinct()
+    manager_ids = ReportingLine.objects.filter(
+        employee_id__in=employee_ids
+    ).values_list('manager_id', flat=True).distinct()
+    cache.delete_many(_summary_keys(department_ids, manager_ids))
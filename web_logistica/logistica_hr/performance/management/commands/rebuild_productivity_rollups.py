@@ -0,0 +1,46 @@
+"""
+Comando para reconstruir los agregados de productividad de DailyWorkLog
+"""
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from logistica_hr.core.partitioning import ArchivedRangeError
+from logistica_hr.performance.services import rebuild_productivity_rollups
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye los agregados diarios, semanales y mensuales de productividad'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=date.fromisoformat,
+            help='Fecha de inicio (YYYY-MM-DD). Por defecto hace 30 días.'
+        )
+        parser.add_argument(
+            '--end',
+            type=date.fromisoformat,
+            help='Fecha de fin (YYYY-MM-DD). Por defecto hoy.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Cantidad de filas procesadas por lote'
+        )
+
+    def handle(self, *args, **options):
+        end = options['end'] or date.today()
+        start = options['start'] or end - timedelta(days=30)
+        if start > end:
+            raise CommandError('La fecha de inicio debe ser anterior a la fecha de fin')
+
+        try:
+            rebuild_productivity_rollups(start, end, chunk_size=options['chunk_size'])
+        except ArchivedRangeError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f'Agregados de productividad reconstruidos entre {start} y {end}'
+        ))
@@ -0,0 +1,53 @@
+"""
+Comando para conciliar la asistencia planificada con los registros diarios
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from logistica_hr.performance.attendance import date_range, reconcile_attendance, reconcile_dates
+
+
+class Command(BaseCommand):
+    help = (
+        'Concilia WorkSchedule con DailyWorkLog y registra llegadas tardías, salidas '
+        'anticipadas e inasistencias. Sin fechas ejecuta la conciliación incremental.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=date.fromisoformat,
+            help='Fecha de inicio (YYYY-MM-DD) para reconciliar un rango completo'
+        )
+        parser.add_argument(
+            '--end',
+            type=date.fromisoformat,
+            help='Fecha de fin (YYYY-MM-DD). Por defecto la fecha de inicio.'
+        )
+        parser.add_argument(
+            '--grace-minutes',
+            type=int,
+            help='Minutos de tolerancia. Por defecto ATTENDANCE_GRACE_MINUTES.'
+        )
+
+    def handle(self, *args, **options):
+        start = options['start']
+        if start is None:
+            if options['end'] or options['grace_minutes'] is not None:
+                raise CommandError('--end y --grace-minutes requieren --start')
+            run = reconcile_attendance()
+            self.stdout.write(self.style.SUCCESS(
+                f'{run.days_reconciled} días conciliados hasta {run.reconciled_through}: '
+                f'{run.exceptions_found} excepciones'
+            ))
+            return
+
+        end = options['end'] or start
+        if start > end:
+            raise CommandError('La fecha de inicio debe ser anterior a la fecha de fin')
+        found = reconcile_dates(date_range(start, end), grace_minutes=options['grace_minutes'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Asistencia conciliada entre {start} y {end}: {found} excepciones'
+        ))
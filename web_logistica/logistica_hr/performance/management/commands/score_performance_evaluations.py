@@ -0,0 +1,51 @@
+"""
+Comando para calcular las evaluaciones de rendimiento de un período
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from logistica_hr.performance.models import PerformanceEvaluation
+from logistica_hr.performance.scoring import score_evaluation_period
+
+
+class Command(BaseCommand):
+    help = 'Calcula el puntaje general de PerformanceEvaluation para todos los empleados de un período'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=date.fromisoformat,
+            required=True,
+            help='Fecha de inicio del período (YYYY-MM-DD)'
+        )
+        parser.add_argument(
+            '--end',
+            type=date.fromisoformat,
+            required=True,
+            help='Fecha de fin del período (YYYY-MM-DD)'
+        )
+        parser.add_argument(
+            '--type',
+            dest='evaluation_type',
+            choices=[code for code, _ in PerformanceEvaluation.EVALUATION_TYPE_CHOICES],
+            required=True,
+            help='Tipo de evaluación'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Cantidad de evaluaciones por sentencia INSERT'
+        )
+
+    def handle(self, *args, **options):
+        if options['start'] > options['end']:
+            raise CommandError('La fecha de inicio debe ser anterior a la fecha de fin')
+
+        written = score_evaluation_period(
+            options['start'], options['end'], options['evaluation_type'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Evaluaciones calculadas: {written}'))
@@ -2,13 +2,17 @@
 Modelos para la aplicación performance
 """
 
+from datetime import timedelta
+
 from django.db import models
+from django.db.models import Case, ExpressionWrapper, F, Q, Value, When
+from django.db.models.functions import Cast, Greatest
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator
 
-from logistica_hr.core.models import BaseModel
+from logistica_hr.core.models import ActiveQuerySet, BaseModel, TimestampedModel
 from logistica_hr.users.models import User
-from logistica_hr.employees.models import Employee
+from logistica_hr.employees.models import Department, Employee
 from logistica_hr.tasks.models import Task
 
 
@@ -79,6 +83,43 @@ class PerformanceMetric(BaseModel):
         return f"{self.name} ({self.get_metric_type_display()})"
 
 
+class EmployeePerformanceQuerySet(ActiveQuerySet):
+    """
+    QuerySet para rendimientos de empleados con cálculos en base de datos
+    """
+
+    def with_performance_score(self):
+        """
+        Anota performance_score_db, equivalente a EmployeePerformance.performance_score
+
+        Cuando la métrica no tiene valor mínimo y el valor real está bajo el
+        objetivo la propiedad no puede calcular el puntaje; la anotación
+        retorna NULL en ese caso.
+        """
+        actual = Cast('actual_value', models.FloatField())
+        target = Cast('metric__target_value', models.FloatField())
+        minimum = Cast('metric__min_value', models.FloatField())
+        return self.annotate(
+            performance_score_db=Case(
+                When(
+                    Q(metric__target_value__isnull=True) | Q(metric__target_value=0),
+                    then=Value(None),
+                ),
+                When(actual_value__gte=F('metric__target_value'), then=Value(100.0)),
+                When(
+                    Q(metric__min_value__isnull=False) & ~Q(metric__min_value=0)
+                    & Q(actual_value__lt=F('metric__min_value')),
+                    then=Value(0.0),
+                ),
+                When(metric__min_value__isnull=True, then=Value(None)),
+                default=Greatest(
+                    Value(0.0), (actual - minimum) * 100 / (target - minimum)
+                ),
+                output_field=models.FloatField(),
+            )
+        )
+
+
 class EmployeePerformance(BaseModel):
     """
     Modelo para el rendimiento de empleados
@@ -116,6 +157,8 @@ class EmployeePerformance(BaseModel):
         verbose_name=_('Evaluado por')
     )
 
+    objects = EmployeePerformanceQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Rendimiento de Empleado')
         verbose_name_plural = _('Rendimientos de Empleados')
@@ -123,7 +166,11 @@ class EmployeePerformance(BaseModel):
         ordering = ['-date', 'employee']
         indexes = [
             models.Index(fields=['employee', 'date']),
-            models.Index(fields=['metric', 'date']),
+            models.Index(
+                fields=['metric', 'date'],
+                condition=Q(is_active=True),
+                name='perf_active_metric_date_idx'
+            ),
         ]
 
     def __str__(self):
@@ -152,6 +199,28 @@ class EmployeePerformance(BaseModel):
         return False
 
 
+class DailyWorkLogQuerySet(ActiveQuerySet):
+    """
+    QuerySet para registros diarios con cálculos en base de datos
+    """
+
+    def with_total_work_time(self):
+        """Anota total_work_time_db, equivalente a DailyWorkLog.total_work_time"""
+        shift = ExpressionWrapper(
+            F('end_time') - F('start_time'), output_field=models.DurationField()
+        )
+        return self.annotate(
+            total_work_time_db=Case(
+                When(
+                    end_time__lt=F('start_time'),
+                    then=shift + Value(timedelta(days=1)) - F('total_break_time'),
+                ),
+                default=shift - F('total_break_time'),
+                output_field=models.DurationField(),
+            )
+        )
+
+
 class DailyWorkLog(BaseModel):
     """
     Modelo para registro diario de trabajo
@@ -204,6 +273,8 @@ class DailyWorkLog(BaseModel):
         verbose_name=_('Notas')
     )
 
+    objects = DailyWorkLogQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Registro Diario de Trabajo')
         verbose_name_plural = _('Registros Diarios de Trabajo')
@@ -211,7 +282,13 @@ class DailyWorkLog(BaseModel):
         ordering = ['-date', 'employee']
         indexes = [
             models.Index(fields=['employee', 'date']),
-            models.Index(fields=['date']),
+            models.Index(
+                fields=['date', 'employee'],
+                condition=Q(is_active=True),
+                name='worklog_active_date_idx'
+            ),
+            # Fechas modificadas desde la última conciliación de asistencia
+            models.Index(fields=['updated_at'], name='worklog_updated_idx'),
         ]
 
     def __str__(self):
@@ -250,6 +327,117 @@ class DailyWorkLog(BaseModel):
         return 0
 
 
+class ProductivityRollup(TimestampedModel):
+    """
+    Modelo para agregados de productividad precalculados a partir de DailyWorkLog
+
+    Cada fila resume un empleado (o un departamento completo cuando employee es
+    nulo) en un período diario, semanal o mensual. Se mantiene de forma
+    incremental desde las señales de DailyWorkLog.
+    """
+    PERIOD_CHOICES = [
+        ('day', _('Diario')),
+        ('week', _('Semanal')),
+        ('month', _('Mensual')),
+    ]
+
+    period = models.CharField(
+        max_length=10,
+        choices=PERIOD_CHOICES,
+        verbose_name=_('Período')
+    )
+    period_start = models.DateField(
+        verbose_name=_('Inicio del Período')
+    )
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='productivity_rollups',
+        verbose_name=_('Empleado')
+    )
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='productivity_rollups',
+        verbose_name=_('Departamento')
+    )
+    log_count = models.IntegerField(
+        default=0,
+        verbose_name=_('Cantidad de Registros')
+    )
+    packages_processed = models.IntegerField(
+        default=0,
+        verbose_name=_('Paquetes Procesados')
+    )
+    trucks_received = models.IntegerField(
+        default=0,
+        verbose_name=_('Camiones Recibidos')
+    )
+    trucks_dispatched = models.IntegerField(
+        default=0,
+        verbose_name=_('Camiones Despachados')
+    )
+    total_work_time = models.DurationField(
+        default=timedelta,
+        verbose_name=_('Tiempo Total de Trabajo')
+    )
+    total_break_time = models.DurationField(
+        default=timedelta,
+        verbose_name=_('Tiempo Total de Descanso')
+    )
+    productivity_score_total = models.IntegerField(
+        default=0,
+        verbose_name=_('Suma de Puntajes de Productividad')
+    )
+    efficiency_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=4,
+        default=0,
+        verbose_name=_('Suma de Porcentajes de Eficiencia')
+    )
+    avg_productivity_score = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        default=0,
+        verbose_name=_('Puntaje de Productividad Promedio')
+    )
+    avg_efficiency_percentage = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        default=0,
+        verbose_name=_('Porcentaje de Eficiencia Promedio')
+    )
+
+    class Meta:
+        verbose_name = _('Agregado de Productividad')
+        verbose_name_plural = _('Agregados de Productividad')
+        ordering = ['-period_start', 'period']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['period', 'period_start', 'employee'],
+                condition=models.Q(employee__isnull=False),
+                name='uniq_rollup_employee_period',
+            ),
+            models.UniqueConstraint(
+                fields=['period', 'period_start', 'department'],
+                condition=models.Q(employee__isnull=True),
+                name='uniq_rollup_department_period',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['period', 'period_start', 'avg_productivity_score']),
+            models.Index(fields=['department', 'period', 'period_start']),
+        ]
+
+    def __str__(self):
+        scope = self.employee or self.department
+        return f"{scope} - {self.get_period_display()} - {self.period_start}"
+
+
 class PerformanceEvaluation(BaseModel):
     """
     Modelo para evaluaciones de rendimiento
@@ -318,6 +506,12 @@ class PerformanceEvaluation(BaseModel):
             models.Index(fields=['employee', 'evaluation_type']),
             models.Index(fields=['start_date', 'end_date']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['employee', 'evaluation_type', 'start_date', 'end_date'],
+                name='uniq_evaluation_employee_type_period',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.employee} - {self.get_evaluation_type_display()} - {self.end_date}"
@@ -328,5 +522,189 @@ class PerformanceEvaluation(BaseModel):
         return (self.end_date - self.start_date).days + 1
 
 
+class ScoreRecomputeJob(TimestampedModel):
+    """
+    Modelo para el seguimiento del recálculo de evaluaciones tras modificar
+    una métrica de rendimiento
+    """
+    STATUS_CHOICES = [
+        ('pending', _('Pendiente')),
+        ('running', _('En Proceso')),
+        ('completed', _('Completado')),
+        ('failed', _('Fallido')),
+    ]
 
+    metric = models.ForeignKey(
+        PerformanceMetric,
+        on_delete=models.CASCADE,
+        related_name='recompute_jobs',
+        verbose_name=_('Métrica')
+    )
+    changed_fields = models.JSONField(
+        default=list,
+        verbose_name=_('Campos Modificados')
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name=_('Estado')
+    )
+    total_evaluations = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Evaluaciones Afectadas')
+    )
+    processed_evaluations = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Evaluaciones Procesadas')
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Fecha de Inicio')
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Fecha de Término')
+    )
+    error_message = models.TextField(
+        blank=True,
+        verbose_name=_('Mensaje de Error')
+    )
+
+    class Meta:
+        verbose_name = _('Recálculo de Puntajes')
+        verbose_name_plural = _('Recálculos de Puntajes')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.metric.name} - {self.get_status_display()}"
+
+    @property
+    def progress_percentage(self):
+        """Porcentaje de evaluaciones procesadas"""
+        if not self.total_evaluations:
+            return 100 if self.status == 'completed' else 0
+        return round(self.processed_evaluations * 100 / self.total_evaluations, 1)
 
+
+class AttendanceException(TimestampedModel):
+    """
+    Modelo para las diferencias entre el horario planificado (WorkSchedule)
+    y el registro diario de trabajo de un empleado
+
+    Las filas las genera la conciliación de asistencia (attendance.py); al
+    conciliar una fecha se reemplazan todas sus excepciones.
+    """
+    EXCEPTION_TYPE_CHOICES = [
+        ('late_arrival', _('Llegada Tardía')),
+        ('early_exit', _('Salida Anticipada')),
+        ('missing_day', _('Inasistencia')),
+    ]
+
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='attendance_exceptions',
+        verbose_name=_('Empleado')
+    )
+    date = models.DateField(
+        verbose_name=_('Fecha')
+    )
+    exception_type = models.CharField(
+        max_length=20,
+        choices=EXCEPTION_TYPE_CHOICES,
+        verbose_name=_('Tipo de Excepción')
+    )
+    scheduled_start = models.TimeField(
+        verbose_name=_('Inicio Planificado')
+    )
+    scheduled_end = models.TimeField(
+        verbose_name=_('Fin Planificado')
+    )
+    actual_start = models.TimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Inicio Registrado')
+    )
+    actual_end = models.TimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Fin Registrado')
+    )
+    minutes = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Minutos de Diferencia')
+    )
+
+    class Meta:
+        verbose_name = _('Excepción de Asistencia')
+        verbose_name_plural = _('Excepciones de Asistencia')
+        ordering = ['-date', 'employee']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['employee', 'date', 'exception_type'],
+                name='uniq_attendance_exception',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'exception_type'], name='attendance_date_type_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee} - {self.date} - {self.get_exception_type_display()}"
+
+
+class AttendanceReconciliationRun(TimestampedModel):
+    """
+    Modelo para el seguimiento de las ejecuciones de la conciliación de
+    asistencia
+
+    La siguiente ejecución incremental concilia los días posteriores a
+    reconciled_through y las fechas de los registros diarios modificados
+    desde started_at.
+    """
+    STATUS_CHOICES = [
+        ('running', _('En Proceso')),
+        ('completed', _('Completado')),
+        ('failed', _('Fallido')),
+    ]
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='running',
+        verbose_name=_('Estado')
+    )
+    started_at = models.DateTimeField(
+        verbose_name=_('Fecha de Inicio')
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Fecha de Término')
+    )
+    reconciled_through = models.DateField(
+        verbose_name=_('Conciliado Hasta')
+    )
+    days_reconciled = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Días Conciliados')
+    )
+    exceptions_found = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Excepciones Encontradas')
+    )
+    error_message = models.TextField(
+        blank=True,
+        verbose_name=_('Mensaje de Error')
+    )
+
+    class Meta:
+        verbose_name = _('Conciliación de Asistencia')
+        verbose_name_plural = _('Conciliaciones de Asistencia')
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.started_at:%Y-%m-%d %H:%M} - {self.get_status_display()}"
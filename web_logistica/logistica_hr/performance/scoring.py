@@ -0,0 +1,211 @@
+"""
+Cálculo vectorizado del puntaje general de PerformanceEvaluation
+
+El puntaje general de un empleado en un período es el promedio ponderado
+(por PerformanceMetric.weight) del promedio de EmployeePerformance.
+performance_score de cada métrica. Los registros sin puntaje calculable
+se omiten y las métricas sin registros no entran al promedio.
+
+overall_score_from_records aplica la fórmula registro por registro y sirve
+de referencia; compute_overall_scores obtiene el mismo resultado para todos
+los empleados a la vez con arreglos de NumPy.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+import numpy as np
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from logistica_hr.core.cache import cached_reference
+from .models import EmployeePerformance, PerformanceEvaluation, PerformanceMetric
+
+# Campos de PerformanceMetric de los que depende overall_score
+SCORE_DEPENDENCY_FIELDS = ['target_value', 'min_value', 'weight']
+
+
+def _to_decimal(score):
+    """Redondea un puntaje a dos decimales como en overall_score"""
+    return Decimal(str(round(float(score), 2)))
+
+
+def overall_score_from_records(records):
+    """
+    Calcula el puntaje general a partir de registros EmployeePerformance
+    (con su métrica cargada) usando la propiedad performance_score
+    """
+    scores = defaultdict(list)
+    weights = {}
+    for record in records:
+        try:
+            score = record.performance_score
+        except TypeError:
+            # Métrica sin valor mínimo con valor real bajo el objetivo
+            score = None
+        if score is None:
+            continue
+        scores[record.metric_id].append(float(score))
+        weights[record.metric_id] = float(record.metric.weight)
+
+    total_weight = sum(weights[metric_id] for metric_id in scores)
+    if not total_weight:
+        return None
+    weighted = sum(
+        weights[metric_id] * (sum(values) / len(values))
+        for metric_id, values in scores.items()
+    )
+    return _to_decimal(weighted / total_weight)
+
+
+def _metric_arrays():
+    """
+    Carga objetivo, mínimo y peso de todas las métricas en arreglos
+    indexados por posición, junto al mapa id -> posición
+    """
+    metrics = cached_reference(
+        PerformanceMetric, 'score-parameters',
+        lambda: list(PerformanceMetric.objects.values_list('pk', 'target_value', 'min_value', 'weight'))
+    )
+    index = {pk: position for position, (pk, _, _, _) in enumerate(metrics)}
+    target = np.array([np.nan if t is None else float(t) for _, t, _, _ in metrics], dtype=np.float64)
+    minimum = np.array([np.nan if m is None else float(m) for _, _, m, _ in metrics], dtype=np.float64)
+    weight = np.array([float(w) for _, _, _, w in metrics], dtype=np.float64)
+    return index, target, minimum, weight
+
+
+def vectorized_scores(values, target, minimum):
+    """
+    Aplica EmployeePerformance.performance_score a arreglos alineados de
+    valor real, objetivo y mínimo; retorna NaN donde el puntaje es None
+    """
+    scores = np.full(values.shape, np.nan)
+    has_target = ~np.isnan(target) & (target != 0)
+    above = has_target & (values >= target)
+    has_minimum = ~np.isnan(minimum)
+    below = has_target & ~above & has_minimum & (minimum != 0) & (values < minimum)
+    proportional = has_target & ~above & ~below & has_minimum
+
+    scores[above] = 100.0
+    scores[below] = 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = (values - minimum) / (target - minimum) * 100
+    scores[proportional] = np.maximum(0.0, ratio[proportional])
+    return scores
+
+
+def compute_overall_scores(start_date, end_date, employee_ids=None, chunk_size=20000):
+    """
+    Calcula el puntaje general de cada empleado con registros en el período
+
+    Retorna un diccionario employee_id -> Decimal (o None si ninguna métrica
+    con peso tiene puntaje calculable).
+    """
+    metric_index, target, minimum, weight = _metric_arrays()
+
+    queryset = EmployeePerformance.objects.filter(
+        date__gte=start_date, date__lte=end_date
+    ).order_by()
+    if employee_ids is not None:
+        queryset = queryset.filter(employee_id__in=employee_ids)
+    rows = list(queryset.values_list('employee_id', 'metric_id', 'actual_value').iterator(
+        chunk_size=chunk_size
+    ))
+    if not rows:
+        return {}
+
+    employee_column = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    metric_column = np.fromiter((metric_index[row[1]] for row in rows), dtype=np.int64, count=len(rows))
+    values = np.fromiter((float(row[2]) for row in rows), dtype=np.float64, count=len(rows))
+
+    employees, employee_position = np.unique(employee_column, return_inverse=True)
+    scores = vectorized_scores(values, target[metric_column], minimum[metric_column])
+
+    # Promedio por (empleado, métrica) con bincount sobre un índice plano
+    valid = ~np.isnan(scores)
+    metric_count = len(weight)
+    cells = len(employees) * metric_count
+    flat = employee_position[valid] * metric_count + metric_column[valid]
+    sums = np.bincount(flat, weights=scores[valid], minlength=cells).reshape(-1, metric_count)
+    counts = np.bincount(flat, minlength=cells).reshape(-1, metric_count)
+
+    has_score = counts > 0
+    means = np.divide(sums, counts, out=np.zeros_like(sums), where=has_score)
+    weights = np.where(has_score, weight, 0.0)
+    total_weight = weights.sum(axis=1)
+    weighted = (means * weights).sum(axis=1)
+
+    return {
+        int(employee_id): _to_decimal(weighted[position] / total_weight[position])
+        if total_weight[position] else None
+        for position, employee_id in enumerate(employees)
+    }
+
+
+def score_evaluation_period(start_date, end_date, evaluation_type, employee_ids=None,
+                            evaluated_by=None, batch_size=2000):
+    """
+    Calcula y guarda las evaluaciones de un período para todos los empleados
+    con registros de rendimiento
+
+    Las evaluaciones existentes del mismo empleado, tipo y período se
+    actualizan. Retorna la cantidad de evaluaciones escritas.
+    """
+    scores = compute_overall_scores(start_date, end_date, employee_ids=employee_ids)
+    evaluations = [
+        PerformanceEvaluation(
+            employee_id=employee_id,
+            evaluation_type=evaluation_type,
+            start_date=start_date,
+            end_date=end_date,
+            overall_score=score,
+            evaluated_by=evaluated_by,
+        )
+        for employee_id, score in scores.items()
+    ]
+    with transaction.atomic():
+        PerformanceEvaluation.objects.bulk_create(
+            evaluations,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['employee', 'evaluation_type', 'start_date', 'end_date'],
+            update_fields=['overall_score', 'evaluated_by', 'is_active', 'updated_at'],
+        )
+    return len(evaluations)
+
+
+def evaluations_depending_on_metric(metric_id):
+    """
+    Evaluaciones cuyo período contiene registros de la métrica indicada
+    """
+    records = EmployeePerformance.objects.filter(
+        metric_id=metric_id,
+        employee_id=OuterRef('employee_id'),
+        date__gte=OuterRef('start_date'),
+        date__lte=OuterRef('end_date'),
+    )
+    return PerformanceEvaluation.objects.filter(Exists(records))
+
+
+def rescore_evaluations(evaluations):
+    """
+    Recalcula overall_score de una lista de evaluaciones agrupándolas por
+    período; retorna la cantidad de evaluaciones actualizadas
+    """
+    periods = defaultdict(list)
+    for evaluation in evaluations:
+        periods[(evaluation.start_date, evaluation.end_date)].append(evaluation)
+
+    now = timezone.now()
+    for (start_date, end_date), period_evaluations in periods.items():
+        scores = compute_overall_scores(
+            start_date, end_date,
+            employee_ids={evaluation.employee_id for evaluation in period_evaluations},
+        )
+        for evaluation in period_evaluations:
+            evaluation.overall_score = scores.get(evaluation.employee_id)
+            evaluation.updated_at = now
+    PerformanceEvaluation.objects.bulk_update(evaluations, ['overall_score', 'updated_at'])
+    return len(evaluations)
@@ -0,0 +1,67 @@
+"""
+Selectores para la aplicación performance
+"""
+
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+from logistica_hr.employees.hierarchy import subtree_q
+from logistica_hr.employees.models import Employee
+from logistica_hr.tasks.models import Task
+from .models import DailyWorkLog
+
+
+def dashboard_summary(department_id=None, day=None, manager_id=None):
+    """
+    Calcula los indicadores del dashboard con consultas agregadas
+
+    Retorna empleados activos, tareas por estado, tareas vencidas y la
+    producción y calidad promedio del día. Si se indica un departamento los
+    indicadores se limitan a sus empleados; si se indica un jefe (usuario),
+    a sus subordinados directos e indirectos.
+    """
+    day = day or timezone.localdate()
+    employees = Employee.objects.active()
+    tasks = Task.objects.active().order_by()
+    logs = DailyWorkLog.objects.active().filter(date=day)
+    if department_id is not None:
+        employees = employees.filter(position__department_id=department_id)
+        tasks = tasks.filter(assigned_to__position__department_id=department_id)
+        logs = logs.filter(employee__position__department_id=department_id)
+    if manager_id is not None:
+        employees = employees.filter(subtree_q(manager_id))
+        tasks = tasks.filter(subtree_q(manager_id, 'assigned_to'))
+        logs = logs.filter(subtree_q(manager_id, 'employee'))
+
+    tasks_by_status = {code: 0 for code, _ in Task.STATUS_CHOICES}
+    overdue = 0
+    for row in tasks.values('status').annotate(
+        total=Count('pk'),
+        overdue=Count('pk', filter=Q(due_date__lt=timezone.now())),
+    ):
+        tasks_by_status[row['status']] = row['total']
+        if row['status'] in Task.OPEN_STATUSES:
+            overdue += row['overdue']
+
+    production = logs.aggregate(
+        log_count=Count('pk'),
+        packages_processed=Sum('packages_processed'),
+        trucks_received=Sum('trucks_received'),
+        trucks_dispatched=Sum('trucks_dispatched'),
+        avg_quality_score=Avg('quality_score'),
+    )
+    avg_quality = production.pop('avg_quality_score')
+
+    return {
+        'department': department_id,
+        'manager': manager_id,
+        'date': day.isoformat(),
+        'active_employees': employees.count(),
+        'tasks_by_status': tasks_by_status,
+        'overdue_tasks': overdue,
+        'today': {
+            key: value or 0 for key, value in production.items()
+        },
+        'avg_quality_score': round(float(avg_quality), 4) if avg_quality is not None else None,
+        'generated_at': timezone.now().isoformat(),
+    }
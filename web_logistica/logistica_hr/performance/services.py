@@ -0,0 +1,416 @@
+"""
+Servicios para la aplicación performance
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Max, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from logistica_hr.core.ingestion import build_report, clean_columns, read_rows, resolve_lookup
+from logistica_hr.core.partitioning import check_archived_range
+from logistica_hr.employees.models import Employee
+from logistica_hr.search.services import index_queryset
+from .models import DailyWorkLog, ProductivityRollup
+
+ROLLUP_PERIODS = ['day', 'week', 'month']
+
+DAILY_WORK_LOG_INGEST_FIELDS = [
+    'date',
+    'start_time',
+    'end_time',
+    'total_break_time',
+    'packages_processed',
+    'trucks_received',
+    'trucks_dispatched',
+    'quality_score',
+    'safety_incidents',
+    'notes',
+]
+
+ROLLUP_SUM_FIELDS = [
+    'packages_processed',
+    'trucks_received',
+    'trucks_dispatched',
+    'total_work_time',
+    'total_break_time',
+    'productivity_score_total',
+    'efficiency_total',
+]
+
+
+def period_bounds(period, day):
+    """
+    Retorna el rango [inicio, fin) del período que contiene la fecha indicada
+    """
+    if period == 'day':
+        return day, day + timedelta(days=1)
+    if period == 'week':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=7)
+    if period == 'month':
+        start = day.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start, next_month
+    raise ValueError(f"Período no soportado: {period}")
+
+
+def _log_rollup_values(log):
+    """
+    Calcula los valores diarios de un DailyWorkLog usando sus propiedades
+    """
+    return {
+        'log_count': 1,
+        'packages_processed': log.packages_processed,
+        'trucks_received': log.trucks_received,
+        'trucks_dispatched': log.trucks_dispatched,
+        'total_work_time': log.total_work_time,
+        'total_break_time': log.total_break_time,
+        'productivity_score_total': log.productivity_score,
+        'efficiency_total': Decimal(str(round(log.efficiency_percentage, 4))),
+    }
+
+
+def _with_averages(values):
+    """
+    Agrega los promedios calculados a partir de las sumas del agregado
+    """
+    count = values['log_count']
+    if count:
+        values['avg_productivity_score'] = round(
+            Decimal(values['productivity_score_total']) / count, 2
+        )
+        values['avg_efficiency_percentage'] = round(
+            Decimal(values['efficiency_total']) / count, 2
+        )
+    else:
+        values['avg_productivity_score'] = Decimal('0')
+        values['avg_efficiency_percentage'] = Decimal('0')
+    return values
+
+
+# Agregados que se calculan agrupando filas diarias de empleados: período y
+# clave de agrupación (los agregados diarios de empleado salen de DailyWorkLog)
+ROLLUP_GROUPINGS = [
+    ('week', 'employee_id'),
+    ('month', 'employee_id'),
+    ('day', 'department_id'),
+    ('week', 'department_id'),
+    ('month', 'department_id'),
+]
+
+ROLLUP_BUCKETS = {
+    'day': F('period_start'),
+    'week': TruncWeek('period_start'),
+    'month': TruncMonth('period_start'),
+}
+
+
+def _grouped_rollups(period, key, day_rows, chunk_size=2000):
+    """
+    Agrupa filas diarias de empleados por key y por el período que las
+    contiene, y genera los agregados (sin guardarlos)
+    """
+    extra = {}
+    if key == 'employee_id':
+        # Un empleado pudo cambiar de posición dentro del período
+        extra['department_id'] = Max('department_id')
+    else:
+        day_rows = day_rows.filter(department__isnull=False)
+    grouped = day_rows.annotate(bucket=ROLLUP_BUCKETS[period]).values(key, 'bucket').annotate(
+        log_total=Sum('log_count'), **{field: Sum(field) for field in ROLLUP_SUM_FIELDS}, **extra
+    )
+    for row in grouped.iterator(chunk_size=chunk_size):
+        values = {field: row[field] for field in ROLLUP_SUM_FIELDS}
+        values['log_count'] = row['log_total']
+        yield ProductivityRollup(
+            period=period,
+            period_start=row['bucket'],
+            employee_id=row.get('employee_id'),
+            department_id=row['department_id'],
+            **_with_averages(values)
+        )
+
+
+def _aggregate_day_rows(queryset):
+    """
+    Suma filas diarias de empleados en un único agregado
+    """
+    totals = queryset.aggregate(
+        log_count=Sum('log_count'),
+        **{field: Sum(field) for field in ROLLUP_SUM_FIELDS}
+    )
+    if not totals['log_count']:
+        return None
+    return _with_averages(totals)
+
+
+def _store_rollup(period, period_start, employee_id, department_id, values):
+    """
+    Crea, actualiza o elimina una fila de agregado
+    """
+    lookup = {
+        'period': period,
+        'period_start': period_start,
+        'employee_id': employee_id,
+    }
+    if employee_id is None:
+        lookup['department_id'] = department_id
+    if values is None:
+        ProductivityRollup.objects.filter(**lookup).delete()
+        return
+    values['department_id'] = department_id
+    ProductivityRollup.objects.update_or_create(defaults=values, **lookup)
+
+
+@transaction.atomic
+def refresh_productivity_rollups(employee_id, day, department_id=None):
+    """
+    Recalcula de forma incremental los agregados afectados por un DailyWorkLog
+
+    Solo se tocan los períodos (día, semana y mes) que contienen la fecha,
+    tanto del empleado como de su departamento.
+    """
+    if department_id is None:
+        department_id = Employee.objects.filter(pk=employee_id).values_list(
+            'position__department_id', flat=True
+        ).first()
+
+    log = DailyWorkLog.objects.active().filter(employee_id=employee_id, date=day).first()
+    day_values = _with_averages(_log_rollup_values(log)) if log else None
+    _store_rollup('day', day, employee_id, department_id, day_values)
+
+    employee_days = ProductivityRollup.objects.filter(
+        period='day', employee_id=employee_id
+    )
+    for period in ['week', 'month']:
+        start, end = period_bounds(period, day)
+        values = _aggregate_day_rows(
+            employee_days.filter(period_start__gte=start, period_start__lt=end)
+        )
+        _store_rollup(period, start, employee_id, department_id, values)
+
+    if department_id is None:
+        return
+
+    department_days = ProductivityRollup.objects.filter(
+        period='day', department_id=department_id, employee__isnull=False
+    )
+    for period in ROLLUP_PERIODS:
+        start, end = period_bounds(period, day)
+        values = _aggregate_day_rows(
+            department_days.filter(period_start__gte=start, period_start__lt=end)
+        )
+        _store_rollup(period, start, None, department_id, values)
+
+
+def _rollup_ranges(start_date, end_date):
+    """
+    Retorna el rango [inicio, fin) de cada período que cubre las fechas
+    indicadas: los días del rango y las semanas y meses completos que lo
+    contienen, cada uno alineado a los límites de sus propios períodos
+    """
+    return {
+        period: (period_bounds(period, start_date)[0], period_bounds(period, end_date)[1])
+        for period in ROLLUP_PERIODS
+    }
+
+
+@transaction.atomic
+def rebuild_productivity_rollups(start_date, end_date, chunk_size=2000):
+    """
+    Reconstruye todos los agregados de productividad para un rango de fechas
+
+    Los agregados semanales y mensuales se reemplazan para las semanas y
+    meses completos que contienen el rango, y se recalculan desde los
+    agregados diarios de la unión de esos rangos, que se reconstruyen antes
+    desde DailyWorkLog. Como cada período se elimina y se agrupa por sus
+    propios límites, ninguna semana o mes queda a medio recalcular.
+    Lanza ArchivedRangeError, sin modificar los agregados, si esos períodos
+    incluyen meses archivados: sus agregados se reemplazarían por vacíos.
+    """
+    ranges = _rollup_ranges(start_date, end_date)
+    start = min(period_start for period_start, _ in ranges.values())
+    end = max(period_end for _, period_end in ranges.values())
+    check_archived_range(DailyWorkLog, start, end - timedelta(days=1))
+
+    ProductivityRollup.objects.filter(
+        period='day', period_start__gte=start, period_start__lt=end
+    ).delete()
+    for period in ['week', 'month']:
+        period_start, period_end = ranges[period]
+        ProductivityRollup.objects.filter(
+            period=period, period_start__gte=period_start, period_start__lt=period_end
+        ).delete()
+
+    logs = DailyWorkLog.objects.active().filter(
+        date__gte=start, date__lt=end
+    ).select_related('employee__position').order_by()
+
+    batch = []
+    for log in logs.iterator(chunk_size=chunk_size):
+        position = log.employee.position
+        batch.append(ProductivityRollup(
+            period='day',
+            period_start=log.date,
+            employee_id=log.employee_id,
+            department_id=position.department_id if position else None,
+            **_with_averages(_log_rollup_values(log))
+        ))
+        if len(batch) >= chunk_size:
+            ProductivityRollup.objects.bulk_create(batch)
+            batch = []
+    ProductivityRollup.objects.bulk_create(batch)
+
+    ranges['day'] = (start, end)
+    day_rows = ProductivityRollup.objects.filter(period='day', employee__isnull=False).order_by()
+    for period, key in ROLLUP_GROUPINGS:
+        period_start, period_end = ranges[period]
+        ProductivityRollup.objects.bulk_create(
+            _grouped_rollups(
+                period, key,
+                day_rows.filter(period_start__gte=period_start, period_start__lt=period_end),
+                chunk_size=chunk_size,
+            ),
+            batch_size=chunk_size,
+        )
+
+
+def ingest_daily_work_logs(stream, file_format, batch_size=2000):
+    """
+    Carga masiva de DailyWorkLog desde NDJSON o CSV
+
+    Cada fila identifica al empleado por su código (columna employee). Las
+    filas válidas se insertan o actualizan por la clave única (employee, date)
+    y las inválidas se reportan sin abortar el lote. Como bulk_create no
+    emite señales, se refrescan aquí los agregados y el índice de búsqueda
+    de las notas.
+    """
+    rows, read_errors = read_rows(stream, file_format)
+    row_errors = {}
+    employee_ids = resolve_lookup(
+        rows, 'employee', Employee.objects.all(), 'employee_id', row_errors, 'Empleado'
+    )
+    cleaned = clean_columns(DailyWorkLog, rows, DAILY_WORK_LOG_INGEST_FIELDS, row_errors)
+
+    # Una fila posterior con la misma clave reemplaza a la anterior
+    latest = {}
+    for (number, _), employee_id, values in zip(rows, employee_ids, cleaned):
+        if number in row_errors:
+            continue
+        key = (employee_id, values['date'])
+        if key in latest:
+            row_errors[latest[key][0]] = {
+                '__all__': ['Reemplazada por una fila posterior con el mismo empleado y fecha']
+            }
+        latest[key] = (number, DailyWorkLog(employee_id=employee_id, **values))
+
+    logs = [log for _, log in latest.values()]
+    with transaction.atomic():
+        DailyWorkLog.objects.bulk_create(
+            logs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['employee', 'date'],
+            # is_active no se modifica: una fila dada de baja sigue inactiva
+            update_fields=DAILY_WORK_LOG_INGEST_FIELDS + ['updated_at'],
+        )
+        refresh_rollups_for_keys(latest.keys())
+        index_queryset('work_log', DailyWorkLog.objects.filter(_log_keys_q(_keys_by_day(latest))), batch_size)
+
+    return build_report(len(rows) + len(read_errors), len(logs), row_errors, read_errors)
+
+
+def _keys_by_day(keys):
+    """Agrupa pares (empleado, fecha) en un diccionario fecha -> empleados"""
+    by_day = {}
+    for employee_id, day in keys:
+        by_day.setdefault(day, set()).add(employee_id)
+    return by_day
+
+
+def _log_keys_q(by_day):
+    """
+    Condición OR sobre los registros diarios de un diccionario fecha ->
+    empleados
+    """
+    condition = Q(pk__in=[])
+    for day, employee_ids in by_day.items():
+        condition |= Q(date=day, employee_id__in=employee_ids)
+    return condition
+
+
+def _bucket_q(buckets, period, key):
+    """
+    Condición OR sobre los períodos indicados: buckets es un diccionario
+    inicio de período -> ids de key (empleado o departamento)
+    """
+    condition = Q()
+    for start, ids in buckets.items():
+        end = period_bounds(period, start)[1]
+        condition |= Q(period_start__gte=start, period_start__lt=end, **{f'{key}__in': ids})
+    return condition
+
+
+@transaction.atomic
+def refresh_rollup_buckets(keys, chunk_size=2000):
+    """
+    Recalcula los agregados de los pares (empleado, fecha) indicados y de
+    las semanas, meses y departamentos que los contienen
+
+    Solo se reemplazan esos períodos: los agregados diarios se leen de
+    DailyWorkLog y los demás se agrupan desde los diarios, con un número
+    fijo de consultas independiente de la cantidad de pares.
+    """
+    by_day = _keys_by_day(keys)
+    if not by_day:
+        return
+
+    log_keys = _log_keys_q(by_day)
+    day_buckets = {day: employee_ids for day, employee_ids in by_day.items()}
+    employee_days = ProductivityRollup.objects.filter(
+        _bucket_q(day_buckets, 'day', 'employee_id'), period='day'
+    )
+
+    # Departamentos anteriores y actuales (un empleado pudo cambiar de posición)
+    department_ids = set(employee_days.exclude(department__isnull=True).values_list('department_id', flat=True))
+    employee_days.delete()
+    created = []
+    for log in DailyWorkLog.objects.active().filter(log_keys).select_related('employee__position').order_by():
+        position = log.employee.position
+        created.append(ProductivityRollup(
+            period='day',
+            period_start=log.date,
+            employee_id=log.employee_id,
+            department_id=position.department_id if position else None,
+            **_with_averages(_log_rollup_values(log))
+        ))
+    ProductivityRollup.objects.bulk_create(created, batch_size=chunk_size)
+    department_ids.update(row.department_id for row in created if row.department_id is not None)
+
+    day_rows = ProductivityRollup.objects.filter(period='day', employee__isnull=False).order_by()
+    for period, key in ROLLUP_GROUPINGS:
+        buckets = {}
+        for day, employee_ids in by_day.items():
+            ids = employee_ids if key == 'employee_id' else department_ids
+            if ids:
+                buckets.setdefault(period_bounds(period, day)[0], set()).update(ids)
+        if not buckets:
+            continue
+        rows = ProductivityRollup.objects.filter(_bucket_q(buckets, period, key), period=period)
+        if key == 'department_id':
+            rows = rows.filter(employee__isnull=True)
+        rows.delete()
+        ProductivityRollup.objects.bulk_create(
+            _grouped_rollups(period, key, day_rows.filter(_bucket_q(buckets, period, key)), chunk_size),
+            batch_size=chunk_size,
+        )
+
+
+def refresh_rollups_for_keys(keys):
+    """
+    Refresca los agregados afectados por escrituras masivas que omiten señales
+    """
+    refresh_rollup_buckets(keys)
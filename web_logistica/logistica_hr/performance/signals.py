@@ -0,0 +1,118 @@
+"""
+Señales para la aplicación performance
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from logistica_hr.tasks.models import Task
+from logistica_hr.tasks.signals import tasks_assigned
+from .cache import invalidate_dashboard_summaries, invalidate_dashboard_summary
+from .models import DailyWorkLog, PerformanceMetric, ScoreRecomputeJob
+from .scoring import SCORE_DEPENDENCY_FIELDS
+from .services import refresh_productivity_rollups
+from .tasks import recompute_metric_scores
+
+
+@receiver(pre_save, sender=DailyWorkLog)
+def remember_previous_work_log_key(sender, instance, **kwargs):
+    """
+    Guarda el empleado y la fecha anteriores para refrescar el período antiguo
+    """
+    instance._previous_rollup_key = None
+    if instance.pk:
+        instance._previous_rollup_key = sender.objects.filter(pk=instance.pk).values_list(
+            'employee_id', 'date'
+        ).first()
+
+
+@receiver(post_save, sender=DailyWorkLog)
+def update_rollups_on_work_log_save(sender, instance, raw=False, **kwargs):
+    """
+    Actualiza los agregados de productividad al guardar un registro diario
+    """
+    if raw:
+        return
+    previous = getattr(instance, '_previous_rollup_key', None)
+    current = (instance.employee_id, instance.date)
+    refresh_productivity_rollups(*current)
+    if previous and previous != current:
+        refresh_productivity_rollups(*previous)
+
+
+@receiver(post_delete, sender=DailyWorkLog)
+def update_rollups_on_work_log_delete(sender, instance, **kwargs):
+    """
+    Actualiza los agregados de productividad al eliminar un registro diario
+    """
+    refresh_productivity_rollups(instance.employee_id, instance.date)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_dashboard_on_task_change(sender, instance, raw=False, **kwargs):
+    """
+    Invalida el resumen del dashboard al modificar una tarea
+    """
+    if raw:
+        return
+    invalidate_dashboard_summary(instance.assigned_to_id)
+
+
+@receiver(tasks_assigned)
+def invalidate_dashboard_on_task_assignment(sender, employee_ids, **kwargs):
+    """
+    Invalida los resúmenes del dashboard de los empleados con tareas
+    asignadas automáticamente
+    """
+    invalidate_dashboard_summaries(employee_ids)
+
+
+@receiver(post_save, sender=DailyWorkLog)
+@receiver(post_delete, sender=DailyWorkLog)
+def invalidate_dashboard_on_work_log_change(sender, instance, raw=False, **kwargs):
+    """
+    Invalida el resumen del dashboard al modificar un registro diario
+    """
+    if raw:
+        return
+    invalidate_dashboard_summary(instance.employee_id)
+
+
+@receiver(pre_save, sender=PerformanceMetric)
+def remember_previous_metric_values(sender, instance, **kwargs):
+    """
+    Guarda los valores anteriores de los campos de los que dependen los puntajes
+    """
+    instance._previous_score_values = None
+    if instance.pk:
+        instance._previous_score_values = sender.objects.filter(pk=instance.pk).values(
+            *SCORE_DEPENDENCY_FIELDS
+        ).first()
+
+
+@receiver(post_save, sender=PerformanceMetric)
+def enqueue_recompute_on_metric_change(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Encola el recálculo de evaluaciones si cambió el objetivo, el mínimo o
+    el peso de la métrica
+    """
+    previous = getattr(instance, '_previous_score_values', None)
+    if raw or created or not previous:
+        return
+    changed = [
+        field for field in SCORE_DEPENDENCY_FIELDS
+        if previous[field] != sender._meta.get_field(field).to_python(getattr(instance, field))
+    ]
+    if not changed:
+        return
+
+    # Un recálculo aún pendiente de la misma métrica cubre el nuevo cambio
+    job = ScoreRecomputeJob.objects.filter(metric=instance, status='pending').first()
+    if job is not None:
+        job.changed_fields = sorted(set(job.changed_fields) | set(changed))
+        job.save(update_fields=['changed_fields', 'updated_at'])
+        return
+    job = ScoreRecomputeJob.objects.create(metric=instance, changed_fields=changed)
+    transaction.on_commit(lambda: recompute_metric_scores.delay(job.pk))
@@ -0,0 +1,69 @@
+"""
+Tareas de Celery para la aplicación performance
+"""
+
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+
+from .attendance import reconcile_attendance
+from .models import ScoreRecomputeJob
+from .scoring import evaluations_depending_on_metric, rescore_evaluations
+
+logger = logging.getLogger(__name__)
+
+RECOMPUTE_CHUNK_SIZE = 500
+
+
+@shared_task
+def recompute_metric_scores(job_id, chunk_size=RECOMPUTE_CHUNK_SIZE):
+    """
+    Recalcula por bloques las evaluaciones afectadas por el cambio de una
+    métrica, registrando el avance en ScoreRecomputeJob
+    """
+    job = ScoreRecomputeJob.objects.filter(pk=job_id, status='pending').first()
+    if job is None:
+        return 0
+
+    affected = evaluations_depending_on_metric(job.metric_id)
+    job.status = 'running'
+    job.started_at = timezone.now()
+    job.total_evaluations = affected.count()
+    job.save(update_fields=['status', 'started_at', 'total_evaluations', 'updated_at'])
+
+    last_pk = 0
+    try:
+        while True:
+            chunk = list(affected.filter(pk__gt=last_pk).order_by('pk')[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+            job.processed_evaluations += rescore_evaluations(chunk)
+            job.save(update_fields=['processed_evaluations', 'updated_at'])
+    except Exception as exc:
+        logger.exception('Error recalculando puntajes de la métrica %s', job.metric_id)
+        job.status = 'failed'
+        job.error_message = str(exc)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error_message', 'finished_at', 'updated_at'])
+        raise
+
+    job.status = 'completed'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at', 'updated_at'])
+    return job.processed_evaluations
+
+
+@shared_task
+def reconcile_attendance_incremental():
+    """
+    Tarea periódica que concilia la asistencia de los días pendientes
+    """
+    run = reconcile_attendance()
+    if run.exceptions_found:
+        logger.info(
+            'Conciliación de asistencia: %s días, %s excepciones',
+            run.days_reconciled, run.exceptions_found
+        )
+    return run.exceptions_found
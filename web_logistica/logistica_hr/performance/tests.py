@@ -0,0 +1,593 @@
+"""
+Pruebas para la aplicación performance
+"""
+
+import json
+import tempfile
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from logistica_hr import celery_app
+from logistica_hr.core import partitioning
+
+from logistica_hr.employees.models import Department, Employee, Position, WorkSchedule
+from .attendance import pending_dates, reconcile_attendance, reconcile_dates
+from .models import (
+    AttendanceException, AttendanceReconciliationRun, DailyWorkLog, EmployeePerformance, PerformanceEvaluation,
+    PerformanceMetric, ProductivityRollup, ScoreRecomputeJob
+)
+from .scoring import compute_overall_scores, overall_score_from_records, rescore_evaluations, score_evaluation_period
+from .tasks import recompute_metric_scores
+from .timeseries import choose_bucket, performance_series
+from .services import ingest_daily_work_logs, rebuild_productivity_rollups, refresh_rollup_buckets
+
+
+def create_employee(code, position):
+    """Crea un empleado con su usuario"""
+    user = get_user_model().objects.create(username=f'user_{code}')
+    return Employee.objects.create(
+        user=user, employee_id=code, position=position, hire_date=date(2020, 1, 1)
+    )
+
+
+def create_log(employee, day, packages=10, **values):
+    """Crea un registro diario de 8 a 16 con media hora de descanso"""
+    values.setdefault('start_time', time(8))
+    values.setdefault('end_time', time(16))
+    values.setdefault('total_break_time', timedelta(minutes=30))
+    return DailyWorkLog.objects.create(
+        employee=employee, date=day, packages_processed=packages, **values
+    )
+
+
+def rollup_snapshot():
+    """Agregados existentes como conjunto comparable"""
+    return set(ProductivityRollup.objects.values_list(
+        'period', 'period_start', 'employee_id', 'department_id',
+        'log_count', 'packages_processed', 'total_work_time',
+    ))
+
+
+class AnnotationParityTests(TestCase):
+    """
+    Las anotaciones with_*() deben coincidir con sus propiedades, incluidos
+    los valores nulos, cero y los turnos nocturnos o negativos
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name='Bodega')
+        position = Position.objects.create(name='Operario', department=department)
+        cls.employee = create_employee('E1', position)
+
+    def test_total_work_time(self):
+        cases = [
+            (time(8), time(16), timedelta(minutes=30)),
+            (time(8), time(16), timedelta(0)),
+            (time(22), time(6), timedelta(minutes=45)),
+            (time(9), time(9), timedelta(0)),
+            (time(10), time(11), timedelta(hours=2)),
+            (time(23, 30), time(0, 15), timedelta(hours=1)),
+        ]
+        day = date(2024, 3, 1)
+        for start, end, break_time in cases:
+            create_log(self.employee, day, start_time=start, end_time=end, total_break_time=break_time)
+            day += timedelta(days=1)
+        logs = list(DailyWorkLog.objects.with_total_work_time())
+        self.assertEqual(len(logs), len(cases))
+        for log in logs:
+            with self.subTest(start=log.start_time, end=log.end_time, break_time=log.total_break_time):
+                self.assertEqual(log.total_work_time_db, log.total_work_time)
+
+    def test_performance_score(self):
+        values = [None, Decimal('0'), Decimal('50'), Decimal('100')]
+        metrics = [
+            PerformanceMetric.objects.create(
+                name=f'Métrica {index}', metric_type='productivity', unit='u',
+                target_value=target, min_value=minimum,
+            )
+            for index, (target, minimum) in enumerate(
+                (target, minimum) for target in values for minimum in values
+            )
+        ]
+        day = date(2024, 3, 1)
+        for actual in [Decimal('0'), Decimal('25'), Decimal('75'), Decimal('120')]:
+            for metric in metrics:
+                EmployeePerformance.objects.create(
+                    employee=self.employee, date=day, metric=metric, actual_value=actual
+                )
+            day += timedelta(days=1)
+        for record in EmployeePerformance.objects.select_related('metric').with_performance_score():
+            metric = record.metric
+            with self.subTest(actual=record.actual_value, target=metric.target_value, minimum=metric.min_value):
+                if metric.min_value is None and metric.target_value and record.actual_value < metric.target_value:
+                    # La propiedad falla sin valor mínimo bajo el objetivo
+                    # (documentado en with_performance_score)
+                    with self.assertRaises(TypeError):
+                        record.performance_score
+                    self.assertIsNone(record.performance_score_db)
+                elif record.performance_score is None:
+                    self.assertIsNone(record.performance_score_db)
+                else:
+                    self.assertAlmostEqual(record.performance_score_db, float(record.performance_score))
+
+
+class OverallScoreParityTests(TestCase):
+    """
+    compute_overall_scores debe coincidir con overall_score_from_records,
+    incluidos objetivos y mínimos nulos o cero y métricas con peso cero
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(name='Operario', department=Department.objects.create(name='Bodega'))
+        cls.employees = [create_employee(f'E{index}', position) for index in range(6)]
+        limits = [None, Decimal('0'), Decimal('40'), Decimal('100')]
+        metrics = [
+            PerformanceMetric.objects.create(
+                name=f'Métrica {index}', metric_type='productivity', unit='u',
+                target_value=target, min_value=minimum, weight=weight,
+            )
+            for index, (target, minimum, weight) in enumerate(
+                (target, minimum, weight)
+                for target in limits for minimum in limits for weight in [Decimal('0'), Decimal('1.5')]
+            )
+        ]
+        actual_values = [Decimal('0'), Decimal('25'), Decimal('63'), Decimal('100'), Decimal('140')]
+        records = []
+        for position_index, employee in enumerate(cls.employees):
+            # Cada empleado tiene registros de un subconjunto distinto de métricas
+            for metric_index, metric in enumerate(metrics):
+                if (metric_index + position_index) % 3 == 0:
+                    continue
+                for day in range(3):
+                    records.append(EmployeePerformance(
+                        employee=employee, metric=metric, date=date(2024, 3, 1) + timedelta(days=day),
+                        actual_value=actual_values[(metric_index + day + position_index) % len(actual_values)],
+                    ))
+        EmployeePerformance.objects.bulk_create(records)
+        # Un empleado solo con métricas de peso cero no tiene puntaje
+        cls.zero_weight = create_employee('E-cero', position)
+        EmployeePerformance.objects.create(
+            employee=cls.zero_weight, metric=metrics[-2], date=date(2024, 3, 1), actual_value=Decimal('50')
+        )
+
+    def test_matches_reference(self):
+        start, end = date(2024, 3, 1), date(2024, 3, 2)
+        scores = compute_overall_scores(start, end)
+        self.assertEqual(set(scores), {employee.pk for employee in self.employees + [self.zero_weight]})
+        for employee_id, score in scores.items():
+            records = EmployeePerformance.objects.filter(
+                employee_id=employee_id, date__gte=start, date__lte=end
+            ).select_related('metric')
+            with self.subTest(employee=employee_id):
+                self.assertEqual(score, overall_score_from_records(records))
+        self.assertIsNone(scores[self.zero_weight.pk])
+        self.assertTrue(all(scores[employee.pk] is not None for employee in self.employees))
+        self.assertEqual(compute_overall_scores(start, end, employee_ids=[self.employees[0].pk]),
+                         {self.employees[0].pk: scores[self.employees[0].pk]})
+
+
+class MetricRecomputeTests(TestCase):
+    """
+    Editar el objetivo, mínimo o peso de una métrica encola un solo
+    recálculo que actualiza solo las evaluaciones con registros de ella
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(name='Operario', department=Department.objects.create(name='Bodega'))
+        cls.metric, cls.other_metric = [
+            PerformanceMetric.objects.create(
+                name=name, metric_type='productivity', unit='u',
+                target_value=Decimal('100'), min_value=Decimal('0'), weight=Decimal('1'),
+            )
+            for name in ['Paquetes', 'Camiones']
+        ]
+        cls.employees = [create_employee(f'E{index}', position) for index in range(3)]
+        for employee, metric, day in [
+            (cls.employees[0], cls.metric, date(2024, 3, 5)),
+            (cls.employees[0], cls.other_metric, date(2024, 3, 6)),
+            (cls.employees[1], cls.other_metric, date(2024, 3, 5)),
+            (cls.employees[2], cls.metric, date(2024, 4, 5)),
+        ]:
+            EmployeePerformance.objects.create(employee=employee, metric=metric, date=day, actual_value=Decimal('80'))
+        score_evaluation_period(date(2024, 3, 1), date(2024, 3, 31), 'monthly')
+        score_evaluation_period(date(2024, 4, 1), date(2024, 4, 30), 'monthly')
+
+    def setUp(self):
+        self.addCleanup(setattr, celery_app.conf, 'task_always_eager', celery_app.conf.task_always_eager)
+        celery_app.conf.task_always_eager = True
+
+    def evaluation(self, employee, month):
+        return PerformanceEvaluation.objects.get(employee=employee, start_date=date(2024, month, 1))
+
+    def test_metric_edit_recomputes_affected_evaluations(self):
+        affected = {self.evaluation(self.employees[0], 3).pk, self.evaluation(self.employees[2], 4).pk}
+        untouched = self.evaluation(self.employees[1], 3)
+        with mock.patch.object(recompute_metric_scores, 'delay', wraps=recompute_metric_scores.delay) as delay, \
+                mock.patch('logistica_hr.performance.tasks.rescore_evaluations', wraps=rescore_evaluations) as rescore:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.metric.target_value = Decimal('160')
+                self.metric.save()
+                # Un segundo cambio antes del recálculo se suma al mismo trabajo
+                self.metric.weight = Decimal('3')
+                self.metric.save()
+                self.metric.name = 'Paquetes procesados'
+                self.metric.save()
+
+        delay.assert_called_once()
+        job = ScoreRecomputeJob.objects.get()
+        self.assertEqual((job.status, job.total_evaluations, job.processed_evaluations), ('completed', 2, 2))
+        self.assertEqual(job.changed_fields, ['target_value', 'weight'])
+        rescored = {evaluation.pk for call in rescore.call_args_list for evaluation in call.args[0]}
+        self.assertEqual(rescored, affected)
+
+        # 80 de 160 es 50; promedio ponderado con la otra métrica (80): (50 * 3 + 80) / 4
+        self.assertEqual(self.evaluation(self.employees[0], 3).overall_score, Decimal('57.50'))
+        self.assertEqual(self.evaluation(self.employees[2], 4).overall_score, Decimal('50.00'))
+        refreshed = self.evaluation(self.employees[1], 3)
+        self.assertEqual((refreshed.overall_score, refreshed.updated_at), (untouched.overall_score, untouched.updated_at))
+
+
+class ProductivityRollupRebuildTests(TestCase):
+    """
+    La reconstrucción por rango debe dejar los mismos agregados que el
+    cálculo incremental de las señales, incluidas las semanas y meses que
+    cruzan los bordes del rango
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name='Bodega')
+        position = Position.objects.create(name='Operario', department=department)
+        cls.employees = [create_employee(f'E{index}', position) for index in range(2)]
+        # Enero a abril de 2024: semanas que cruzan los cambios de mes
+        day = date(2024, 1, 20)
+        while day <= date(2024, 4, 10):
+            for index, employee in enumerate(cls.employees):
+                create_log(employee, day, packages=day.day + index)
+            day += timedelta(days=1)
+
+    def assert_rebuild_matches(self, start_date, end_date):
+        expected = rollup_snapshot()
+        rebuild_productivity_rollups(start_date, end_date)
+        self.assertEqual(rollup_snapshot(), expected)
+
+    def test_mid_week_range(self):
+        # 2024-03-15 es viernes; la semana del 2024-02-26 cruza el inicio de marzo
+        self.assert_rebuild_matches(date(2024, 3, 15), date(2024, 3, 20))
+
+    def test_range_ending_on_sunday_at_month_end(self):
+        self.assert_rebuild_matches(date(2024, 3, 25), date(2024, 3, 31))
+
+    def test_month_end_keeps_following_month(self):
+        # La semana del 2024-01-29 llega a febrero, cuyo agregado mensual no
+        # se debe recalcular con solo esos días
+        self.assert_rebuild_matches(date(2024, 1, 25), date(2024, 1, 31))
+
+    def test_rebuild_restores_deleted_rollups(self):
+        expected = rollup_snapshot()
+        ProductivityRollup.objects.all().delete()
+        rebuild_productivity_rollups(date(2024, 1, 1), date(2024, 4, 30))
+        self.assertEqual(rollup_snapshot(), expected)
+
+    def test_inactive_logs_are_excluded(self):
+        employee, day = self.employees[0], date(2024, 3, 15)
+        log = DailyWorkLog.objects.get(employee=employee, date=day)
+        log.is_active = False
+        log.save()
+        self.assertFalse(ProductivityRollup.objects.filter(period='day', employee=employee, period_start=day).exists())
+        expected = rollup_snapshot()
+        refresh_rollup_buckets([(employee.pk, day)])
+        self.assertEqual(rollup_snapshot(), expected)
+        self.assert_rebuild_matches(date(2024, 3, 1), date(2024, 3, 31))
+
+    def test_archived_months_are_not_rebuilt(self):
+        expected = rollup_snapshot()
+        # La semana del 2024-01-29 llega a febrero, que está archivado
+        with mock.patch.object(partitioning, 'archived_months_in_range', return_value=[date(2024, 2, 1)]) as months:
+            with self.assertRaises(partitioning.ArchivedRangeError):
+                rebuild_productivity_rollups(date(2024, 1, 29), date(2024, 1, 31))
+            with self.assertRaisesMessage(CommandError, '2024-02'):
+                call_command(
+                    'rebuild_productivity_rollups', start=date(2024, 1, 29), end=date(2024, 1, 31),
+                    stdout=mock.MagicMock(),
+                )
+        months.assert_called_with(DailyWorkLog, date(2024, 1, 1), date(2024, 2, 4))
+        self.assertEqual(rollup_snapshot(), expected)
+
+
+class DailyWorkLogIngestRollupTests(TestCase):
+    """
+    La carga masiva refresca solo los períodos que toca, con los mismos
+    resultados que una reconstrucción completa
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        departments = [Department.objects.create(name=name) for name in ['Bodega', 'Despacho']]
+        positions = [
+            Position.objects.create(name='Operario', department=department) for department in departments
+        ]
+        cls.employees = [create_employee(f'E{index:03d}', positions[index % 2]) for index in range(40)]
+        for employee in cls.employees:
+            for day in [date(2024, 2, 10), date(2024, 2, 28), date(2024, 3, 4)]:
+                create_log(employee, day)
+
+    def ingest(self, days, packages):
+        payload = '\n'.join(
+            json.dumps({
+                'employee': employee.employee_id, 'date': day.isoformat(),
+                'start_time': '07:00', 'end_time': '15:00', 'total_break_time': '00:45:00',
+                'packages_processed': packages,
+            })
+            for employee in self.employees for day in days
+        )
+        return ingest_daily_work_logs(payload, 'ndjson')
+
+    def test_large_batch_matches_full_rebuild(self):
+        # 120 pares: nuevos días y actualizaciones en una semana que cruza de mes
+        self.ingest([date(2024, 2, 28), date(2024, 3, 1), date(2024, 3, 2)], packages=25)
+
+        refreshed = rollup_snapshot()
+        rebuild_productivity_rollups(date(2024, 1, 1), date(2024, 3, 31))
+        self.assertEqual(refreshed, rollup_snapshot())
+
+    def test_untouched_periods_are_not_rewritten(self):
+        untouched = set(ProductivityRollup.objects.filter(
+            period_start__lt=date(2024, 2, 26)
+        ).values_list('pk', flat=True))
+        self.ingest([date(2024, 3, 1), date(2024, 3, 2)], packages=25)
+        # Los días, semanas y departamentos anteriores a la semana del 1 de
+        # marzo conservan sus filas (febrero no cambia: solo hay días de marzo)
+        self.assertEqual(
+            set(ProductivityRollup.objects.filter(period_start__lt=date(2024, 2, 26)).values_list('pk', flat=True)),
+            untouched,
+        )
+
+    def test_ingest_keeps_soft_deleted_rows_inactive(self):
+        log = DailyWorkLog.objects.get(employee=self.employees[0], date=date(2024, 2, 28))
+        DailyWorkLog.objects.filter(pk=log.pk).update(is_active=False)
+        report = self.ingest([date(2024, 2, 28)], packages=77)
+        self.assertEqual(report['errors'], [])
+        log.refresh_from_db()
+        self.assertFalse(log.is_active)
+        self.assertEqual(log.packages_processed, 77)
+
+
+class ArchivedRangeTests(TestCase):
+    """
+    Las consultas sobre meses archivados responden 409 sin restaurarlos, y
+    la restauración explícita exige un rango cerrado y acotado
+    """
+
+    def setUp(self):
+        self.client.force_login(get_user_model().objects.create(username='admin', is_staff=True))
+
+    def test_series_over_archived_months_returns_conflict(self):
+        with mock.patch.object(
+            partitioning, 'archived_months_in_range', return_value=[date(2023, 1, 1)]
+        ), mock.patch.object(partitioning, 'restore_partition') as restore:
+            response = self.client.get(
+                reverse('performance:performance-series'), {'start': '2023-01-01', 'end': '2023-02-28'}
+            )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['archived_months'], ['2023-01'])
+        restore.assert_not_called()
+
+    def test_restore_rejects_open_and_wide_ranges(self):
+        with self.assertRaises(ValueError):
+            partitioning.restore_archived_range(DailyWorkLog, None, date(2023, 3, 1))
+        with self.assertRaises(ValueError):
+            partitioning.restore_archived_range(DailyWorkLog, date(2023, 1, 1), None)
+        with self.assertRaises(ValueError):
+            partitioning.restore_archived_range(DailyWorkLog, date(2022, 1, 1), date(2023, 3, 1), max_months=12)
+
+    def test_recently_restored_months_are_held(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            PARTITION_ARCHIVE_DIR=directory, PARTITION_RESTORE_HOLD_DAYS=30
+        ):
+            month = date(2023, 1, 1)
+            manifest_path = partitioning._archive_paths(DailyWorkLog, month)[1]
+            self.assertFalse(partitioning.recently_restored(DailyWorkLog, month))
+            restored_at = timezone.now() - timedelta(days=10)
+            manifest_path.write_text(json.dumps({'restored_at': restored_at.isoformat()}))
+            self.assertTrue(partitioning.recently_restored(DailyWorkLog, month))
+            self.assertFalse(partitioning.recently_restored(
+                DailyWorkLog, month, now=restored_at + timedelta(days=31)
+            ))
+
+
+@override_settings(ATTENDANCE_GRACE_MINUTES=5, ATTENDANCE_INITIAL_DAYS=3)
+class AttendanceReconciliationTests(TestCase):
+    """
+    Llegadas tardías, salidas anticipadas e inasistencias, incluidos los
+    turnos nocturnos, y las fechas de la ejecución incremental
+    """
+
+    # 2024-03-04 es lunes
+    MONDAY = date(2024, 3, 4)
+
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(name='Operario', department=Department.objects.create(name='Bodega'))
+        cls.day_shift, cls.night_shift, cls.absent, cls.new_hire = [
+            create_employee(code, position) for code in ['DIA', 'NOCHE', 'AUSENTE', 'NUEVO']
+        ]
+        Employee.objects.filter(pk=cls.new_hire.pk).update(hire_date=cls.MONDAY + timedelta(days=1))
+        for employee, day_of_week, start, end in [
+            (cls.day_shift, 0, time(8), time(16)),
+            (cls.day_shift, 1, time(8), time(16)),
+            (cls.night_shift, 0, time(22), time(6)),
+            (cls.night_shift, 1, time(22), time(6)),
+            (cls.night_shift, 2, time(23, 50), time(7)),
+            (cls.night_shift, 3, time(22), time(6)),
+            (cls.absent, 0, time(8), time(16)),
+            (cls.new_hire, 0, time(8), time(16)),
+        ]:
+            WorkSchedule.objects.create(employee=employee, day_of_week=day_of_week, start_time=start, end_time=end)
+
+        monday = cls.MONDAY
+        create_log(cls.day_shift, monday, start_time=time(8, 20), end_time=time(15, 50))
+        # Dentro de la tolerancia
+        create_log(cls.day_shift, monday + timedelta(days=1), start_time=time(8, 5), end_time=time(15, 55))
+        # Llega antes y sale después del turno nocturno: sin excepciones
+        create_log(cls.night_shift, monday, start_time=time(21, 50), end_time=time(6, 30))
+        create_log(cls.night_shift, monday + timedelta(days=1), start_time=time(22, 10), end_time=time(5, 30))
+        # El atraso cruza la medianoche
+        create_log(cls.night_shift, monday + timedelta(days=2), start_time=time(0, 10), end_time=time(7))
+        # Un registro inactivo cuenta como inasistencia
+        log = create_log(cls.night_shift, monday + timedelta(days=3), start_time=time(22), end_time=time(6))
+        DailyWorkLog.objects.filter(pk=log.pk).update(is_active=False)
+
+    def exceptions(self):
+        return set(AttendanceException.objects.values_list('employee__employee_id', 'date', 'exception_type', 'minutes'))
+
+    def test_reconcile_dates(self):
+        monday = self.MONDAY
+        found = reconcile_dates([monday + timedelta(days=offset) for offset in range(4)])
+        expected = {
+            ('DIA', monday, 'late_arrival', 20),
+            ('DIA', monday, 'early_exit', 10),
+            ('AUSENTE', monday, 'missing_day', 480),
+            ('NOCHE', monday + timedelta(days=1), 'late_arrival', 10),
+            ('NOCHE', monday + timedelta(days=1), 'early_exit', 30),
+            ('NOCHE', monday + timedelta(days=2), 'late_arrival', 20),
+            ('NOCHE', monday + timedelta(days=3), 'missing_day', 480),
+        }
+        self.assertEqual(self.exceptions(), expected)
+        self.assertEqual(found, len(expected))
+
+        # Conciliar de nuevo reemplaza las excepciones de esas fechas
+        create_log(self.absent, monday)
+        reconcile_dates([monday])
+        self.assertEqual(self.exceptions(), expected - {('AUSENTE', monday, 'missing_day', 480)})
+
+    def test_pending_dates(self):
+        monday = self.MONDAY
+        today = monday + timedelta(days=5)
+        self.assertEqual(pending_dates(None, today), [monday + timedelta(days=offset) for offset in [2, 3, 4]])
+
+        started_at = timezone.now()
+        last_run = AttendanceReconciliationRun.objects.create(
+            status='completed', started_at=started_at, reconciled_through=monday + timedelta(days=2)
+        )
+        DailyWorkLog.objects.update(updated_at=started_at - timedelta(hours=1))
+        # Modificado después de la última ejecución: fecha ya conciliada
+        DailyWorkLog.objects.filter(employee=self.day_shift, date=monday).update(
+            updated_at=started_at + timedelta(minutes=1)
+        )
+        # Posterior a la fecha conciliada: ya entra por el rango de días
+        DailyWorkLog.objects.filter(date=monday + timedelta(days=3)).update(
+            updated_at=started_at + timedelta(minutes=1)
+        )
+        self.assertEqual(
+            pending_dates(last_run, today),
+            [monday, monday + timedelta(days=3), monday + timedelta(days=4)],
+        )
+
+    def test_incremental_runs(self):
+        monday = self.MONDAY
+        first = reconcile_attendance(today=monday + timedelta(days=2))
+        self.assertEqual((first.status, first.reconciled_through, first.days_reconciled),
+                         ('completed', monday + timedelta(days=1), 3))
+        self.assertEqual(first.exceptions_found, 5)
+
+        # Los días nuevos y el registro modificado del lunes
+        log = DailyWorkLog.objects.get(employee=self.day_shift, date=monday)
+        log.start_time = time(8)
+        log.save()
+        second = reconcile_attendance(today=monday + timedelta(days=4))
+        self.assertEqual((second.reconciled_through, second.days_reconciled), (monday + timedelta(days=3), 3))
+        self.assertNotIn(('DIA', monday, 'late_arrival', 20), self.exceptions())
+        self.assertIn(('DIA', monday, 'early_exit', 10), self.exceptions())
+        self.assertIn(('NOCHE', monday + timedelta(days=3), 'missing_day', 480), self.exceptions())
+
+
+class PerformanceSeriesTests(TestCase):
+    """
+    Elección del intervalo según el ancho, media móvil por serie y límite
+    de series
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        position = Position.objects.create(name='Operario', department=Department.objects.create(name='Bodega'))
+        cls.metric = PerformanceMetric.objects.create(
+            name='Paquetes', metric_type='productivity', unit='u', target_value=Decimal('100'), min_value=Decimal('0'),
+        )
+        cls.employees = [create_employee(f'E{index}', position) for index in range(5)]
+        for index, employee in enumerate(cls.employees):
+            for day, value in enumerate([10, 20, 30, 40, 50]):
+                EmployeePerformance.objects.create(
+                    employee=employee, metric=cls.metric, date=date(2024, 3, 4) + timedelta(days=day),
+                    actual_value=Decimal(value + index),
+                )
+        # Segundo mes para el intervalo mensual
+        EmployeePerformance.objects.create(
+            employee=cls.employees[0], metric=cls.metric, date=date(2024, 4, 2), actual_value=Decimal('90'),
+        )
+
+    def test_choose_bucket(self):
+        start = date(2024, 1, 1)
+        cases = [
+            (date(2024, 1, 31), 800, 'day'),
+            (date(2024, 12, 31), 800, 'week'),
+            (date(2024, 12, 31), 100, 'month'),
+            (date(2024, 12, 31), 40, 'quarter'),
+            (date(2033, 12, 31), 40, 'year'),
+            # Sin espacio ni para un punto por año se usa el intervalo mayor
+            (date(2033, 12, 31), 0, 'year'),
+        ]
+        for end, width, expected in cases:
+            with self.subTest(end=end, width=width):
+                self.assertEqual(choose_bucket(start, end, width), expected)
+
+    def test_moving_average_window(self):
+        result = performance_series(
+            date(2024, 3, 1), date(2024, 3, 31), group_by='employee', ids=[self.employees[0].pk], smoothing=3
+        )
+        self.assertEqual(result['bucket'], 'day')
+        [series] = result['series']
+        self.assertEqual(series['timestamps'][0], '2024-03-04')
+        self.assertEqual(series['avg'], [10, 20, 30, 40, 50])
+        self.assertEqual(series['moving_avg'], [10, 15, 20, 30, 40])
+
+        [series] = performance_series(
+            date(2024, 3, 1), date(2024, 3, 31), group_by='employee', ids=[self.employees[1].pk], smoothing=1
+        )['series']
+        self.assertEqual(series['moving_avg'], series['avg'])
+
+    def test_downsampled_buckets(self):
+        result = performance_series(date(2024, 3, 1), date(2024, 4, 30), group_by='total', width=12)
+        self.assertEqual(result['bucket'], 'month')
+        [series] = result['series']
+        self.assertEqual(series['timestamps'], ['2024-03-01', '2024-04-01'])
+        self.assertEqual(series['count'], [25, 1])
+        self.assertEqual(series['avg'], [32, 90])
+        self.assertEqual((series['min'], series['max']), ([10, 90], [54, 90]))
+
+    def test_max_series(self):
+        cases = [(3, 3, True), (5, 5, False), (10, 5, False)]
+        for max_series, count, truncated in cases:
+            with self.subTest(max_series=max_series):
+                result = performance_series(
+                    date(2024, 3, 1), date(2024, 3, 31), group_by='employee', max_series=max_series
+                )
+                self.assertEqual(len(result['series']), count)
+                self.assertEqual(result['truncated'], truncated)
+                self.assertEqual(
+                    [series['group'] for series in result['series']],
+                    [employee.pk for employee in self.employees][:count],
+                )
+                # La media móvil se reinicia en cada serie
+                for index, series in enumerate(result['series']):
+                    self.assertEqual(series['moving_avg'][0], 10 + index)
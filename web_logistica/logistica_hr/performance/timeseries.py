@@ -0,0 +1,146 @@
+"""
+Series de tiempo de EmployeePerformance
+
+Las series se agrupan por métrica y por empleado, departamento o total, en
+intervalos (día, semana, mes, trimestre o año) truncados en la base de
+datos. El intervalo se elige según el rango pedido y el ancho del gráfico
+para no retornar más puntos de los que se pueden dibujar. El resultado se
+entrega en arreglos por columna en lugar de un objeto por punto.
+"""
+
+from django.db.models import Avg, Count, F, FloatField, Max, Min, RowRange, Window
+from django.db.models.functions import Cast, Trunc
+
+from logistica_hr.core.expressions import WindowAggregate
+from logistica_hr.core.partitioning import check_archived_range
+from .models import EmployeePerformance
+
+# Intervalos disponibles con su duración aproximada en días
+BUCKET_DAYS = {
+    'day': 1,
+    'week': 7,
+    'month': 30,
+    'quarter': 91,
+    'year': 365,
+}
+
+GROUP_FIELDS = {
+    'employee': 'employee_id',
+    'department': 'employee__position__department_id',
+    'total': None,
+}
+
+# Píxeles mínimos entre puntos consecutivos del gráfico
+PIXELS_PER_POINT = 4
+DEFAULT_WIDTH = 800
+MAX_SERIES = 50
+
+# Cantidad de intervalos de la media móvil
+DEFAULT_SMOOTHING = 3
+
+SERIES_COLUMNS = ['avg', 'min', 'max', 'count', 'score', 'moving_avg']
+
+
+def choose_bucket(start_date, end_date, width=DEFAULT_WIDTH):
+    """
+    Elige el intervalo más fino cuya cantidad de puntos cabe en el ancho
+    indicado (en píxeles)
+    """
+    max_points = max(1, width // PIXELS_PER_POINT)
+    days = (end_date - start_date).days + 1
+    for bucket, bucket_days in BUCKET_DAYS.items():
+        if days / bucket_days <= max_points:
+            return bucket
+    return 'year'
+
+
+def performance_series(start_date, end_date, metric_ids=None, group_by='total',
+                       ids=None, department_id=None, bucket=None, width=DEFAULT_WIDTH,
+                       smoothing=DEFAULT_SMOOTHING, max_series=MAX_SERIES):
+    """
+    Retorna las series agrupadas de EmployeePerformance entre dos fechas
+
+    group_by puede ser employee, department o total; ids limita las series
+    a esos empleados o departamentos y department_id limita los datos a un
+    departamento. Si no se indica bucket se elige con choose_bucket. Cada
+    serie trae la fecha de inicio de cada intervalo (timestamps) y los
+    arreglos de SERIES_COLUMNS alineados con ella; moving_avg es la media
+    móvil de avg sobre los últimos smoothing intervalos. Lanza
+    ArchivedRangeError si el rango incluye meses archivados.
+    """
+    if group_by not in GROUP_FIELDS:
+        raise ValueError(f"Agrupación no soportada: {group_by}")
+    bucket = bucket or choose_bucket(start_date, end_date, width)
+    if bucket not in BUCKET_DAYS:
+        raise ValueError(f"Intervalo no soportado: {bucket}")
+
+    group_field = GROUP_FIELDS[group_by]
+    check_archived_range(EmployeePerformance, start_date, end_date)
+    queryset = EmployeePerformance.objects.active().with_performance_score().filter(
+        date__gte=start_date, date__lte=end_date
+    )
+    if metric_ids:
+        queryset = queryset.filter(metric_id__in=metric_ids)
+    if department_id is not None:
+        queryset = queryset.filter(employee__position__department_id=department_id)
+    if ids and group_field:
+        queryset = queryset.filter(**{f'{group_field}__in': ids})
+
+    keys = ['metric_id'] + ([group_field] if group_field else [])
+    value = Cast('actual_value', FloatField())
+    rows = queryset.annotate(
+        bucket=Trunc('date', bucket),
+    ).values(*keys, 'bucket').annotate(
+        avg=Avg(value),
+        min=Min(value),
+        max=Max(value),
+        count=Count('pk'),
+        score=Avg('performance_score_db'),
+    ).annotate(
+        # En una llamada separada para que la ventana no entre al GROUP BY
+        moving_avg=Window(
+            WindowAggregate(Avg(value), function='AVG'),
+            partition_by=[F(key) for key in keys],
+            order_by=F('bucket').asc(),
+            frame=RowRange(start=-(max(1, smoothing) - 1), end=0),
+        ),
+    ).order_by(*keys, 'bucket')
+
+    series = []
+    current = None
+    truncated = False
+    for row in rows.iterator():
+        key = tuple(row[field] for field in keys)
+        if current is None or current['key'] != key:
+            if len(series) >= max_series:
+                truncated = True
+                break
+            current = {
+                'key': key,
+                'metric': row['metric_id'],
+                'group': row[group_field] if group_field else None,
+                'timestamps': [],
+                **{column: [] for column in SERIES_COLUMNS},
+            }
+            series.append(current)
+        current['timestamps'].append(row['bucket'].isoformat())
+        for column in SERIES_COLUMNS:
+            current[column].append(_compact(row[column]))
+
+    for entry in series:
+        del entry['key']
+    return {
+        'bucket': bucket,
+        'group_by': group_by,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'truncated': truncated,
+        'series': series,
+    }
+
+
+def _compact(value):
+    """Redondea los valores de punto flotante para reducir la respuesta"""
+    if isinstance(value, float):
+        return round(value, 2)
+    return value
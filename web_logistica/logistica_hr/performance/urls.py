@@ -12,6 +12,10 @@ router = DefaultRouter()
 # router.register(r'', views.PerformanceViewSet)  # Comentado hasta crear las vistas
 
 urlpatterns = [
+    path('dashboard/summary/', views.DashboardSummaryView.as_view(), name='dashboard-summary'),
+    path('series/', views.PerformanceSeriesView.as_view(), name='performance-series'),
+    path('recompute-jobs/<int:pk>/', views.ScoreRecomputeJobView.as_view(), name='recompute-job'),
+    path('daily-logs/bulk/', views.DailyWorkLogBulkIngestView.as_view(), name='daily-log-bulk'),
     path('', include(router.urls)),
 ]
 
@@ -0,0 +1,130 @@
+"""
+Vistas para la aplicación performance
+"""
+
+from datetime import date, timedelta
+
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from logistica_hr.core.ingestion import SUPPORTED_FORMATS, request_payload
+from logistica_hr.core.partitioning import ArchivedRangeError
+from logistica_hr.core.views import archived_range_response
+from .cache import cached_dashboard_summary
+from .models import ScoreRecomputeJob
+from .services import ingest_daily_work_logs
+from .timeseries import BUCKET_DAYS, DEFAULT_WIDTH, GROUP_FIELDS, performance_series
+
+
+class DailyWorkLogBulkIngestView(APIView):
+    """
+    Carga masiva de registros diarios de trabajo desde los escáneres de bodega
+    """
+
+    def post(self, request):
+        stream, file_format = request_payload(request)
+        if file_format not in SUPPORTED_FORMATS:
+            return Response(
+                {'detail': f'Formato no soportado: {file_format}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(ingest_daily_work_logs(stream, file_format))
+
+
+class DashboardSummaryView(APIView):
+    """
+    Indicadores del dashboard en una sola respuesta, opcionalmente por
+    departamento (?department=<id>) y por los subordinados directos e
+    indirectos de un jefe (?manager=<id de usuario>)
+    """
+
+    def get(self, request):
+        scope = {}
+        for name in ['department', 'manager']:
+            value = request.query_params.get(name)
+            if value is not None:
+                try:
+                    value = int(value)
+                except ValueError:
+                    return Response(
+                        {'detail': f'El parámetro {name} debe ser un número'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+            scope[name] = value
+        return Response(cached_dashboard_summary(scope['department'], scope['manager']))
+
+
+def _id_list(value):
+    """Convierte una lista de ids separados por coma en enteros"""
+    return [int(item) for item in value.split(',') if item.strip()] if value else None
+
+
+class PerformanceSeriesView(APIView):
+    """
+    Series de tiempo de rendimiento en arreglos por columna
+
+    Parámetros: start y end (ISO, por defecto los últimos 365 días), metric
+    (ids separados por coma), group_by (employee, department o total), ids,
+    department, bucket (opcional) y width (ancho del gráfico en píxeles).
+    """
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            end_date = date.fromisoformat(params['end']) if params.get('end') else timezone.localdate()
+            start_date = (
+                date.fromisoformat(params['start']) if params.get('start')
+                else end_date - timedelta(days=364)
+            )
+            metric_ids = _id_list(params.get('metric'))
+            ids = _id_list(params.get('ids'))
+            department = int(params['department']) if params.get('department') else None
+            width = int(params.get('width', DEFAULT_WIDTH))
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        group_by = params.get('group_by', 'total')
+        bucket = params.get('bucket') or None
+        if group_by not in GROUP_FIELDS or (bucket and bucket not in BUCKET_DAYS) or start_date > end_date:
+            return Response(
+                {'detail': 'Parámetros de la serie inválidos'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            series = performance_series(
+                start_date, end_date,
+                metric_ids=metric_ids,
+                group_by=group_by,
+                ids=ids,
+                department_id=department,
+                bucket=bucket,
+                width=width,
+            )
+        except ArchivedRangeError as exc:
+            return archived_range_response(exc)
+        return Response(series)
+
+
+class ScoreRecomputeJobView(APIView):
+    """
+    Estado y avance de un recálculo de puntajes
+    """
+
+    def get(self, request, pk):
+        job = get_object_or_404(ScoreRecomputeJob.objects.select_related('metric'), pk=pk)
+        return Response({
+            'id': job.pk,
+            'metric': job.metric_id,
+            'metric_name': job.metric.name,
+            'changed_fields': job.changed_fields,
+            'status': job.status,
+            'total_evaluations': job.total_evaluations,
+            'processed_evaluations': job.processed_evaluations,
+            'progress_percentage': job.progress_percentage,
+            'started_at': job.started_at,
+            'finished_at': job.finished_at,
+            'error_message': job.error_message,
+        })
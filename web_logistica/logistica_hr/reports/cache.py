@@ -0,0 +1,159 @@
+"""
+Caché direccionada por contenido de los reportes generados
+
+La clave de un reporte es el hash de la plantilla (tipo, formato y
+template_config), los parámetros normalizados y la marca de agua de los
+datos de origen. Si los datos no cambiaron, un reporte con la misma clave
+reutiliza el archivo ya generado.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from .models import GeneratedReport, ReportCacheCounter
+from .selectors import dataset_watermark
+from .storage import report_absolute_path
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_parameters(parameters):
+    """
+    Retorna una representación canónica (JSON con claves ordenadas) de los
+    parámetros de un reporte, útil para comparar y agrupar ejecuciones
+    """
+    return json.dumps(parameters or {}, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def report_cache_key(template, parameters):
+    """
+    Calcula la clave de caché de una plantilla con sus parámetros
+    """
+    payload = {
+        'report_type': template.report_type,
+        'format': template.format,
+        'template_config': template.template_config,
+        'parameters': normalize_parameters(parameters),
+        'watermark': dataset_watermark(
+            template.report_type, parameters, template.template_config
+        ),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def increment_counter(name, amount=1):
+    """
+    Incrementa de forma atómica un contador de la caché
+    """
+    updated = ReportCacheCounter.objects.filter(name=name).update(
+        value=F('value') + amount, updated_at=timezone.now()
+    )
+    if not updated:
+        counter, created = ReportCacheCounter.objects.get_or_create(
+            name=name, defaults={'value': amount}
+        )
+        if not created:
+            ReportCacheCounter.objects.filter(pk=counter.pk).update(value=F('value') + amount)
+
+
+def cache_stats():
+    """
+    Retorna los contadores de la caché y el espacio usado en disco
+    """
+    counters = dict(ReportCacheCounter.objects.values_list('name', 'value'))
+    hits = counters.get('hits', 0)
+    misses = counters.get('misses', 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'evictions': counters.get('evictions', 0),
+        'hit_rate': round(hits / total, 4) if total else 0,
+        'bytes_used': _cached_files().aggregate(total=Sum('size'))['total'] or 0,
+    }
+
+
+def find_cached_report(cache_key):
+    """
+    Busca un reporte completado con la clave indicada cuyo archivo exista
+    """
+    report = GeneratedReport.objects.filter(
+        cache_key=cache_key, status='completed'
+    ).exclude(file_path='').select_related('template').order_by('-created_at').first()
+    if report is None or not report_absolute_path(report.file_path).exists():
+        return None
+    return report
+
+
+def touch_report(report):
+    """
+    Registra el acceso a un reporte para la política de eliminación LRU
+    """
+    report.last_accessed = timezone.now()
+    GeneratedReport.objects.filter(file_path=report.file_path).update(
+        last_accessed=report.last_accessed
+    )
+
+
+def _cached_files():
+    """
+    Archivos de reportes en disco, uno por ruta (varios reportes pueden
+    compartir el mismo archivo) con su último acceso
+    """
+    return GeneratedReport.objects.filter(status='completed').exclude(file_path='').order_by().values(
+        'file_path'
+    ).annotate(
+        size=Max('file_size'),
+        last_used=Max('last_accessed'),
+        created=Max('created_at'),
+    )
+
+
+def evict_report_cache(max_bytes=None, max_age=None):
+    """
+    Elimina archivos de reportes por antigüedad y, si se supera el tamaño
+    máximo, los menos usados recientemente (LRU)
+
+    Los reportes cuyo archivo se elimina conservan su registro pero quedan
+    sin archivo ni clave de caché. Retorna la cantidad de archivos eliminados.
+    """
+    if max_bytes is None:
+        max_bytes = settings.REPORTS_CACHE_MAX_BYTES
+    if max_age is None:
+        max_age = settings.REPORTS_CACHE_MAX_AGE
+
+    files = sorted(
+        _cached_files(),
+        key=lambda entry: entry['last_used'] or entry['created'],
+    )
+    total = sum(entry['size'] or 0 for entry in files)
+    cutoff = timezone.now() - max_age if max_age else None
+
+    evicted = []
+    for entry in files:
+        last_used = entry['last_used'] or entry['created']
+        expired = cutoff is not None and last_used < cutoff
+        if not expired and total <= max_bytes:
+            break
+        evicted.append(entry['file_path'])
+        total -= entry['size'] or 0
+
+    for file_path in evicted:
+        try:
+            report_absolute_path(file_path).unlink()
+        except FileNotFoundError:
+            pass
+        GeneratedReport.objects.filter(file_path=file_path).update(
+            file_path='', cache_key='', updated_at=timezone.now()
+        )
+
+    if evicted:
+        increment_counter('evictions', len(evicted))
+        logger.info('Archivos de reportes eliminados de la caché: %s', len(evicted))
+    return len(evicted)
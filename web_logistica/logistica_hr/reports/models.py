@@ -5,7 +5,7 @@ Modelos para la aplicación reports
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from logistica_hr.core.models import BaseModel
+from logistica_hr.core.models import BaseModel, TimestampedModel
 from logistica_hr.users.models import User
 
 
@@ -191,6 +191,16 @@ class GeneratedReport(BaseModel):
         blank=True,
         verbose_name=_('Mensaje de Error')
     )
+    cache_key = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name=_('Clave de Caché')
+    )
+    last_accessed = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Último Acceso')
+    )
 
     class Meta:
         verbose_name = _('Reporte Generado')
@@ -199,6 +209,7 @@ class GeneratedReport(BaseModel):
         indexes = [
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['template', 'created_at']),
+            models.Index(fields=['cache_key', 'status']),
         ]
 
     def __str__(self):
@@ -217,6 +228,36 @@ class GeneratedReport(BaseModel):
         return self.status == 'completed' and bool(self.file_path)
 
 
+class ReportCacheCounter(TimestampedModel):
+    """
+    Modelo para contadores de la caché de reportes generados
+    """
+    COUNTER_CHOICES = [
+        ('hits', _('Aciertos')),
+        ('misses', _('Fallos')),
+        ('evictions', _('Archivos Eliminados')),
+    ]
+
+    name = models.CharField(
+        max_length=20,
+        choices=COUNTER_CHOICES,
+        unique=True,
+        verbose_name=_('Nombre')
+    )
+    value = models.BigIntegerField(
+        default=0,
+        verbose_name=_('Valor')
+    )
+
+    class Meta:
+        verbose_name = _('Contador de Caché de Reportes')
+        verbose_name_plural = _('Contadores de Caché de Reportes')
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.get_name_display()}: {self.value}"
+
+
 class ReportParameter(BaseModel):
     """
     Modelo para parámetros de reportes
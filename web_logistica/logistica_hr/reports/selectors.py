@@ -0,0 +1,187 @@
+"""
+Selectores para la aplicación reports
+
+Cada conjunto de datos retorna las columnas del reporte y un iterador de
+filas que recorre la base de datos por bloques (cursores del lado del
+servidor en PostgreSQL), por lo que la memoria no depende del tamaño del
+reporte.
+"""
+
+from datetime import date
+
+from django.db.models import Count, Max
+from django.utils.translation import gettext_lazy as _
+
+from logistica_hr.core.partitioning import check_archived_range
+from logistica_hr.employees.hierarchy import subtree_q
+from logistica_hr.employees.models import Department, Employee
+from logistica_hr.performance.models import DailyWorkLog, EmployeePerformance, PerformanceMetric
+
+DEFAULT_CHUNK_SIZE = 2000
+
+EMPLOYEE_COLUMNS = [
+    ('employee_code', _('Código Empleado'), 'employee__employee_id'),
+    ('first_name', _('Nombre'), 'employee__user__first_name'),
+    ('last_name', _('Apellido'), 'employee__user__last_name'),
+    ('department', _('Departamento'), 'employee__position__department__name'),
+]
+
+DATASETS = {
+    'productivity': {
+        'model': DailyWorkLog,
+        'annotations': ['with_total_work_time'],
+        'columns': EMPLOYEE_COLUMNS + [
+            ('date', _('Fecha'), 'date'),
+            ('packages_processed', _('Paquetes Procesados'), 'packages_processed'),
+            ('trucks_received', _('Camiones Recibidos'), 'trucks_received'),
+            ('trucks_dispatched', _('Camiones Despachados'), 'trucks_dispatched'),
+            ('total_work_time', _('Tiempo Total de Trabajo'), 'total_work_time_db'),
+            ('total_break_time', _('Tiempo Total de Descanso'), 'total_break_time'),
+        ],
+        'order_by': ['date', 'employee_id'],
+    },
+    'attendance': {
+        'model': DailyWorkLog,
+        'annotations': ['with_total_work_time'],
+        'columns': EMPLOYEE_COLUMNS + [
+            ('date', _('Fecha'), 'date'),
+            ('start_time', _('Hora de Inicio'), 'start_time'),
+            ('end_time', _('Hora de Fin'), 'end_time'),
+            ('total_break_time', _('Tiempo Total de Descanso'), 'total_break_time'),
+            ('total_work_time', _('Tiempo Total de Trabajo'), 'total_work_time_db'),
+        ],
+        'order_by': ['date', 'employee_id'],
+    },
+    'quality': {
+        'model': DailyWorkLog,
+        'annotations': [],
+        'columns': EMPLOYEE_COLUMNS + [
+            ('date', _('Fecha'), 'date'),
+            ('packages_processed', _('Paquetes Procesados'), 'packages_processed'),
+            ('quality_score', _('Puntaje de Calidad'), 'quality_score'),
+        ],
+        'order_by': ['date', 'employee_id'],
+    },
+    'safety': {
+        'model': DailyWorkLog,
+        'annotations': [],
+        'columns': EMPLOYEE_COLUMNS + [
+            ('date', _('Fecha'), 'date'),
+            ('safety_incidents', _('Incidentes de Seguridad'), 'safety_incidents'),
+            ('notes', _('Notas'), 'notes'),
+        ],
+        'order_by': ['date', 'employee_id'],
+    },
+    'performance': {
+        'model': EmployeePerformance,
+        'annotations': ['with_performance_score'],
+        'columns': EMPLOYEE_COLUMNS + [
+            ('date', _('Fecha'), 'date'),
+            ('metric', _('Métrica'), 'metric__name'),
+            ('metric_type', _('Tipo de Métrica'), 'metric__metric_type'),
+            ('actual_value', _('Valor Real'), 'actual_value'),
+            ('target_value', _('Valor Objetivo'), 'metric__target_value'),
+            ('performance_score', _('Puntaje de Rendimiento'), 'performance_score_db'),
+        ],
+        'order_by': ['date', 'employee_id', 'metric_id'],
+        'reference_models': [PerformanceMetric],
+    },
+}
+
+
+def _parse_date(value):
+    """Convierte un parámetro de fecha en formato ISO a date"""
+    if not value or isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def _resolve_dataset(report_type, template_config):
+    """Retorna la definición del conjunto de datos de un tipo de reporte"""
+    dataset_name = (template_config or {}).get('dataset', report_type)
+    if dataset_name not in DATASETS:
+        raise ValueError(f"Tipo de reporte sin conjunto de datos: {dataset_name}")
+    return DATASETS[dataset_name]
+
+
+def check_dataset_range(report_type, parameters=None, template_config=None):
+    """
+    Lanza ArchivedRangeError si el rango de fechas de los parámetros incluye
+    particiones archivadas del conjunto de datos
+    """
+    parameters = parameters or {}
+    check_archived_range(
+        _resolve_dataset(report_type, template_config)['model'],
+        _parse_date(parameters.get('start_date')),
+        _parse_date(parameters.get('end_date')),
+    )
+
+
+def _filter_dataset(queryset, parameters):
+    """
+    Aplica los parámetros de fecha, empleado, departamento y jefe al
+    queryset; lanza ArchivedRangeError si el rango de fechas incluye
+    particiones archivadas
+    """
+    start_date = _parse_date(parameters.get('start_date'))
+    end_date = _parse_date(parameters.get('end_date'))
+    check_archived_range(queryset.model, start_date, end_date)
+    if start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(date__lte=end_date)
+    if parameters.get('employee'):
+        queryset = queryset.filter(employee_id=parameters['employee'])
+    if parameters.get('department'):
+        queryset = queryset.filter(employee__position__department_id=parameters['department'])
+    if parameters.get('manager'):
+        queryset = queryset.filter(subtree_q(parameters['manager'], 'employee'))
+    return queryset
+
+
+def report_dataset(report_type, parameters=None, template_config=None,
+                   chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Retorna (columnas, filas) del conjunto de datos de un tipo de reporte
+
+    Las columnas son tuplas (clave, encabezado) y las filas tuplas de valores
+    en el mismo orden. Los parámetros soportados son start_date, end_date,
+    employee, department y manager (subordinados directos e indirectos de
+    ese usuario). template_config puede definir 'dataset' (para reportes
+    personalizados) y 'columns' (subconjunto de claves a incluir).
+    """
+    template_config = template_config or {}
+    dataset = _resolve_dataset(report_type, template_config)
+
+    columns = dataset['columns']
+    selected = template_config.get('columns')
+    if selected:
+        columns = [column for column in columns if column[0] in selected]
+
+    queryset = dataset['model'].objects.active()
+    for annotation in dataset['annotations']:
+        queryset = getattr(queryset, annotation)()
+    queryset = _filter_dataset(queryset, parameters or {})
+
+    rows = queryset.order_by(*dataset['order_by']).values_list(
+        *[expression for _, _, expression in columns]
+    ).iterator(chunk_size=chunk_size)
+    return [(key, label) for key, label, _ in columns], rows
+
+
+def dataset_watermark(report_type, parameters=None, template_config=None):
+    """
+    Retorna la marca de agua de los datos de un reporte
+
+    Combina la última modificación y la cantidad de filas del conjunto de
+    datos filtrado (la cantidad detecta eliminaciones) con la última
+    modificación de las tablas de referencia usadas en las columnas.
+    """
+    dataset = _resolve_dataset(report_type, template_config)
+    source = _filter_dataset(dataset['model'].objects.active().order_by(), parameters or {}).aggregate(
+        updated_at=Max('updated_at'), rows=Count('pk')
+    )
+    watermark = [str(source['updated_at']), source['rows']]
+    for model in [Employee, Department] + dataset.get('reference_models', []):
+        watermark.append(str(model.objects.order_by().aggregate(updated_at=Max('updated_at'))['updated_at']))
+    return watermark
@@ -0,0 +1,172 @@
+"""
+Servicios para la aplicación reports
+"""
+
+import calendar
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .cache import find_cached_report, increment_counter, report_cache_key, touch_report
+from .models import GeneratedReport
+from .selectors import check_dataset_range, report_dataset
+from .storage import report_absolute_path, report_relative_path
+from .writers import write_report
+
+FREQUENCY_MONTHS = {
+    'monthly': 1,
+    'quarterly': 3,
+    'annual': 12,
+}
+
+FREQUENCY_DAYS = {
+    'daily': 1,
+    'weekly': 7,
+}
+
+
+def add_months(value, months):
+    """
+    Suma meses a una fecha u hora ajustando el día al último día del mes
+    """
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def next_generation_after(scheduled_report, now):
+    """
+    Calcula la próxima generación de un reporte programado posterior a now
+
+    Si el programador estuvo detenido se saltan las ejecuciones atrasadas en
+    lugar de generarlas todas.
+    """
+    anchor = scheduled_report.next_generation
+    frequency = scheduled_report.frequency
+    next_generation = anchor
+    steps = 0
+    while next_generation <= now:
+        steps += 1
+        # Se calcula siempre desde la fecha original para no perder el día
+        # del mes al pasar por meses más cortos
+        if frequency in FREQUENCY_DAYS:
+            next_generation = anchor + timedelta(days=FREQUENCY_DAYS[frequency] * steps)
+        else:
+            next_generation = add_months(anchor, FREQUENCY_MONTHS[frequency] * steps)
+    return next_generation
+
+
+def generate_report(template, parameters=None, generated_by=None,
+                    scheduled_report=None, name=None, use_cache=True):
+    """
+    Genera el archivo de un reporte y registra el resultado en GeneratedReport
+
+    Las filas se leen por bloques y se escriben directamente al archivo, por lo
+    que la memoria se mantiene constante sin importar el tamaño del reporte.
+    Se registran el tiempo de generación y el tamaño del archivo. Si existe un
+    reporte en caché con la misma clave se registra un reporte nuevo que
+    reutiliza su archivo, sin regenerarlo.
+    Los parámetros inválidos se registran como un reporte fallido. Lanza
+    ArchivedRangeError, sin registrar el reporte, si el rango de fechas
+    incluye meses archivados.
+    """
+    parameters = parameters or {}
+    report_values = {
+        'name': name or template.name,
+        'template': template,
+        'scheduled_report': scheduled_report,
+        'generated_by': generated_by,
+        'parameters': parameters,
+    }
+    try:
+        check_dataset_range(template.report_type, parameters, template.template_config)
+        cache_key = report_cache_key(template, parameters) if use_cache else ''
+    except (TypeError, ValueError) as exc:
+        return record_failed_report(exc, **report_values)
+
+    if use_cache:
+        cached = find_cached_report(cache_key)
+        if cached is not None:
+            increment_counter('hits')
+            touch_report(cached)
+            return GeneratedReport.objects.create(
+                **report_values,
+                status='completed',
+                file_path=cached.file_path,
+                file_size=cached.file_size,
+                generation_time=timedelta(0),
+                cache_key=cache_key,
+                last_accessed=cached.last_accessed,
+            )
+        increment_counter('misses')
+
+    report = GeneratedReport.objects.create(
+        **report_values,
+        cache_key=cache_key,
+        last_accessed=timezone.now(),
+    )
+
+    started = time.monotonic()
+    try:
+        columns, rows = report_dataset(
+            template.report_type, parameters, template.template_config
+        )
+        file_path = report_relative_path(report, template.format)
+        absolute_path = report_absolute_path(file_path)
+        absolute_path.parent.mkdir(parents=True, exist_ok=True)
+        write_report(template.format, columns, rows, absolute_path)
+    except Exception as exc:
+        report.status = 'failed'
+        report.cache_key = ''
+        report.error_message = str(exc)
+        report.generation_time = timedelta(seconds=time.monotonic() - started)
+        report.save(update_fields=[
+            'status', 'cache_key', 'error_message', 'generation_time', 'updated_at'
+        ])
+        return report
+
+    report.status = 'completed'
+    report.file_path = file_path
+    report.file_size = absolute_path.stat().st_size
+    report.generation_time = timedelta(seconds=time.monotonic() - started)
+    report.save(update_fields=[
+        'status', 'file_path', 'file_size', 'generation_time', 'updated_at'
+    ])
+    return report
+
+
+def record_failed_report(error, template, name=None, **values):
+    """
+    Registra un reporte fallido sin archivo con el mensaje del error
+    """
+    return GeneratedReport.objects.create(
+        name=name or template.name,
+        template=template,
+        status='failed',
+        error_message=str(error),
+        generation_time=timedelta(0),
+        **values,
+    )
+
+
+def share_generated_report(report, scheduled_report):
+    """
+    Registra para otro reporte programado un reporte ya generado, reutilizando
+    el mismo archivo en lugar de volver a generarlo
+    """
+    return GeneratedReport.objects.create(
+        name=scheduled_report.name,
+        template=report.template,
+        scheduled_report=scheduled_report,
+        parameters=report.parameters,
+        status=report.status,
+        file_path=report.file_path,
+        file_size=report.file_size,
+        generation_time=timedelta(0),
+        error_message=report.error_message,
+        cache_key=report.cache_key,
+        last_accessed=report.last_accessed,
+    )
@@ -0,0 +1,30 @@
+"""
+Almacenamiento en disco de los archivos de reportes generados
+"""
+
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .writers import FORMAT_EXTENSIONS
+
+REPORTS_DIRECTORY = 'reports'
+
+
+def report_relative_path(report, file_format):
+    """
+    Retorna la ruta relativa a MEDIA_ROOT donde se guarda un reporte generado
+    """
+    now = timezone.now()
+    extension = FORMAT_EXTENSIONS[file_format]
+    name = slugify(report.name) or 'reporte'
+    return f"{REPORTS_DIRECTORY}/{now:%Y/%m}/{report.pk}_{name}.{extension}"
+
+
+def report_absolute_path(file_path):
+    """
+    Retorna la ruta absoluta de un archivo de reporte guardado en MEDIA_ROOT
+    """
+    return Path(settings.MEDIA_ROOT) / file_path
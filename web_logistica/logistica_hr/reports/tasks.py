@@ -0,0 +1,110 @@
+"""
+Tareas de Celery para la aplicación reports
+"""
+
+import logging
+
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
+
+from logistica_hr.core.partitioning import ArchivedRangeError
+from .models import ScheduledReport
+from .cache import evict_report_cache, normalize_parameters
+from .services import (
+    generate_report, next_generation_after, record_failed_report, share_generated_report
+)
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_BATCH_SIZE = 100
+
+
+def claim_due_scheduled_reports(now, batch_size=DISPATCH_BATCH_SIZE):
+    """
+    Reclama un lote de reportes programados vencidos y avanza su programación
+
+    Las filas se bloquean con SELECT ... FOR UPDATE SKIP LOCKED, de modo que
+    varios despachadores concurrentes nunca reclaman el mismo reporte. Retorna
+    los reportes agrupados por plantilla y parámetros normalizados.
+    """
+    groups = {}
+    with transaction.atomic():
+        due = list(
+            ScheduledReport.objects.select_for_update(skip_locked=True).filter(
+                is_active=True,
+                template__is_active=True,
+                next_generation__lte=now,
+            ).order_by('next_generation')[:batch_size]
+        )
+        for scheduled_report in due:
+            scheduled_report.last_generated = now
+            scheduled_report.next_generation = next_generation_after(scheduled_report, now)
+            key = (scheduled_report.template_id, normalize_parameters(scheduled_report.parameters))
+            groups.setdefault(key, []).append(scheduled_report.pk)
+        ScheduledReport.objects.bulk_update(due, ['last_generated', 'next_generation'])
+    return groups, len(due)
+
+
+@shared_task
+def dispatch_scheduled_reports(batch_size=DISPATCH_BATCH_SIZE):
+    """
+    Tarea periódica que despacha los reportes programados vencidos
+
+    Cada grupo de reportes con la misma plantilla y parámetros se envía como
+    una sola tarea a la cola de reportes, que genera el archivo una vez.
+    """
+    now = timezone.now()
+    dispatched = 0
+    while True:
+        groups, claimed = claim_due_scheduled_reports(now, batch_size)
+        for scheduled_report_ids in groups.values():
+            generate_scheduled_reports.delay(scheduled_report_ids)
+        dispatched += claimed
+        if claimed < batch_size:
+            break
+    if dispatched:
+        logger.info('Reportes programados despachados: %s', dispatched)
+    return dispatched
+
+
+@shared_task
+def generate_scheduled_reports(scheduled_report_ids):
+    """
+    Genera un reporte compartido por varios reportes programados equivalentes
+
+    La programación ya avanzó al reclamarlos, así que un rango archivado o
+    parámetros inválidos se registran como reportes fallidos en lugar de
+    perder la ejecución sin rastro.
+    """
+    scheduled_reports = list(
+        ScheduledReport.objects.select_related('template').filter(pk__in=scheduled_report_ids).order_by('pk')
+    )
+    if not scheduled_reports:
+        return None
+
+    first = scheduled_reports[0]
+    try:
+        report = generate_report(
+            first.template,
+            parameters=first.parameters,
+            scheduled_report=first,
+            name=first.name,
+        )
+    except ArchivedRangeError as exc:
+        logger.warning('Reportes programados %s omitidos: %s', scheduled_report_ids, exc)
+        report = record_failed_report(
+            exc, first.template, name=first.name, scheduled_report=first, parameters=first.parameters
+        )
+    for scheduled_report in scheduled_reports[1:]:
+        share_generated_report(report, scheduled_report)
+    return report.pk
+
+
+@shared_task
+def evict_report_cache_files():
+    """
+    Tarea periódica que libera espacio eliminando archivos de reportes
+    antiguos o poco usados
+    """
+    return evict_report_cache()
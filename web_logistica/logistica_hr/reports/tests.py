@@ -0,0 +1,177 @@
+"""
+Pruebas para la aplicación reports
+"""
+
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from logistica_hr import celery_app
+from .models import GeneratedReport, ReportTemplate, ScheduledReport
+from .services import generate_report
+from .tasks import dispatch_scheduled_reports
+from .writers import write_report
+
+
+class MediaRootMixin:
+    """
+    Escribe los archivos de reportes en un directorio temporal
+    """
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class GenerateReportCacheTests(MediaRootMixin, TestCase):
+    """
+    Un acierto de la caché registra un reporte propio del solicitante que
+    reutiliza el archivo ya generado
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = ReportTemplate.objects.create(name='Productividad', report_type='productivity', format='csv')
+        cls.users = [get_user_model().objects.create(username=f'user_{index}') for index in range(2)]
+
+    def test_cache_hit_creates_report_for_caller(self):
+        parameters = {'start_date': '2024-01-01', 'end_date': '2024-01-31'}
+        first = generate_report(self.template, parameters, generated_by=self.users[0])
+        second = generate_report(self.template, parameters, generated_by=self.users[1], name='Copia')
+
+        self.assertNotEqual(first.pk, second.pk)
+        self.assertEqual(GeneratedReport.objects.count(), 2)
+        self.assertEqual(second.generated_by, self.users[1])
+        self.assertEqual(second.name, 'Copia')
+        self.assertEqual(second.status, 'completed')
+        self.assertEqual((second.file_path, second.cache_key), (first.file_path, first.cache_key))
+        first.refresh_from_db()
+        self.assertEqual(first.generated_by, self.users[0])
+
+
+class ReportGenerateViewTests(MediaRootMixin, TestCase):
+    """
+    Los parámetros inválidos responden 400 y quedan registrados como un
+    reporte fallido
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username='analista')
+        cls.productivity = ReportTemplate.objects.create(
+            name='Productividad', report_type='productivity', format='csv'
+        )
+        cls.custom = ReportTemplate.objects.create(name='Personalizado', report_type='custom', format='csv')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def generate(self, template, parameters):
+        return self.client.post(
+            reverse('reports:report-generate'),
+            {'template': template.pk, 'parameters': parameters},
+            content_type='application/json',
+        )
+
+    def test_invalid_parameters_record_failed_report(self):
+        cases = [
+            ('fecha inválida', self.productivity, {'start_date': 'bogus'}),
+            ('fecha no textual', self.productivity, {'end_date': 20240101}),
+            ('tipo sin conjunto de datos', self.custom, {}),
+        ]
+        for label, template, parameters in cases:
+            with self.subTest(label):
+                response = self.generate(template, parameters)
+                self.assertEqual(response.status_code, 400)
+                report = GeneratedReport.objects.get(pk=response.json()['id'])
+                self.assertEqual(report.status, 'failed')
+                self.assertTrue(report.error_message)
+                self.assertEqual(report.generated_by, self.user)
+
+    def test_non_object_parameters(self):
+        response = self.generate(self.productivity, ['2024-01-01'])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(GeneratedReport.objects.exists())
+
+    def test_valid_parameters(self):
+        response = self.generate(self.productivity, {'start_date': '2024-01-01', 'end_date': '2024-01-31'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['status'], 'completed')
+
+
+class ScheduledReportDispatchTests(MediaRootMixin, TestCase):
+    """
+    El despachador reclama los reportes vencidos, genera un solo archivo por
+    grupo de reportes equivalentes y registra como fallidos los inválidos
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        productivity = ReportTemplate.objects.create(name='Productividad', report_type='productivity', format='csv')
+        custom = ReportTemplate.objects.create(name='Personalizado', report_type='custom', format='csv')
+        cls.now = timezone.now()
+        due = cls.now - timedelta(hours=1)
+        january = {'start_date': '2024-01-01', 'end_date': '2024-01-31'}
+
+        def schedule(name, template, parameters, **values):
+            values.setdefault('next_generation', due)
+            return ScheduledReport.objects.create(
+                name=name, template=template, frequency='daily', parameters=parameters, **values
+            )
+
+        cls.schedules = {
+            'a': schedule('A', productivity, january),
+            # Mismos parámetros en otro orden: equivalente a A
+            'b': schedule('B', productivity, dict(reversed(list(january.items())))),
+            'c': schedule('C', productivity, {'start_date': '2024-02-01', 'end_date': '2024-02-29'}),
+            'invalid': schedule('Inválido', custom, {}),
+            'future': schedule('Futuro', productivity, january, next_generation=cls.now + timedelta(hours=1)),
+            'inactive': schedule('Inactivo', productivity, january, is_active=False),
+        }
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(setattr, celery_app.conf, 'task_always_eager', celery_app.conf.task_always_eager)
+        celery_app.conf.task_always_eager = True
+
+    def reports(self, name):
+        return list(GeneratedReport.objects.filter(scheduled_report=self.schedules[name]))
+
+    def test_dispatch_claims_fans_out_and_shares_files(self):
+        with mock.patch('logistica_hr.reports.services.write_report', wraps=write_report) as writer:
+            dispatched = dispatch_scheduled_reports(batch_size=2)
+
+        self.assertEqual(dispatched, 4)
+        # Un archivo para A y B, otro para C; el inválido no llega a escribirse
+        self.assertEqual(writer.call_count, 2)
+        [first], [shared], [other] = self.reports('a'), self.reports('b'), self.reports('c')
+        self.assertEqual((first.status, shared.status, other.status), ('completed',) * 3)
+        self.assertEqual(shared.file_path, first.file_path)
+        self.assertNotEqual(other.file_path, first.file_path)
+        [failed] = self.reports('invalid')
+        self.assertEqual(failed.status, 'failed')
+        self.assertTrue(failed.error_message)
+        self.assertEqual(self.reports('future') + self.reports('inactive'), [])
+
+        for name, schedule in self.schedules.items():
+            schedule.refresh_from_db()
+            with self.subTest(name):
+                if name in ('future', 'inactive'):
+                    self.assertIsNone(schedule.last_generated)
+                else:
+                    self.assertIsNotNone(schedule.last_generated)
+                    self.assertGreater(schedule.next_generation, self.now)
+
+        # Los reportes ya reclamados no se vuelven a despachar
+        self.assertEqual(dispatch_scheduled_reports(batch_size=2), 0)
+        self.assertEqual(GeneratedReport.objects.count(), 4)
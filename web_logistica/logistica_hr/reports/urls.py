@@ -12,6 +12,10 @@ router = DefaultRouter()
 # router.register(r'', views.ReportViewSet)  # Comentado hasta crear las vistas
 
 urlpatterns = [
+    path('generate/', views.ReportGenerateView.as_view(), name='report-generate'),
+    path('<int:pk>/download/', views.ReportDownloadView.as_view(), name='report-download'),
+    path('templates/<int:pk>/export/', views.ReportExportView.as_view(), name='template-export'),
+    path('cache/stats/', views.ReportCacheStatsView.as_view(), name='report-cache-stats'),
     path('', include(router.urls)),
 ]
 
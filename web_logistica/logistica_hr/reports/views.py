@@ -0,0 +1,136 @@
+"""
+Vistas para la aplicación reports
+"""
+
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.text import slugify
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
+
+from logistica_hr.core.cache import active_reference_objects
+from logistica_hr.core.partitioning import ArchivedRangeError
+from logistica_hr.core.views import archived_range_response
+from .cache import cache_stats, touch_report
+from .models import GeneratedReport, ReportTemplate
+from .selectors import report_dataset
+from .services import generate_report
+from .storage import report_absolute_path
+from .writers import FORMAT_CONTENT_TYPES, FORMAT_EXTENSIONS, STREAMING_FORMATS, TEXT_WRITERS
+
+
+def generated_report_data(report, request):
+    """
+    Representación JSON de un reporte generado
+    """
+    return {
+        'id': report.pk,
+        'name': report.name,
+        'template': report.template_id,
+        'status': report.status,
+        'parameters': report.parameters,
+        'file_size': report.file_size,
+        'generation_time': report.generation_time.total_seconds() if report.generation_time else None,
+        'error_message': report.error_message,
+        'download_url': reverse(
+            'reports:report-download', args=[report.pk], request=request
+        ) if report.is_successful else None,
+    }
+
+
+def active_template(pk):
+    """
+    Retorna una plantilla activa desde la caché de datos de referencia
+    """
+    try:
+        return active_reference_objects(ReportTemplate)[int(pk)]
+    except (KeyError, TypeError, ValueError):
+        raise Http404('Plantilla de reporte no encontrada')
+
+
+class ReportGenerateView(APIView):
+    """
+    Genera un reporte a partir de una plantilla y sus parámetros
+    """
+
+    def post(self, request):
+        template = active_template(request.data.get('template'))
+        parameters = request.data.get('parameters') or {}
+        if not isinstance(parameters, dict):
+            return Response(
+                {'detail': 'Los parámetros deben ser un objeto JSON'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            report = generate_report(
+                template,
+                parameters=parameters,
+                generated_by=request.user,
+            )
+        except ArchivedRangeError as exc:
+            return archived_range_response(exc)
+        response_status = status.HTTP_201_CREATED if report.is_successful else status.HTTP_400_BAD_REQUEST
+        return Response(generated_report_data(report, request), status=response_status)
+
+
+class ReportDownloadView(APIView):
+    """
+    Descarga el archivo de un reporte generado, leído desde disco por bloques
+    """
+
+    def get(self, request, pk):
+        report = get_object_or_404(GeneratedReport, pk=pk)
+        if not report.is_successful:
+            raise Http404('El reporte no tiene un archivo disponible')
+        path = report_absolute_path(report.file_path)
+        if not path.exists():
+            raise Http404('El archivo del reporte ya no existe')
+        touch_report(report)
+        return FileResponse(
+            open(path, 'rb'),
+            as_attachment=True,
+            filename=path.name,
+            content_type=FORMAT_CONTENT_TYPES[report.template.format],
+        )
+
+
+class ReportExportView(APIView):
+    """
+    Exporta una plantilla CSV o JSON directamente como flujo HTTP, sin
+    generar archivo ni construir la respuesta en memoria
+    """
+
+    def get(self, request, pk):
+        template = active_template(pk)
+        if template.format not in STREAMING_FORMATS:
+            return Response(
+                {'detail': 'Solo las plantillas CSV y JSON se pueden exportar como flujo'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            columns, rows = report_dataset(
+                template.report_type, request.query_params.dict(), template.template_config
+            )
+        except ArchivedRangeError as exc:
+            return archived_range_response(exc)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            TEXT_WRITERS[template.format](columns, rows),
+            content_type=FORMAT_CONTENT_TYPES[template.format],
+        )
+        filename = f"{slugify(template.name) or 'reporte'}.{FORMAT_EXTENSIONS[template.format]}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ReportCacheStatsView(APIView):
+    """
+    Contadores de aciertos y fallos de la caché de reportes
+    """
+
+    def get(self, request):
+        return Response(cache_stats())
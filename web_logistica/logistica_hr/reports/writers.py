@@ -0,0 +1,123 @@
+"""
+Escritores de reportes por flujo (CSV, JSON y Excel)
+
+Los escritores de texto son generadores que producen el archivo por partes,
+de modo que pueden escribirse a disco o entregarse directamente mediante
+StreamingHttpResponse sin construir el reporte completo en memoria.
+"""
+
+import csv
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+FORMAT_EXTENSIONS = {
+    'csv': 'csv',
+    'json': 'json',
+    'excel': 'xlsx',
+    'pdf': 'pdf',
+}
+
+FORMAT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'json': 'application/json',
+    'excel': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'pdf': 'application/pdf',
+}
+
+STREAMING_FORMATS = ['csv', 'json']
+
+# Cantidad de filas agrupadas en cada parte emitida por los generadores
+ROWS_PER_CHUNK = 500
+
+
+class _Echo:
+    """
+    Pseudo-buffer que retorna lo escrito en lugar de almacenarlo
+    """
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    """Normaliza valores que csv no representa de forma legible"""
+    if value is None:
+        return ''
+    if isinstance(value, timedelta):
+        return str(value)
+    return value
+
+
+def iter_csv(columns, rows):
+    """
+    Genera el reporte en formato CSV por bloques de filas
+    """
+    writer = csv.writer(_Echo())
+    yield '\ufeff' + writer.writerow([str(label) for _, label in columns])
+    chunk = []
+    for row in rows:
+        chunk.append(writer.writerow([_csv_value(value) for value in row]))
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def iter_json(columns, rows):
+    """
+    Genera el reporte en formato JSON (lista de objetos) por bloques de filas
+    """
+    keys = [key for key, _ in columns]
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    yield '['
+    chunk = []
+    separator = ''
+    for row in rows:
+        chunk.append(separator + encoder.encode(dict(zip(keys, row))))
+        separator = ','
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+    yield ']'
+
+
+TEXT_WRITERS = {
+    'csv': iter_csv,
+    'json': iter_json,
+}
+
+
+def write_excel(columns, rows, path):
+    """
+    Escribe el reporte en formato Excel usando el modo de solo escritura de
+    openpyxl, que no mantiene las filas en memoria
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError as exc:
+        raise RuntimeError('El formato Excel requiere el paquete openpyxl') from exc
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([str(label) for _, label in columns])
+    for row in rows:
+        sheet.append(list(row))
+    workbook.save(path)
+
+
+def write_report(file_format, columns, rows, path):
+    """
+    Escribe el reporte en disco en el formato indicado
+    """
+    if file_format in TEXT_WRITERS:
+        with open(path, 'w', encoding='utf-8', newline='') as output:
+            for chunk in TEXT_WRITERS[file_format](columns, rows):
+                output.write(chunk)
+    elif file_format == 'excel':
+        write_excel(columns, rows, path)
+    else:
+        raise ValueError(f"Formato de reporte no soportado: {file_format}")
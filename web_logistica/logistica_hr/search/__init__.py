@@ -0,0 +1,4 @@
+# Aplicación de búsqueda de texto completo del proyecto Logistica HR
+
+
+
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'logistica_hr.search'
+
+    def ready(self):
+        from . import signals  # noqa: F401
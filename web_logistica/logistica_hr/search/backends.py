@@ -0,0 +1,144 @@
+"""
+Motores del índice de búsqueda
+
+PostgreSQL: SearchEntry.search_vector se precalcula al indexar (título con
+peso A, contenido con peso B) y se consulta con el índice GIN, ordenando
+por ts_rank.
+
+SQLite (settings_sqlite): una tabla virtual FTS5 de contenido externo sobre
+search_searchentry, mantenida por triggers, ordenada por bm25.
+"""
+
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.models import F
+
+from .models import SearchEntry
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def query_tokens(text):
+    """
+    Separa el texto buscado en palabras, descartando los operadores de cada
+    motor; todas las palabras deben aparecer y la última se busca por prefijo
+    """
+    return TOKEN_PATTERN.findall(text or '')
+
+
+class PostgreSQLSearchBackend:
+    """
+    Búsqueda con tsvector precalculado e índice GIN
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.config = settings.SEARCH_CONFIG
+
+    def install(self):
+        """El índice GIN lo crean las migraciones"""
+
+    def refresh(self, entries):
+        """
+        Recalcula search_vector de los documentos del queryset
+        """
+        entries.update(search_vector=(
+            SearchVector('title', weight='A', config=self.config)
+            + SearchVector('body', weight='B', config=self.config)
+        ))
+
+    def search(self, tokens, kinds=None, offset=0, limit=20):
+        terms = [f'{token}:*' if position == len(tokens) - 1 else token
+                 for position, token in enumerate(tokens)]
+        query = SearchQuery(' & '.join(terms), config=self.config, search_type='raw')
+        entries = SearchEntry.objects.filter(search_vector=query)
+        if kinds:
+            entries = entries.filter(kind__in=kinds)
+        return list(entries.annotate(
+            rank=SearchRank(F('search_vector'), query)
+        ).defer('search_vector').order_by('-rank', '-id')[offset:offset + limit])
+
+
+class SQLiteSearchBackend:
+    """
+    Búsqueda con una tabla virtual FTS5
+    """
+    # Peso relativo del título frente al contenido en bm25
+    TITLE_WEIGHT = 4.0
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.table = SearchEntry._meta.db_table
+        self.fts_table = f'{self.table}_fts'
+
+    def install(self):
+        """
+        Crea la tabla FTS5 y los triggers que la sincronizan con SearchEntry,
+        y la reconstruye a partir de los documentos existentes
+        """
+        table, fts = self.table, self.fts_table
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"title, body, content='{table}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, title, body) "
+            f"VALUES ('delete', old.id, old.title, old.body); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF title, body ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, title, body) "
+            f"VALUES ('delete', old.id, old.title, old.body); "
+            f"INSERT INTO {fts}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+            # Las migraciones de SQLite recrean la tabla y eliminan los triggers
+            f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        ]
+        with self.connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def refresh(self, entries):
+        """Los triggers mantienen la tabla FTS5"""
+
+    def search(self, tokens, kinds=None, offset=0, limit=20):
+        match = ' '.join(
+            '"{}"{}'.format(token, '*' if position == len(tokens) - 1 else '')
+            for position, token in enumerate(tokens)
+        )
+        params = [match]
+        kind_filter = ''
+        if kinds:
+            kind_filter = f" AND entry.kind IN ({', '.join(['%s'] * len(kinds))})"
+            params.extend(kinds)
+        params.extend([limit, offset])
+        # bm25 es menor mientras más relevante; se invierte para exponer el rango
+        return list(SearchEntry.objects.raw(
+            f"SELECT entry.id, entry.kind, entry.object_id, entry.title, entry.body, "
+            f"entry.created_at, entry.updated_at, "
+            f"-bm25({self.fts_table}, {self.TITLE_WEIGHT}, 1.0) AS rank "
+            f"FROM {self.fts_table} "
+            f"JOIN {self.table} AS entry ON entry.id = {self.fts_table}.rowid "
+            f"WHERE {self.fts_table} MATCH %s{kind_filter} "
+            f"ORDER BY rank DESC, entry.id DESC LIMIT %s OFFSET %s",
+            params
+        ))
+
+
+BACKENDS = {
+    'postgresql': PostgreSQLSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend(using='default'):
+    """
+    Retorna el motor de búsqueda de la conexión indicada
+    """
+    connection = connections[using]
+    if connection.vendor not in BACKENDS:
+        raise ImproperlyConfigured(f'Búsqueda no soportada para {connection.vendor}')
+    return BACKENDS[connection.vendor](connection)
@@ -0,0 +1,31 @@
+"""
+Comando para reconstruir el índice de búsqueda
+"""
+
+from django.core.management.base import BaseCommand
+
+from logistica_hr.search.services import DOCUMENTS, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda de texto completo (necesario tras cargas masivas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            action='append',
+            choices=list(DOCUMENTS),
+            help='Tipo de documento a reconstruir (se puede repetir; por defecto todos)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Cantidad de objetos indexados por sentencia'
+        )
+
+    def handle(self, *args, **options):
+        counts = rebuild_search_index(options['kind'], chunk_size=options['chunk_size'])
+        for kind, count in counts.items():
+            self.stdout.write(f'{kind}: {count} documentos')
+        self.stdout.write(self.style.SUCCESS('Índice de búsqueda reconstruido'))
@@ -0,0 +1,65 @@
+"""
+Modelos para la aplicación search
+"""
+
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from logistica_hr.core.indexes import SearchVectorIndex
+from logistica_hr.core.models import TimestampedModel
+
+
+class SearchEntry(TimestampedModel):
+    """
+    Documento del índice de búsqueda
+
+    Guarda una copia del texto buscable de una tarea, un comentario, un
+    registro diario o un empleado. En PostgreSQL el texto se precalcula en
+    search_vector; en SQLite lo indexa una tabla virtual FTS5.
+    """
+    KIND_CHOICES = [
+        ('task', _('Tarea')),
+        ('comment', _('Comentario')),
+        ('work_log', _('Registro Diario')),
+        ('employee', _('Empleado')),
+    ]
+
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        verbose_name=_('Tipo')
+    )
+    object_id = models.PositiveBigIntegerField(
+        verbose_name=_('ID del Objeto')
+    )
+    title = models.CharField(
+        max_length=255,
+        verbose_name=_('Título')
+    )
+    body = models.TextField(
+        blank=True,
+        verbose_name=_('Contenido')
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name=_('Vector de Búsqueda')
+    )
+
+    class Meta:
+        verbose_name = _('Documento de Búsqueda')
+        verbose_name_plural = _('Documentos de Búsqueda')
+        ordering = ['-updated_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id'],
+                name='uniq_search_entry_object'
+            ),
+        ]
+        indexes = [
+            SearchVectorIndex(fields=['search_vector'], name='search_entry_vector_gin'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} - {self.title}"
@@ -0,0 +1,201 @@
+"""
+Servicios para la aplicación search
+
+Cada tipo de documento define el modelo de origen, las relaciones que
+necesita y cómo se arma su título y contenido. Solo se indexan los objetos
+activos. Las señales indexan los objetos al guardarlos; las cargas masivas
+(bulk_create no emite señales) llaman a index_queryset y
+rebuild_search_index reconstruye el índice completo.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from logistica_hr.employees.models import Employee
+from logistica_hr.performance.models import DailyWorkLog
+from logistica_hr.tasks.models import Task, TaskComment
+from .backends import get_search_backend, query_tokens
+from .models import SearchEntry
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+SNIPPET_LENGTH = 200
+
+
+def _join(*parts):
+    """Une los textos no vacíos en párrafos"""
+    return '\n\n'.join(part.strip() for part in parts if part and part.strip())
+
+
+def _employee_name(employee):
+    """Nombre completo de un empleado o su código si el usuario no lo tiene"""
+    return employee.user.get_full_name() or employee.employee_id
+
+
+DOCUMENTS = {
+    'task': {
+        'model': Task,
+        'select_related': [],
+        'title': lambda task: task.title,
+        'body': lambda task: _join(task.description, task.notes),
+    },
+    'comment': {
+        'model': TaskComment,
+        'select_related': ['task'],
+        'title': lambda comment: comment.task.title,
+        'body': lambda comment: comment.content,
+    },
+    'work_log': {
+        'model': DailyWorkLog,
+        'select_related': ['employee__user'],
+        'title': lambda log: f"{_employee_name(log.employee)} - {log.date}",
+        'body': lambda log: log.notes,
+        'require_body': True,
+    },
+    'employee': {
+        'model': Employee,
+        'select_related': ['user', 'position'],
+        'title': _employee_name,
+        'body': lambda employee: _join(employee.employee_id, employee.position.name if employee.position else ''),
+    },
+}
+
+MODEL_KINDS = {document['model']: kind for kind, document in DOCUMENTS.items()}
+
+
+def index_objects(kind, objects):
+    """
+    Crea o actualiza los documentos de búsqueda de los objetos indicados
+
+    Los objetos inactivos (borrado lógico) y los de tipos con require_body
+    (registros diarios) sin contenido se quitan del índice. Retorna la
+    cantidad de documentos escritos.
+    """
+    document = DOCUMENTS[kind]
+    entries = []
+    removed_ids = []
+    now = timezone.now()
+    for obj in objects:
+        if not obj.is_active:
+            removed_ids.append(obj.pk)
+            continue
+        body = document['body'](obj) or ''
+        if document.get('require_body') and not body.strip():
+            removed_ids.append(obj.pk)
+            continue
+        entries.append(SearchEntry(
+            kind=kind,
+            object_id=obj.pk,
+            title=document['title'](obj)[:255],
+            body=body,
+            created_at=now,
+            updated_at=now,
+        ))
+    if removed_ids:
+        remove_objects(kind, removed_ids)
+    if not entries:
+        return 0
+    SearchEntry.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['title', 'body', 'updated_at'],
+    )
+    get_search_backend().refresh(SearchEntry.objects.filter(
+        kind=kind, object_id__in=[entry.object_id for entry in entries]
+    ))
+    return len(entries)
+
+
+def index_instance(instance):
+    """
+    Indexa un objeto de cualquiera de los modelos registrados
+    """
+    kind = MODEL_KINDS[type(instance)]
+    return index_objects(kind, [instance])
+
+
+def remove_objects(kind, object_ids):
+    """
+    Quita del índice los documentos de los objetos indicados
+    """
+    return SearchEntry.objects.filter(kind=kind, object_id__in=object_ids).delete()[0]
+
+
+def update_comment_titles(task):
+    """
+    Propaga el título de una tarea a los documentos de sus comentarios con
+    una sola sentencia UPDATE (no escribe nada si el título no cambió)
+    """
+    entries = SearchEntry.objects.filter(
+        kind='comment',
+        object_id__in=TaskComment.objects.filter(task=task).values('pk')
+    )
+    if entries.exclude(title=task.title[:255]).update(title=task.title[:255], updated_at=timezone.now()):
+        get_search_backend().refresh(entries)
+
+
+def index_queryset(kind, queryset, chunk_size=1000):
+    """
+    Indexa por bloques los objetos de un queryset del modelo de un tipo,
+    como los escritos por una carga masiva (bulk_create no emite señales)
+
+    Retorna la cantidad de documentos escritos.
+    """
+    queryset = queryset.select_related(*DOCUMENTS[kind]['select_related']).order_by('pk')
+    count = 0
+    batch = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) >= chunk_size:
+            count += index_objects(kind, batch)
+            batch = []
+    return count + index_objects(kind, batch)
+
+
+def rebuild_search_index(kinds=None, chunk_size=1000):
+    """
+    Reconstruye el índice de los tipos indicados (todos por defecto) con
+    los objetos activos
+
+    Retorna un diccionario con la cantidad de documentos por tipo.
+    """
+    counts = {}
+    for kind in kinds or DOCUMENTS:
+        with transaction.atomic():
+            SearchEntry.objects.filter(kind=kind).delete()
+            counts[kind] = index_queryset(kind, DOCUMENTS[kind]['model'].objects.active(), chunk_size)
+    return counts
+
+
+def search(text, kinds=None, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Busca el texto en el índice y retorna una página de resultados ordenada
+    por relevancia
+
+    Todas las palabras deben aparecer en el título o el contenido; la última
+    se busca por prefijo para servir búsquedas mientras se escribe.
+    """
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+    tokens = query_tokens(text)
+    results = []
+    if tokens:
+        results = get_search_backend().search(
+            tokens, kinds=kinds, offset=(page - 1) * page_size, limit=page_size + 1
+        )
+    return {
+        'query': text,
+        'page': page,
+        'next_page': page + 1 if len(results) > page_size else None,
+        'results': [
+            {
+                'kind': entry.kind,
+                'object_id': entry.object_id,
+                'title': entry.title,
+                'snippet': entry.body[:SNIPPET_LENGTH],
+                'rank': round(float(entry.rank), 6),
+            }
+            for entry in results[:page_size]
+        ],
+    }
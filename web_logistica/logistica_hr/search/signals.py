@@ -0,0 +1,66 @@
+"""
+Señales para la aplicación search
+"""
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from logistica_hr.core.signals import rows_archived
+from logistica_hr.employees.models import Employee
+from .backends import BACKENDS, get_search_backend
+from .services import MODEL_KINDS, index_instance, index_objects, remove_objects, update_comment_titles
+
+
+def index_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Actualiza el documento de búsqueda de un objeto al guardarlo, o lo
+    quita del índice si quedó inactivo
+    """
+    if raw:
+        return
+    index_instance(instance)
+    if MODEL_KINDS[sender] == 'task':
+        update_comment_titles(instance)
+
+
+def remove_on_delete(sender, instance, **kwargs):
+    """
+    Quita el documento de búsqueda de un objeto eliminado
+    """
+    remove_objects(MODEL_KINDS[sender], [instance.pk])
+
+
+for model in MODEL_KINDS:
+    post_save.connect(index_on_save, sender=model, dispatch_uid=f'search_index_{model.__name__}')
+    post_delete.connect(remove_on_delete, sender=model, dispatch_uid=f'search_remove_{model.__name__}')
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reindex_employee_name(sender, instance, raw=False, **kwargs):
+    """
+    Actualiza el nombre del empleado en el índice al modificar su usuario
+    """
+    if raw:
+        return
+    index_objects('employee', Employee.objects.filter(user=instance).select_related('user', 'position'))
+
+
+@receiver(rows_archived)
+def remove_archived_rows(sender, ids, **kwargs):
+    """
+    Quita del índice los objetos movidos a las tablas de archivo
+    """
+    if sender in MODEL_KINDS:
+        remove_objects(MODEL_KINDS[sender], ids)
+
+
+@receiver(post_migrate)
+def install_search_backend(sender, using='default', **kwargs):
+    """
+    Prepara las estructuras del motor de búsqueda después de migrar
+    """
+    if sender.name != 'logistica_hr.search' or connections[using].vendor not in BACKENDS:
+        return
+    get_search_backend(using).install()
@@ -0,0 +1,106 @@
+"""
+Pruebas para la aplicación search
+"""
+
+import json
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from logistica_hr.employees.models import Employee
+from logistica_hr.performance.services import ingest_daily_work_logs
+from logistica_hr.tasks.models import Task
+from .models import SearchEntry
+from .services import rebuild_search_index, search
+
+
+def create_task(title, description=''):
+    return Task.objects.create(title=title, description=description, due_date=timezone.now() + timedelta(days=1))
+
+
+def result_ids(response, kind='task'):
+    return [result['object_id'] for result in response['results'] if result['kind'] == kind]
+
+
+class SearchRankingTests(TestCase):
+    """
+    Las coincidencias en el título pesan más que en el contenido, la última
+    palabra se busca por prefijo y las páginas no se superponen
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.in_body = create_task('Revisión semanal', 'Inventario pendiente del pasillo 3')
+        cls.in_title = create_task('Inventario de bodega', 'Conteo general')
+        cls.packages = [create_task(f'Paquete {index}', 'Despacho') for index in range(25)]
+
+    def test_title_matches_rank_first(self):
+        response = search('inventario')
+        self.assertEqual(result_ids(response), [self.in_title.pk, self.in_body.pk])
+        ranks = [result['rank'] for result in response['results']]
+        self.assertGreater(ranks[0], ranks[1])
+
+    def test_last_word_matches_prefix(self):
+        cases = [
+            ('invent', [self.in_title.pk, self.in_body.pk]),
+            ('bodeg', [self.in_title.pk]),
+            ('conteo invent', [self.in_title.pk]),
+            # Solo la última palabra se busca por prefijo
+            ('invent bodega', []),
+        ]
+        for text, expected in cases:
+            with self.subTest(text):
+                self.assertEqual(result_ids(search(text)), expected)
+
+    def test_pagination(self):
+        pages = [search('paquete', page=page, page_size=10) for page in [1, 2, 3]]
+        self.assertEqual([page['next_page'] for page in pages], [2, 3, None])
+        ids = [object_id for page in pages for object_id in result_ids(page)]
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(set(ids), {task.pk for task in self.packages})
+
+
+class SearchIndexActiveTests(TestCase):
+    """
+    Solo los objetos activos quedan en el índice, incluidas las notas de
+    los registros diarios escritos por carga masiva
+    """
+
+    def test_saving_inactive_removes_entry(self):
+        task = create_task('Inventario de bodega')
+        self.assertEqual(result_ids(search('inventario')), [task.pk])
+        task.is_active = False
+        task.save()
+        self.assertEqual(result_ids(search('inventario')), [])
+        task.is_active = True
+        task.save()
+        self.assertEqual(result_ids(search('inventario')), [task.pk])
+
+    def test_rebuild_skips_inactive(self):
+        active, inactive = create_task('Inventario norte'), create_task('Inventario sur')
+        # QuerySet.update no emite señales
+        Task.objects.filter(pk=inactive.pk).update(is_active=False)
+        self.assertEqual(rebuild_search_index(['task']), {'task': 1})
+        self.assertEqual(result_ids(search('inventario')), [active.pk])
+
+    def test_bulk_ingest_indexes_notes(self):
+        Employee.objects.create(
+            user=get_user_model().objects.create(username='operario'), employee_id='E1', hire_date=date(2020, 1, 1)
+        )
+        rows = [
+            {'employee': 'E1', 'date': '2024-03-01', 'start_time': '08:00', 'end_time': '16:00',
+             'total_break_time': '00:30:00', 'notes': 'Derrame en el pasillo 4'},
+            {'employee': 'E1', 'date': '2024-03-02', 'start_time': '08:00', 'end_time': '16:00',
+             'total_break_time': '00:30:00', 'notes': ''},
+        ]
+        report = ingest_daily_work_logs('\n'.join(json.dumps(row) for row in rows), 'ndjson')
+        self.assertEqual(report['written'], 2)
+        self.assertEqual(len(result_ids(search('derrame'), 'work_log')), 1)
+        self.assertEqual(SearchEntry.objects.filter(kind='work_log').count(), 1)
+
+        rows[0]['notes'] = 'Pasillo despejado'
+        ingest_daily_work_logs(json.dumps(rows[0]), 'ndjson')
+        self.assertEqual(result_ids(search('derrame'), 'work_log'), [])
+        self.assertEqual(len(result_ids(search('despejado'), 'work_log')), 1)
@@ -0,0 +1,12 @@
+"""
+URLs para la aplicación search
+"""
+
+from django.urls import path
+from . import views
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', views.SearchView.as_view(), name='search'),
+]
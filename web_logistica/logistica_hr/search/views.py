@@ -0,0 +1,36 @@
+"""
+Vistas para la aplicación search
+"""
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import SearchEntry
+from .services import DEFAULT_PAGE_SIZE, search
+
+KINDS = {code for code, _ in SearchEntry.KIND_CHOICES}
+
+
+class SearchView(APIView):
+    """
+    Búsqueda de texto completo en tareas, comentarios, registros diarios y
+    empleados
+
+    Parámetros: q (texto), kind (tipos separados por coma), page y page_size.
+    """
+
+    def get(self, request):
+        params = request.query_params
+        kinds = [kind for kind in params.get('kind', '').split(',') if kind]
+        try:
+            page = int(params.get('page', 1))
+            page_size = int(params.get('page_size', DEFAULT_PAGE_SIZE))
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if not set(kinds) <= KINDS:
+            return Response(
+                {'detail': f"Tipos inválidos: {', '.join(sorted(set(kinds) - KINDS))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(search(params.get('q', ''), kinds=kinds, page=page, page_size=page_size))
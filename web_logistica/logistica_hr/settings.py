@@ -4,6 +4,7 @@ Siguiendo las mejores prácticas del Django Styleguide
 """
 
 import os
+from datetime import timedelta
 from pathlib import Path
 from decouple import config
 
@@ -44,11 +45,13 @@ LOCAL_APPS = [
     'logistica_hr.tasks.apps.TasksConfig',
     'logistica_hr.performance.apps.PerformanceConfig',
     'logistica_hr.reports.apps.ReportsConfig',
+    'logistica_hr.search.apps.SearchConfig',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'logistica_hr.core.profiling.RequestProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -125,6 +128,60 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Caché de reportes generados (archivos bajo MEDIA_ROOT/reports)
+REPORTS_CACHE_MAX_BYTES = config('REPORTS_CACHE_MAX_BYTES', default=2 * 1024 ** 3, cast=int)
+REPORTS_CACHE_MAX_AGE = timedelta(days=config('REPORTS_CACHE_MAX_AGE_DAYS', default=30, cast=int))
+
+# Caché en Redis (base 1; la 0 la usa Celery) con respaldo LRU en memoria
+# si Redis no responde. Para pruebas sin Redis:
+# CACHE_BACKEND=logistica_hr.core.cache_backends.FakeRedisCache (requiere fakeredis)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='logistica_hr.core.cache_backends.ResilientRedisCache'),
+        'LOCATION': config('CACHE_URL', default='redis://localhost:6379/1'),
+        'KEY_PREFIX': 'logistica_hr',
+        'OPTIONS': {
+            'socket_connect_timeout': 0.5,
+            'socket_timeout': 0.5,
+            'FALLBACK_RETRY': 30,
+            'FALLBACK_MAX_ENTRIES': 1000,
+        },
+    }
+}
+
+# Segundos que se guardan en caché los datos de referencia (departamentos,
+# posiciones, categorías, métricas y plantillas); se invalidan al modificarlos
+REFERENCE_CACHE_TTL = config('REFERENCE_CACHE_TTL', default=3600, cast=int)
+
+# Segundos que se guarda en caché el resumen del dashboard
+DASHBOARD_SUMMARY_TTL = config('DASHBOARD_SUMMARY_TTL', default=60, cast=int)
+
+# Configuración de texto de PostgreSQL para la búsqueda (diccionario y stemming)
+SEARCH_CONFIG = config('SEARCH_CONFIG', default='spanish')
+
+# Particiones mensuales (PostgreSQL) de registros diarios, rendimiento y tiempos
+PARTITION_MONTHS_AHEAD = config('PARTITION_MONTHS_AHEAD', default=3, cast=int)
+# Meses que permanecen en la base de datos; 0 desactiva el archivado automático
+PARTITION_RETENTION_MONTHS = config('PARTITION_RETENTION_MONTHS', default=0, cast=int)
+PARTITION_ARCHIVE_DIR = config('PARTITION_ARCHIVE_DIR', default=str(BASE_DIR / 'archive'))
+# Meses que se pueden restaurar de una vez y días que un mes restaurado no se
+# vuelve a archivar
+PARTITION_RESTORE_MAX_MONTHS = config('PARTITION_RESTORE_MAX_MONTHS', default=12, cast=int)
+PARTITION_RESTORE_HOLD_DAYS = config('PARTITION_RESTORE_HOLD_DAYS', default=30, cast=int)
+
+# Conciliación de asistencia: minutos de tolerancia para llegadas tardías y
+# salidas anticipadas, y días conciliados en la primera ejecución
+ATTENDANCE_GRACE_MINUTES = config('ATTENDANCE_GRACE_MINUTES', default=5, cast=int)
+ATTENDANCE_INITIAL_DAYS = config('ATTENDANCE_INITIAL_DAYS', default=30, cast=int)
+
+# Asignación automática de tareas: tareas por lote y horas supuestas para
+# las tareas sin estimated_hours
+TASK_ASSIGNMENT_BATCH_SIZE = config('TASK_ASSIGNMENT_BATCH_SIZE', default=2000, cast=int)
+TASK_ASSIGNMENT_DEFAULT_HOURS = config('TASK_ASSIGNMENT_DEFAULT_HOURS', default=1.0, cast=float)
+
+# Línea base de run_benchmarks
+BENCHMARK_BASELINE = config('BENCHMARK_BASELINE', default=str(BASE_DIR / 'benchmarks' / 'baseline.json'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -166,6 +223,31 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_TASK_ROUTES = {
+    'logistica_hr.reports.tasks.generate_scheduled_reports': {'queue': 'reports'},
+}
+CELERY_BEAT_SCHEDULE = {
+    'dispatch-scheduled-reports': {
+        'task': 'logistica_hr.reports.tasks.dispatch_scheduled_reports',
+        'schedule': 60.0,
+    },
+    'evict-report-cache-files': {
+        'task': 'logistica_hr.reports.tasks.evict_report_cache_files',
+        'schedule': 3600.0,
+    },
+    'maintain-table-partitions': {
+        'task': 'logistica_hr.core.tasks.maintain_table_partitions',
+        'schedule': 86400.0,
+    },
+    'assign-pending-tasks': {
+        'task': 'logistica_hr.tasks.tasks.assign_pending_tasks_batch',
+        'schedule': 300.0,
+    },
+    'reconcile-attendance': {
+        'task': 'logistica_hr.performance.tasks.reconcile_attendance_incremental',
+        'schedule': 3600.0,
+    },
+}
 
 # Logging
 LOGGING = {
@@ -191,6 +273,31 @@ LOGGING = {
     },
 }
 
+# Perfilado de peticiones (consultas, tiempo y memoria por vista)
+PERFORMANCE_PROFILING = config('PERFORMANCE_PROFILING', default=True, cast=bool)
+PERFORMANCE_TRACE_ALLOCATIONS = config('PERFORMANCE_TRACE_ALLOCATIONS', default=False, cast=bool)
+
+# Máximo de consultas SQL por vista (nombre de URL); incluye las de sesión y usuario
+QUERY_BUDGETS = {
+    'employees:employee-list': 4,
+    'employees:department-list': 4,
+    'employees:position-list': 4,
+    'employees:workschedule-list': 4,
+    'employees:schedule-coverage': 4,
+    'employees:employee-match': 5,
+    'tasks:task-list': 4,
+    'tasks:task-timeline': 3,
+    'performance:dashboard-summary': 5,
+    'performance:performance-series': 3,
+    'search:search': 3,
+    'health-check': 2,
+    'admin:employees_employee_changelist': 6,
+    'admin:tasks_task_changelist': 7,
+    'admin:tasks_tasktimelog_changelist': 6,
+    'admin:performance_employeeperformance_changelist': 6,
+    'admin:performance_dailyworklog_changelist': 6,
+}
+
 # WhiteNoise configuration for static files
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
@@ -44,6 +44,7 @@ LOCAL_APPS = [
     # 'logistica_hr.tasks.apps.TasksConfig',          # Comentado temporalmente
     # 'logistica_hr.performance.apps.PerformanceConfig', # Comentado temporalmente
     # 'logistica_hr.reports.apps.ReportsConfig',      # Comentado temporalmente
+    # 'logistica_hr.search.apps.SearchConfig',        # Requiere las aplicaciones anteriores
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -0,0 +1,227 @@
+"""
+Asignación automática de tareas pendientes
+
+Las tareas pendientes sin asignar se reparten entre los empleados con turno
+en curso o por comenzar hoy. La capacidad de cada empleado son las horas
+que le quedan del turno (WorkSchedule, descontando el descanso) menos las
+horas estimadas de sus tareas abiertas (pendientes y en progreso, leídas
+con el índice (assigned_to, status)).
+
+Las tareas se recorren por prioridad y vencimiento y cada una se asigna al
+empleado con más horas libres entre los que tienen las habilidades que
+exige su categoría (TaskCategory.required_skills, comparadas como en el
+índice de habilidades: sin distinguir mayúsculas ni espacios). Cada
+conjunto de habilidades tiene un montículo de empleados ordenado por horas
+libres; si el primero no alcanza a cubrir la tarea, ninguno lo hace y la
+tarea queda sin asignar. Las entradas de un empleado en los montículos de
+otros conjuntos se corrigen al salir (sus horas libres solo disminuyen),
+así que cada tarea cuesta O(log empleados).
+"""
+
+import heapq
+import random
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from logistica_hr.core.cache import active_reference_objects
+from logistica_hr.employees.coverage import schedule_intervals
+from logistica_hr.employees.models import WorkSchedule
+from logistica_hr.employees.qualifications import normalize_qualification
+from .models import Task, TaskCategory
+from .signals import tasks_assigned
+
+# Orden en que se reparten las prioridades
+PRIORITY_ORDER = ['urgent', 'high', 'medium', 'low']
+
+# Estados que ocupan la capacidad del empleado
+LOAD_STATUSES = ['pending', 'in_progress']
+
+
+def assign(tasks, employees):
+    """
+    Reparte tareas entre empleados
+
+    tasks es una lista ordenada de (id, horas, habilidades requeridas) y
+    employees una lista de (id, horas libres, habilidades). Retorna un
+    diccionario id de tarea -> id de empleado con las tareas asignadas.
+    """
+    free = {}
+    skills = {}
+    for employee_id, hours, employee_skills in employees:
+        if hours > 0:
+            free[employee_id] = hours
+            skills[employee_id] = frozenset(map(normalize_qualification, employee_skills))
+
+    heaps = {}
+    assignments = {}
+    for task_id, hours, required in tasks:
+        required = frozenset(map(normalize_qualification, required))
+        heap = heaps.get(required)
+        if heap is None:
+            heap = [(-hours_left, employee_id) for employee_id, hours_left in free.items()
+                    if required <= skills[employee_id]]
+            heapq.heapify(heap)
+            heaps[required] = heap
+        while heap:
+            key, employee_id = heap[0]
+            hours_left = free[employee_id]
+            if -key == hours_left:
+                break
+            # Entrada desactualizada por una asignación de otro conjunto
+            if hours_left > 0:
+                heapq.heapreplace(heap, (-hours_left, employee_id))
+            else:
+                heapq.heappop(heap)
+        if not heap or -heap[0][0] < hours:
+            continue
+        _, employee_id = heapq.heappop(heap)
+        free[employee_id] -= hours
+        if free[employee_id] > 0:
+            heapq.heappush(heap, (-free[employee_id], employee_id))
+        assignments[task_id] = employee_id
+    return assignments
+
+
+def remaining_shift_hours(now, schedules):
+    """
+    Horas de turno que le quedan a cada empleado desde now
+
+    schedules son filas (empleado, día, inicio, fin, inicio y fin de
+    descanso) de los horarios de hoy y de ayer (turnos nocturnos que
+    continúan hoy).
+    """
+    today = now.weekday()
+    minute = now.hour * 60 + now.minute
+    hours = {}
+    for employee_id, day_of_week, *times in schedules:
+        # Día relativo a hoy: 0 para hoy, -1 para ayer
+        offset = 0 if day_of_week == today else -1
+        remaining = sum(
+            weight * max(0, end - max(start, minute))
+            for start, end, weight in schedule_intervals(offset, *times)
+        )
+        hours[employee_id] = hours.get(employee_id, 0) + remaining / 60
+    return hours
+
+
+def available_employees(now=None):
+    """
+    Empleados activos con turno hoy, con sus horas libres y habilidades
+
+    Usa dos consultas: los horarios de hoy y ayer con las habilidades del
+    empleado, y la carga de tareas abiertas por empleado.
+    """
+    now = timezone.localtime(now)
+    today = now.weekday()
+    rows = WorkSchedule.objects.active().filter(
+        employee__is_active=True, day_of_week__in=[today, (today - 1) % 7]
+    ).values_list(
+        'employee_id', 'day_of_week', 'start_time', 'end_time', 'break_start', 'break_end', 'employee__skills'
+    )
+    schedules, skills = [], {}
+    for *schedule, employee_skills in rows:
+        schedules.append(schedule)
+        skills[schedule[0]] = employee_skills or []
+    shift_hours = remaining_shift_hours(now, schedules)
+
+    default_hours = Decimal(str(settings.TASK_ASSIGNMENT_DEFAULT_HOURS))
+    load = dict(
+        Task.objects.active().filter(assigned_to__isnull=False, status__in=LOAD_STATUSES)
+        .order_by().values('assigned_to')
+        .annotate(hours=Sum(Coalesce('estimated_hours', Value(default_hours), output_field=DecimalField())))
+        .values_list('assigned_to', 'hours')
+    )
+    return [
+        (employee_id, hours - float(load.get(employee_id) or 0), skills[employee_id])
+        for employee_id, hours in shift_hours.items()
+    ]
+
+
+def _claim_pending_tasks(batch_size):
+    """
+    Bloquea las siguientes batch_size tareas de la cola, por prioridad y
+    vencimiento (una consulta por prioridad sobre task_unassigned_queue_idx)
+
+    Otro despachador concurrente omite las filas bloqueadas.
+    """
+    claimed = []
+    for priority in PRIORITY_ORDER:
+        if len(claimed) >= batch_size:
+            break
+        claimed += list(
+            Task.objects.active()
+            .select_for_update(skip_locked=True)
+            .filter(status='pending', assigned_to__isnull=True, priority=priority)
+            .order_by('due_date', 'id')
+            .only('id', 'priority', 'due_date', 'estimated_hours', 'category')[:batch_size - len(claimed)]
+        )
+    return claimed
+
+
+def assign_pending_tasks(batch_size=None, now=None, dry_run=False):
+    """
+    Asigna un lote de tareas pendientes sin asignar
+
+    Escribe las asignaciones con bulk_update y emite tasks_assigned.
+    Retorna un resumen con las tareas consideradas, asignadas y los
+    empleados disponibles.
+    """
+    batch_size = batch_size or settings.TASK_ASSIGNMENT_BATCH_SIZE
+    default_hours = settings.TASK_ASSIGNMENT_DEFAULT_HOURS
+    categories = active_reference_objects(TaskCategory)
+    with transaction.atomic():
+        tasks = _claim_pending_tasks(batch_size)
+        employees = available_employees(now) if tasks else []
+        assignments = assign(
+            [
+                (
+                    task.pk,
+                    float(task.estimated_hours) if task.estimated_hours else default_hours,
+                    categories[task.category_id].required_skills if task.category_id in categories else [],
+                )
+                for task in tasks
+            ],
+            employees,
+        )
+        if assignments and not dry_run:
+            updated_at = timezone.now()
+            assigned = [task for task in tasks if task.pk in assignments]
+            for task in assigned:
+                task.assigned_to_id = assignments[task.pk]
+                task.updated_at = updated_at
+            Task.objects.bulk_update(assigned, ['assigned_to', 'updated_at'], batch_size=1000)
+            employee_ids = set(assignments.values())
+            transaction.on_commit(lambda: tasks_assigned.send(
+                sender=Task, task_ids=list(assignments), employee_ids=employee_ids
+            ))
+    return {
+        'tasks': len(tasks),
+        'assigned': len(assignments),
+        'unassigned': len(tasks) - len(assignments),
+        'employees': sum(1 for _, hours, _ in employees if hours > 0),
+    }
+
+
+def benchmark_assignment(tasks=10000, employees=1000, seed=0):
+    """
+    Retorna una función que ejecuta assign con datos sintéticos, para
+    core.benchmarks (no usa la base de datos)
+    """
+    rng = random.Random(seed)
+    skill_names = ['montacargas', 'picking', 'inventario', 'despacho', 'recepción', 'empaque']
+    requirements = [[]] + [[skill] for skill in skill_names] + [['montacargas', 'despacho']]
+    task_rows = [
+        (index, rng.choice([0.5, 1, 1, 2, 4]), rng.choice(requirements))
+        for index in range(tasks)
+    ]
+    employee_rows = [
+        (index, rng.uniform(4, 9), rng.sample(skill_names, rng.randint(1, 3)))
+        for index in range(employees)
+    ]
+
+    return lambda: assign(task_rows, employee_rows)
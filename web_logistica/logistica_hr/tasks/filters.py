@@ -0,0 +1,68 @@
+"""
+Filtros para la aplicación tasks
+"""
+
+import django_filters
+
+from django import forms
+from django.db.models.functions import Now
+from django.utils.translation import gettext_lazy as _
+
+from logistica_hr.employees.hierarchy import subtree_q
+from .models import Task
+
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    """
+    Filtro por lista de valores separados por coma
+    """
+
+
+class TaskBoardFilterForm(forms.Form):
+    """
+    Formulario de validación del tablero de tareas
+
+    La prioridad solo se puede filtrar junto al estado para que la consulta
+    use el índice compuesto (status, priority).
+    """
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('priority') and not cleaned_data.get('status'):
+            raise forms.ValidationError(
+                _('El filtro de prioridad requiere el filtro de estado')
+            )
+        return cleaned_data
+
+
+class TaskBoardFilter(django_filters.FilterSet):
+    """
+    Filtros del tablero de tareas
+
+    Cada filtro está respaldado por un índice de Task: (status, priority),
+    (assigned_to, status) o (due_date, id); manager (usuario jefe) lee los
+    subordinados de la clausura ReportingLine en una subconsulta. Al agregar
+    un filtro se debe registrar su caso en TASK_BOARD_PLAN_CASES
+    (tasks/selectors.py) para que check_task_query_plans verifique su plan
+    de ejecución.
+    """
+    status = CharInFilter(field_name='status', lookup_expr='in')
+    priority = CharInFilter(field_name='priority', lookup_expr='in')
+    assigned_to = django_filters.NumberFilter(field_name='assigned_to')
+    manager = django_filters.NumberFilter(method='filter_manager')
+    due_after = django_filters.IsoDateTimeFilter(field_name='due_date', lookup_expr='gte')
+    due_before = django_filters.IsoDateTimeFilter(field_name='due_date', lookup_expr='lt')
+    overdue = django_filters.BooleanFilter(method='filter_overdue')
+
+    class Meta:
+        model = Task
+        fields = []
+        form = TaskBoardFilterForm
+
+    def filter_manager(self, queryset, name, value):
+        return queryset.filter(subtree_q(int(value), 'assigned_to'))
+
+    def filter_overdue(self, queryset, name, value):
+        if value:
+            return queryset.filter(status__in=Task.OPEN_STATUSES, due_date__lt=Now())
+        return queryset
@@ -0,0 +1,31 @@
+"""
+Comando para asignar automáticamente las tareas pendientes sin asignar
+"""
+
+from django.core.management.base import BaseCommand
+
+from logistica_hr.tasks.assignment import assign_pending_tasks
+
+
+class Command(BaseCommand):
+    help = 'Asigna las tareas pendientes sin asignar a los empleados con turno según su carga y habilidades'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Tareas por lote. Por defecto TASK_ASSIGNMENT_BATCH_SIZE.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Calcula las asignaciones sin guardarlas'
+        )
+
+    def handle(self, *args, **options):
+        summary = assign_pending_tasks(options['batch_size'], dry_run=options['dry_run'])
+        prefix = '[simulación] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{summary['assigned']} de {summary['tasks']} tareas asignadas "
+            f"entre {summary['employees']} empleados disponibles"
+        ))
@@ -0,0 +1,42 @@
+"""
+Comando para verificar que las consultas del tablero de tareas usan índices
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from logistica_hr.core.queryplan import full_table_scans
+from logistica_hr.tasks.models import Task
+from logistica_hr.tasks.selectors import task_board_plan_querysets, untested_board_filters
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta EXPLAIN sobre cada combinación de filtros del tablero de tareas '
+        'y falla si alguna lee la tabla de tareas completa'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Muestra el plan completo de cada consulta'
+        )
+
+    def handle(self, *args, **options):
+        missing = untested_board_filters()
+        if missing:
+            raise CommandError(
+                f"Filtros del tablero sin caso en TASK_BOARD_PLAN_CASES: {', '.join(missing)}"
+            )
+
+        failures = []
+        for params, queryset in task_board_plan_querysets():
+            scans = full_table_scans(queryset, [Task._meta.db_table])
+            if options['verbose_plans']:
+                self.stdout.write(f'{params}:\n  {queryset.explain()}')
+            if scans:
+                failures.append(f"{params}: {'; '.join(scans)}")
+
+        if failures:
+            raise CommandError('Consultas con lectura secuencial:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('Todas las consultas del tablero usan índices'))
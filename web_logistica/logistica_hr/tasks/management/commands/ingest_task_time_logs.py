@@ -0,0 +1,44 @@
+"""
+Comando para cargar registros de tiempo de tareas desde archivos NDJSON o CSV
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from logistica_hr.core.ingestion import SUPPORTED_FORMATS
+from logistica_hr.tasks.services import ingest_task_time_logs
+
+
+class Command(BaseCommand):
+    help = 'Carga masiva de TaskTimeLog (upsert por tarea, empleado e inicio)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Ruta del archivo a cargar')
+        parser.add_argument(
+            '--input-format',
+            choices=SUPPORTED_FORMATS,
+            help='Formato del archivo. Por defecto se deduce de la extensión.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Cantidad de filas por sentencia INSERT'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['input_format'] or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        try:
+            with open(path, 'rb') as stream:
+                report = ingest_task_time_logs(stream, file_format, batch_size=options['batch_size'])
+        except OSError as exc:
+            raise CommandError(f'No se pudo leer el archivo: {exc}')
+
+        for error in report['errors']:
+            self.stderr.write(json.dumps(error, ensure_ascii=False))
+        self.stdout.write(self.style.SUCCESS(
+            f"Filas recibidas: {report['received']}, escritas: {report['written']}, "
+            f"rechazadas: {report['rejected']}"
+        ))
@@ -2,11 +2,15 @@
 Modelos para la aplicación tasks
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, ExpressionWrapper, F, Q, Value, When
+from django.db.models.functions import Cast, Least, Now
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator
 
-from logistica_hr.core.models import BaseModel
+from logistica_hr.core.expressions import DurationSeconds
+from logistica_hr.core.indexes import TrigramIndex
+from logistica_hr.core.models import ActiveQuerySet, BaseModel
 from logistica_hr.users.models import User
 from logistica_hr.employees.models import Employee
 
@@ -34,6 +38,11 @@ class TaskCategory(BaseModel):
         validators=[MinValueValidator(1), MaxValueValidator(5)],
         verbose_name=_('Prioridad')
     )
+    required_skills = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name=_('Habilidades Requeridas')
+    )
 
     class Meta:
         verbose_name = _('Categoría de Tarea')
@@ -44,6 +53,47 @@ class TaskCategory(BaseModel):
         return self.name
 
 
+class TaskQuerySet(ActiveQuerySet):
+    """
+    QuerySet para tareas con cálculos en base de datos
+    """
+
+    def overdue(self):
+        """Filtra las tareas vencidas usando los índices de estado y fecha"""
+        return self.filter(status__in=Task.OPEN_STATUSES, due_date__lt=Now())
+
+    def with_is_overdue(self):
+        """Anota is_overdue_db, equivalente a Task.is_overdue"""
+        return self.annotate(
+            is_overdue_db=Case(
+                When(
+                    Q(due_date__lt=Now()) & ~Q(status__in=Task.CLOSED_STATUSES),
+                    then=Value(True),
+                ),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            )
+        )
+
+    def with_progress_percentage(self):
+        """Anota progress_percentage_db, equivalente a Task.progress_percentage"""
+        has_hours = (
+            Q(estimated_hours__isnull=False) & ~Q(estimated_hours=0)
+            & Q(actual_hours__isnull=False) & ~Q(actual_hours=0)
+        )
+        ratio = (
+            Cast('actual_hours', models.FloatField()) * 100
+            / Cast('estimated_hours', models.FloatField())
+        )
+        return self.annotate(
+            progress_percentage_db=Case(
+                When(has_hours, then=Least(Value(100.0), ratio)),
+                default=Value(0.0),
+                output_field=models.FloatField(),
+            )
+        )
+
+
 class Task(BaseModel):
     """
     Modelo principal para tareas
@@ -63,6 +113,9 @@ class Task(BaseModel):
         ('urgent', _('Urgente')),
     ]
 
+    CLOSED_STATUSES = ['completed', 'cancelled']
+    OPEN_STATUSES = ['pending', 'in_progress', 'on_hold']
+
     title = models.CharField(
         max_length=200,
         verbose_name=_('Título')
@@ -78,9 +131,12 @@ class Task(BaseModel):
         related_name='tasks',
         verbose_name=_('Categoría')
     )
+    # Las tareas pendientes sin asignar las reparte assignment.assign_pending_tasks
     assigned_to = models.ForeignKey(
         Employee,
         on_delete=models.CASCADE,
+        null=True,
+        blank=True,
         related_name='assigned_tasks',
         verbose_name=_('Asignado a')
     )
@@ -135,14 +191,33 @@ class Task(BaseModel):
         verbose_name=_('Notas')
     )
 
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Tarea')
         verbose_name_plural = _('Tareas')
         ordering = ['-due_date', 'priority']
         indexes = [
-            models.Index(fields=['status', 'priority']),
-            models.Index(fields=['assigned_to', 'status']),
-            models.Index(fields=['due_date']),
+            # Índices parciales: los listados solo leen tareas vigentes
+            models.Index(
+                fields=['status', 'priority'],
+                condition=Q(is_active=True),
+                name='task_active_status_idx'
+            ),
+            models.Index(
+                fields=['assigned_to', 'status'],
+                condition=Q(is_active=True),
+                name='task_active_assignee_idx'
+            ),
+            # Incluye id para resolver la paginación keyset (due_date, id) del tablero
+            models.Index(fields=['due_date', 'id']),
+            # Cola de tareas pendientes sin asignar, por prioridad y vencimiento
+            models.Index(
+                fields=['priority', 'due_date', 'id'],
+                condition=Q(is_active=True, status='pending', assigned_to__isnull=True),
+                name='task_unassigned_queue_idx'
+            ),
+            TrigramIndex('title', name='task_title_trgm'),
         ]
 
     def __str__(self):
@@ -151,7 +226,7 @@ class Task(BaseModel):
     @property
     def is_overdue(self):
         from django.utils import timezone
-        return self.due_date < timezone.now() and self.status not in ['completed', 'cancelled']
+        return self.due_date < timezone.now() and self.status not in self.CLOSED_STATUSES
 
     @property
     def progress_percentage(self):
@@ -159,6 +234,17 @@ class Task(BaseModel):
             return min(100, (self.actual_hours / self.estimated_hours) * 100)
         return 0
 
+    # Estado leído de la base de datos (None si no se cargó) y usuario que
+    # se registra en el próximo cambio de estado
+    _loaded_status = None
+    status_changed_by = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
     def save(self, *args, **kwargs):
         if self.status == 'completed' and not self.completion_date:
             from django.utils import timezone
@@ -166,7 +252,45 @@ class Task(BaseModel):
         elif self.status == 'in_progress' and not self.start_date:
             from django.utils import timezone
             self.start_date = timezone.now()
-        super().save(*args, **kwargs)
+
+        # Los cambios de estado (y la creación) quedan en TaskStatusChange;
+        # QuerySet.update y bulk_create no los registran
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        record_status = (update_fields is None or 'status' in update_fields) and (
+            adding or (self._loaded_status is not None and self._loaded_status != self.status)
+        )
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            if record_status:
+                # Al crear la tarea, el cambio se atribuye a quien la asignó
+                changed_by = self.status_changed_by
+                TaskStatusChange.objects.create(
+                    task=self,
+                    from_status='' if adding else self._loaded_status,
+                    to_status=self.status,
+                    changed_by_id=changed_by.pk if changed_by else (self.assigned_by_id if adding else None),
+                )
+        self._loaded_status = self.status
+
+
+class TaskTimeLogQuerySet(ActiveQuerySet):
+    """
+    QuerySet para registros de tiempo con cálculos en base de datos
+    """
+
+    def with_duration_hours(self):
+        """Anota duration_hours_db, equivalente a TaskTimeLog.duration_hours"""
+        duration = ExpressionWrapper(
+            F('end_time') - F('start_time'), output_field=models.DurationField()
+        )
+        return self.annotate(
+            duration_hours_db=Case(
+                When(end_time__isnull=False, then=DurationSeconds(duration) / 3600),
+                default=Value(0.0),
+                output_field=models.FloatField(),
+            )
+        )
 
 
 class TaskTimeLog(BaseModel):
@@ -202,10 +326,22 @@ class TaskTimeLog(BaseModel):
         verbose_name=_('Es Descanso')
     )
 
+    objects = TaskTimeLogQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Registro de Tiempo')
         verbose_name_plural = _('Registros de Tiempo')
         ordering = ['-start_time']
+        indexes = [
+            # Línea de tiempo de la tarea (keyset por fecha e id)
+            models.Index(fields=['task', 'start_time', 'id'], name='timelog_task_start_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['task', 'employee', 'start_time'],
+                name='uniq_time_log_task_employee_start',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.task.title} - {self.employee} - {self.start_time.date()}"
@@ -251,10 +387,58 @@ class TaskComment(BaseModel):
         verbose_name = _('Comentario de Tarea')
         verbose_name_plural = _('Comentarios de Tareas')
         ordering = ['-created_at']
+        indexes = [
+            # Línea de tiempo de la tarea (keyset por fecha e id)
+            models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.task.title} - {self.author} - {self.created_at.date()}"
 
 
+class TaskStatusChange(models.Model):
+    """
+    Evento de cambio de estado de una tarea, registrado por Task.save()
+    """
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='status_changes',
+        verbose_name=_('Tarea')
+    )
+    from_status = models.CharField(
+        max_length=20,
+        choices=Task.STATUS_CHOICES,
+        blank=True,
+        verbose_name=_('Estado Anterior')
+    )
+    to_status = models.CharField(
+        max_length=20,
+        choices=Task.STATUS_CHOICES,
+        verbose_name=_('Estado Nuevo')
+    )
+    changed_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='task_status_changes',
+        verbose_name=_('Cambiado por')
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Fecha de creación')
+    )
+
+    class Meta:
+        verbose_name = _('Cambio de Estado de Tarea')
+        verbose_name_plural = _('Cambios de Estado de Tareas')
+        ordering = ['-created_at']
+        indexes = [
+            # Línea de tiempo de la tarea (keyset por fecha e id)
+            models.Index(fields=['task', 'created_at', 'id'], name='status_change_task_idx'),
+        ]
 
+    def __str__(self):
+        return f"{self.task_id}: {self.from_status or '-'} -> {self.to_status}"
 
@@ -0,0 +1,150 @@
+"""
+Selectores para la aplicación tasks
+"""
+
+from django.db import connection, models
+from django.db.models import F, Q, Value
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
+
+from .filters import TaskBoardFilter
+from .models import Task, TaskComment, TaskStatusChange, TaskTimeLog
+
+TASK_BOARD_KEYSET = ('due_date', 'id')
+
+# Orden descendente de la línea de tiempo; kind desempata eventos simultáneos
+TASK_TIMELINE_KEYSET = ('occurred_at', 'kind', 'entry_id')
+
+# Tipo de evento -> (modelo, campo de fecha, usuario, texto, fin, estado anterior, estado nuevo)
+TIMELINE_SOURCES = {
+    'comment': (TaskComment, 'created_at', 'author', 'content', None, None, None),
+    'status_change': (TaskStatusChange, 'created_at', 'changed_by', None, None, 'from_status', 'to_status'),
+    'time_log': (TaskTimeLog, 'start_time', 'employee__user', 'description', 'end_time', None, None),
+}
+TIMELINE_KINDS = list(TIMELINE_SOURCES)
+TIMELINE_COLUMNS = [
+    'occurred_at', 'kind', 'entry_id', 'user_id', 'user_name', 'text',
+    'ended_at', 'status_before', 'status_after',
+]
+
+# Casos de filtros del tablero cuyo plan de ejecución debe usar índices.
+# Cada filtro de TaskBoardFilter debe aparecer en al menos un caso.
+TASK_BOARD_PLAN_CASES = [
+    {},
+    {'status': 'pending'},
+    {'status': 'pending,in_progress', 'priority': 'high,urgent'},
+    {'assigned_to': '1'},
+    {'assigned_to': '1', 'status': 'in_progress'},
+    {'manager': '1', 'status': 'pending,in_progress'},
+    {'due_after': '2024-01-01T00:00:00Z', 'due_before': '2024-02-01T00:00:00Z'},
+    {'overdue': 'true'},
+]
+
+
+def task_board_queryset():
+    """
+    Queryset base del tablero (solo tareas vigentes) con las relaciones que
+    serializa la API
+    """
+    return Task.objects.active().select_related('category', 'assigned_to__user')
+
+
+def task_board_plan_querysets(page_size=20):
+    """
+    Retorna (caso, queryset) para cada caso de TASK_BOARD_PLAN_CASES
+
+    Cada caso se evalúa en la primera página y en una página posterior
+    (con la condición keyset aplicada), tal como los ejecuta la API.
+    """
+    from .views import TaskBoardPagination
+
+    pagination = TaskBoardPagination()
+    after = pagination.keyset_filter([timezone.now(), 0])
+    querysets = []
+    for params in TASK_BOARD_PLAN_CASES:
+        filterset = TaskBoardFilter(params, queryset=task_board_queryset())
+        if not filterset.is_valid():
+            raise ValueError(f"Caso de plan inválido {params}: {filterset.errors}")
+        queryset = filterset.qs.order_by(*TASK_BOARD_KEYSET)
+        querysets.append((params, queryset[:page_size + 1]))
+        querysets.append(({**params, 'cursor': '...'}, queryset.filter(after)[:page_size + 1]))
+    return querysets
+
+
+def untested_board_filters():
+    """
+    Retorna los filtros del tablero que no tienen caso de plan registrado
+    """
+    covered = {name for params in TASK_BOARD_PLAN_CASES for name in params}
+    return sorted(set(TaskBoardFilter.base_filters) - covered)
+
+
+def _timeline_column(field, output_field):
+    """
+    Columna de una fuente de la línea de tiempo, o NULL con tipo explícito
+    si no la tiene (PostgreSQL no deduce el tipo de un NULL en un UNION)
+    """
+    return F(field) if field else Cast(Value(None), output_field=output_field)
+
+
+def _timeline_branch(kind, task_id, before=None, since=None):
+    """
+    Consulta de un tipo de evento con las columnas comunes de la línea de
+    tiempo, filtrada por la posición del cursor (before) y la fecha since
+    """
+    model, date_field, user, text, ended, from_status, to_status = TIMELINE_SOURCES[kind]
+    queryset = model.objects.filter(task_id=task_id)
+    if model is not TaskStatusChange:
+        queryset = queryset.active()
+    if since:
+        queryset = queryset.filter(**{f'{date_field}__gte': since})
+    if before:
+        occurred_at, cursor_kind, entry_id = before
+        # Condición (fecha, kind, id) < cursor con kind constante en la rama
+        condition = Q(**{f'{date_field}__lt': occurred_at})
+        if kind < cursor_kind:
+            condition |= Q(**{date_field: occurred_at})
+        elif kind == cursor_kind:
+            condition |= Q(**{date_field: occurred_at, 'id__lt': entry_id})
+        queryset = queryset.filter(condition)
+
+    # Las anotaciones se definen en el mismo orden en todas las ramas para
+    # que las columnas del UNION coincidan
+    queryset = queryset.order_by().annotate(
+        occurred_at=F(date_field),
+        kind=Value(kind, output_field=models.CharField()),
+        entry_id=F('id'),
+        user_id=F(user),
+        user_name=Concat(f'{user}__first_name', Value(' '), f'{user}__last_name',
+                         output_field=models.CharField()),
+        text=_timeline_column(text, models.TextField()),
+        ended_at=_timeline_column(ended, models.DateTimeField()),
+        status_before=_timeline_column(from_status, models.CharField()),
+        status_after=_timeline_column(to_status, models.CharField()),
+    ).values(*TIMELINE_COLUMNS)
+    return queryset
+
+
+def task_timeline(task_id, kinds=None, before=None, since=None, limit=50):
+    """
+    Retorna hasta limit eventos de la tarea (registros de tiempo, comentarios
+    y cambios de estado), del más reciente al más antiguo
+
+    Los tipos se combinan en la base de datos con UNION ALL en una sola
+    consulta. before es la clave (occurred_at, kind, entry_id) del último
+    evento de la página anterior y since la fecha mínima.
+    """
+    ordering = [f'-{field}' for field in TASK_TIMELINE_KEYSET]
+    branches = [
+        _timeline_branch(kind, task_id, before=before, since=since)
+        for kind in kinds or TIMELINE_KINDS
+    ]
+    if len(branches) == 1:
+        return list(branches[0].order_by(*ordering)[:limit])
+    if connection.features.supports_slicing_ordering_in_compound:
+        # Cada rama aporta a lo sumo una página, leída en el orden del índice
+        # (task, fecha, id)
+        branches = [branch.order_by('-occurred_at', '-entry_id')[:limit] for branch in branches]
+    queryset = branches[0].union(*branches[1:], all=True)
+    return list(queryset.order_by(*ordering)[:limit])
+
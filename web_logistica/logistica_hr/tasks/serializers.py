@@ -0,0 +1,50 @@
+"""
+Serializadores para la aplicación tasks
+"""
+
+from rest_framework import serializers
+
+from .models import Task
+
+
+class TaskSerializer(serializers.ModelSerializer):
+    """
+    Serializador para tareas
+    """
+    category_name = serializers.CharField(source='category.name', read_only=True, default=None)
+    assigned_to_code = serializers.CharField(source='assigned_to.employee_id', read_only=True, default=None)
+    assigned_to_name = serializers.CharField(
+        source='assigned_to.user.get_full_name', read_only=True, default=None
+    )
+    is_overdue = serializers.BooleanField(read_only=True)
+    progress_percentage = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'title', 'description', 'category', 'category_name',
+            'assigned_to', 'assigned_to_code', 'assigned_to_name', 'assigned_by',
+            'status', 'priority', 'due_date', 'estimated_hours', 'actual_hours',
+            'start_date', 'completion_date', 'notes', 'is_overdue',
+            'progress_percentage', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['assigned_by', 'start_date', 'completion_date', 'created_at', 'updated_at']
+
+
+class TaskTimelineEntrySerializer(serializers.Serializer):
+    """
+    Serializador de un evento de la línea de tiempo de una tarea
+    """
+    kind = serializers.CharField()
+    id = serializers.IntegerField(source='entry_id')
+    occurred_at = serializers.DateTimeField()
+    user = serializers.IntegerField(source='user_id', allow_null=True)
+    user_name = serializers.SerializerMethodField()
+    text = serializers.CharField(allow_null=True)
+    ended_at = serializers.DateTimeField(allow_null=True)
+    from_status = serializers.CharField(source='status_before', allow_null=True)
+    to_status = serializers.CharField(source='status_after', allow_null=True)
+
+    def get_user_name(self, entry):
+        return (entry['user_name'] or '').strip() or None
+
@@ -0,0 +1,63 @@
+"""
+Servicios para la aplicación tasks
+"""
+
+from django.db import transaction
+
+from logistica_hr.core.ingestion import build_report, clean_columns, read_rows, resolve_lookup
+from logistica_hr.employees.models import Employee
+from .models import Task, TaskTimeLog
+
+TASK_TIME_LOG_INGEST_FIELDS = [
+    'start_time',
+    'end_time',
+    'description',
+    'is_break',
+]
+
+
+def ingest_task_time_logs(stream, file_format, batch_size=2000):
+    """
+    Carga masiva de TaskTimeLog desde NDJSON o CSV
+
+    Cada fila identifica la tarea por su id (columna task) y al empleado por su
+    código (columna employee). Las filas se insertan o actualizan por la clave
+    (task, employee, start_time); las filas cuya hora de fin no es posterior a
+    la de inicio se reportan como error en lugar de lanzar ValueError.
+    """
+    rows, read_errors = read_rows(stream, file_format)
+    row_errors = {}
+    task_ids = resolve_lookup(rows, 'task', Task.objects.all(), 'pk', row_errors, 'Tarea')
+    employee_ids = resolve_lookup(
+        rows, 'employee', Employee.objects.all(), 'employee_id', row_errors, 'Empleado'
+    )
+    cleaned = clean_columns(TaskTimeLog, rows, TASK_TIME_LOG_INGEST_FIELDS, row_errors)
+
+    latest = {}
+    for (number, _), task_id, employee_id, values in zip(rows, task_ids, employee_ids, cleaned):
+        if number in row_errors:
+            continue
+        if values['end_time'] and values['end_time'] <= values['start_time']:
+            row_errors[number] = {
+                'end_time': ['La hora de fin debe ser posterior a la hora de inicio']
+            }
+            continue
+        key = (task_id, employee_id, values['start_time'])
+        if key in latest:
+            row_errors[latest[key][0]] = {
+                '__all__': ['Reemplazada por una fila posterior con la misma tarea, empleado e inicio']
+            }
+        latest[key] = (number, TaskTimeLog(task_id=task_id, employee_id=employee_id, **values))
+
+    time_logs = [time_log for _, time_log in latest.values()]
+    with transaction.atomic():
+        TaskTimeLog.objects.bulk_create(
+            time_logs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['task', 'employee', 'start_time'],
+            # is_active no se modifica: una fila dada de baja sigue inactiva
+            update_fields=['end_time', 'description', 'is_break', 'updated_at'],
+        )
+
+    return build_report(len(rows) + len(read_errors), len(time_logs), row_errors, read_errors)
@@ -0,0 +1,10 @@
+"""
+Señales de la aplicación tasks
+"""
+
+from django.dispatch import Signal
+
+# Se emite después de que la asignación automática (assignment.py) escribe
+# las asignaciones con bulk_update, que no emite post_save;
+# argumentos: sender (Task), task_ids y employee_ids
+tasks_assigned = Signal()
@@ -0,0 +1,26 @@
+"""
+Tareas de Celery para la aplicación tasks
+"""
+
+import logging
+
+from celery import shared_task
+
+from .assignment import assign_pending_tasks
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def assign_pending_tasks_batch(batch_size=None):
+    """
+    Tarea periódica que asigna las tareas pendientes sin asignar a los
+    empleados con turno
+    """
+    summary = assign_pending_tasks(batch_size)
+    if summary['tasks']:
+        logger.info(
+            'Asignación automática: %s de %s tareas asignadas entre %s empleados',
+            summary['assigned'], summary['tasks'], summary['employees']
+        )
+    return summary
@@ -0,0 +1,257 @@
+"""
+Pruebas para la aplicación tasks
+"""
+
+import json
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+import django_filters
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from logistica_hr.employees.models import Employee
+from .assignment import assign, remaining_shift_hours
+from .filters import TaskBoardFilter
+from .models import Task, TaskTimeLog
+from .selectors import untested_board_filters
+from .services import ingest_task_time_logs
+
+
+class TaskAnnotationParityTests(TestCase):
+    """
+    Las anotaciones with_*() de Task deben coincidir con sus propiedades
+    """
+
+    def create_task(self, **values):
+        values.setdefault('due_date', timezone.now() + timedelta(days=1))
+        return Task.objects.create(title='Tarea', description='Prueba', **values)
+
+    def test_is_overdue(self):
+        now = timezone.now()
+        for status in [choice for choice, _ in Task.STATUS_CHOICES]:
+            for due_date in [now - timedelta(days=1), now + timedelta(days=1)]:
+                self.create_task(status=status, due_date=due_date)
+        tasks = list(Task.objects.with_is_overdue())
+        self.assertEqual(len(tasks), 10)
+        for task in tasks:
+            with self.subTest(status=task.status, due_date=task.due_date):
+                self.assertEqual(task.is_overdue_db, task.is_overdue)
+
+    def test_progress_percentage(self):
+        hours = [None, Decimal('0'), Decimal('0.50'), Decimal('4'), Decimal('8'), Decimal('12.25')]
+        for estimated in hours:
+            for actual in hours:
+                self.create_task(estimated_hours=estimated, actual_hours=actual)
+        for task in Task.objects.with_progress_percentage():
+            with self.subTest(estimated=task.estimated_hours, actual=task.actual_hours):
+                self.assertAlmostEqual(task.progress_percentage_db, float(task.progress_percentage))
+
+
+class TaskTimeLogAnnotationParityTests(TestCase):
+    """
+    with_duration_hours debe coincidir con TaskTimeLog.duration_hours en
+    registros abiertos, de duración cero, nocturnos y negativos
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create(username='operario')
+        employee = Employee.objects.create(user=user, employee_id='E1', hire_date=date(2020, 1, 1))
+        task = Task.objects.create(title='Tarea', description='Prueba', due_date=timezone.now())
+        start = timezone.make_aware(datetime(2024, 3, 1, 22, 15))
+        cls.logs = {
+            'open': TaskTimeLog.objects.create(task=task, employee=employee, start_time=start),
+            'regular': TaskTimeLog.objects.create(
+                task=task, employee=employee, start_time=start - timedelta(hours=10),
+                end_time=start - timedelta(hours=6, minutes=20),
+            ),
+            'overnight': TaskTimeLog.objects.create(
+                task=task, employee=employee, start_time=start + timedelta(hours=1),
+                end_time=start + timedelta(hours=8, minutes=45),
+            ),
+            'zero': TaskTimeLog.objects.create(
+                task=task, employee=employee, start_time=start + timedelta(days=1),
+            ),
+            'negative': TaskTimeLog.objects.create(
+                task=task, employee=employee, start_time=start + timedelta(days=2),
+            ),
+        }
+        # save() rechaza fin <= inicio; las cargas masivas no pasan por save()
+        TaskTimeLog.objects.filter(pk=cls.logs['zero'].pk).update(end_time=start + timedelta(days=1))
+        TaskTimeLog.objects.filter(pk=cls.logs['negative'].pk).update(
+            end_time=start + timedelta(days=2, minutes=-90)
+        )
+
+    def test_duration_hours(self):
+        logs = {log.pk: log for log in TaskTimeLog.objects.with_duration_hours()}
+        for name, log in self.logs.items():
+            with self.subTest(name):
+                log = logs[log.pk]
+                self.assertAlmostEqual(log.duration_hours_db, log.duration_hours)
+        self.assertAlmostEqual(logs[self.logs['negative'].pk].duration_hours_db, -1.5)
+
+
+class TaskBoardQueryPlanTests(TestCase):
+    """
+    Cada filtro del tablero tiene un caso en TASK_BOARD_PLAN_CASES y su plan
+    de ejecución usa índices de la tabla de tareas
+    """
+
+    def test_every_board_filter_has_plan_case(self):
+        self.assertEqual(untested_board_filters(), [])
+
+    def test_board_plans_use_indexes(self):
+        call_command('check_task_query_plans', stdout=mock.MagicMock())
+
+    def test_uncovered_filter_fails(self):
+        filters = {**TaskBoardFilter.base_filters, 'title': django_filters.CharFilter(field_name='title')}
+        with mock.patch.object(TaskBoardFilter, 'base_filters', filters):
+            with self.assertRaisesMessage(CommandError, 'title'):
+                call_command('check_task_query_plans', stdout=mock.MagicMock())
+
+    def test_unindexed_filter_fails(self):
+        # Sin orden ni is_active: ningún índice de Task sirve para la consulta
+        queryset = Task.objects.filter(description__contains='x').order_by()
+        with mock.patch(
+            'logistica_hr.tasks.management.commands.check_task_query_plans.task_board_plan_querysets',
+            return_value=[({'description': 'x'}, queryset[:21])],
+        ):
+            with self.assertRaisesMessage(CommandError, 'description'):
+                call_command('check_task_query_plans', stdout=mock.MagicMock())
+
+
+class TaskTimeLogIngestTests(TestCase):
+    """
+    Las claves de tarea inválidas se reportan como error de su fila sin
+    abortar el lote
+    """
+
+    def test_invalid_task_keys_are_row_errors(self):
+        employee = Employee.objects.create(
+            user=get_user_model().objects.create(username='operario'), employee_id='E1', hire_date=date(2020, 1, 1)
+        )
+        task = Task.objects.create(title='Tarea', description='Prueba', due_date=timezone.now())
+        rows = [
+            {'task': task.pk, 'employee': 'E1', 'start_time': '2024-03-01T08:00:00Z', 'end_time': '2024-03-01T09:00:00Z'},
+            {'task': 'abc', 'employee': 'E1', 'start_time': '2024-03-01T10:00:00Z'},
+            {'task': '99999999999999999999', 'employee': 'E1', 'start_time': '2024-03-01T11:00:00Z'},
+            {'task': task.pk + 1000, 'employee': 'E1', 'start_time': '2024-03-01T12:00:00Z'},
+            {'task': f' {task.pk} ', 'employee': 'E1', 'start_time': '2024-03-01T13:00:00Z'},
+        ]
+        report = ingest_task_time_logs('\n'.join(json.dumps(row) for row in rows), 'ndjson')
+
+        self.assertEqual(report['written'], 2)
+        self.assertEqual([error['row'] for error in report['errors']], [2, 3, 4])
+        self.assertIn('inválido', report['errors'][0]['errors']['task'][0])
+        self.assertIn('inexistente', report['errors'][2]['errors']['task'][0])
+        self.assertEqual(TaskTimeLog.objects.filter(employee=employee).count(), 2)
+
+
+def reference_assign(tasks, employees):
+    """
+    Reparto de referencia sin montículos: cada tarea va al empleado con más
+    horas libres (el de menor id en un empate) entre los que la pueden hacer
+    """
+    free = {employee_id: hours for employee_id, hours, _ in employees if hours > 0}
+    skills = {employee_id: {value.strip().lower() for value in values} for employee_id, _, values in employees}
+    assignments = {}
+    for task_id, hours, required in tasks:
+        required = {value.strip().lower() for value in required}
+        candidates = [employee_id for employee_id in free if required <= skills[employee_id]]
+        if not candidates:
+            continue
+        employee_id = max(candidates, key=lambda candidate: (free[candidate], -candidate))
+        if free[employee_id] >= hours:
+            free[employee_id] -= hours
+            assignments[task_id] = employee_id
+    return assignments
+
+
+class AssignTests(SimpleTestCase):
+    """
+    assign reparte por horas libres respetando habilidades y capacidad, y
+    corrige las entradas desactualizadas de los montículos de otros
+    conjuntos de habilidades
+    """
+
+    def test_stale_entries_across_skill_sets(self):
+        employees = [(1, 8, [' Montacargas ']), (2, 6, [])]
+        tasks = [
+            (1, 1, ['montacargas']),
+            (2, 1, []),
+            # El montículo de montacargas aún tiene a 1 con 7 horas (quedan 6)
+            (3, 1, ['MONTACARGAS']),
+            # El montículo general tiene a 1 con 6 horas (quedan 5)
+            (4, 6, []),
+            (5, 5.5, []),
+            (6, 5, []),
+        ]
+        self.assertEqual(assign(tasks, employees), {1: 1, 2: 1, 3: 1, 4: 2, 6: 1})
+
+    def test_skill_filter(self):
+        employees = [(1, 8, ['picking']), (2, 4, ['montacargas', 'despacho'])]
+        tasks = [
+            (1, 1, ['montacargas']),
+            (2, 1, ['montacargas', 'despacho']),
+            (3, 1, ['montacargas', 'picking']),
+            (4, 1, ['inventario']),
+            (5, 1, ['picking']),
+        ]
+        self.assertEqual(assign(tasks, employees), {1: 2, 2: 2, 5: 1})
+
+    def test_capacity_exhaustion(self):
+        employees = [(1, 2, []), (2, 0, []), (3, -1.5, [])]
+        tasks = [(index, 1, []) for index in range(4)]
+        self.assertEqual(assign(tasks, employees), {0: 1, 1: 1})
+        # Una tarea mayor que cualquier capacidad no bloquea a las siguientes
+        self.assertEqual(assign([(0, 3, []), (1, 2, [])], employees), {1: 1})
+
+    def test_matches_reference(self):
+        skill_names = ['montacargas', 'picking', 'despacho']
+        requirements = [[], ['montacargas'], ['picking'], ['montacargas', 'despacho']]
+        for seed in range(5):
+            rng = random.Random(seed)
+            employees = [
+                (index, rng.choice([0, 2, 4, 6, 8]), rng.sample(skill_names, rng.randint(0, 3)))
+                for index in range(30)
+            ]
+            tasks = [(index, rng.choice([0.5, 1, 2, 4]), rng.choice(requirements)) for index in range(200)]
+            with self.subTest(seed=seed):
+                self.assertEqual(assign(tasks, employees), reference_assign(tasks, employees))
+
+
+class RemainingShiftHoursTests(SimpleTestCase):
+    """
+    Horas restantes del turno de hoy y de los turnos nocturnos de ayer,
+    descontando la parte del descanso que aún no transcurre
+    """
+
+    def test_remaining_hours(self):
+        # 2024-03-05 es martes (1); ayer fue lunes (0)
+        schedules = [
+            (1, 0, time(22), time(6), None, None),
+            (2, 1, time(4), time(12), time(10), time(10, 30)),
+            (3, 1, time(8), time(16), time(12), time(13)),
+            (3, 0, time(20), time(2), None, None),
+            (4, 0, time(8), time(16), None, None),
+            (5, 0, time(23), time(7), time(4), time(5, 30)),
+        ]
+        cases = [
+            (time(5), {1: 1, 2: 6.5, 3: 7, 4: 0, 5: 1.5}),
+            (time(10, 15), {1: 0, 2: 1.5, 3: 4.75, 4: 0, 5: 0}),
+            (time(16), {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}),
+        ]
+        for moment, expected in cases:
+            with self.subTest(moment):
+                now = datetime.combine(date(2024, 3, 5), moment)
+                self.assertEqual(remaining_shift_hours(now, schedules), expected)
+
+    def test_sunday_night_shift_continues_on_monday(self):
+        # 2024-03-04 es lunes; el turno del domingo (6) termina a las 02:00
+        now = datetime(2024, 3, 4, 1, 0)
+        self.assertEqual(remaining_shift_hours(now, [(1, 6, time(22), time(2), None, None)]), {1: 1})
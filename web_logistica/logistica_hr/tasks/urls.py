@@ -9,9 +9,13 @@ from . import views
 app_name = 'tasks'
 
 router = DefaultRouter()
-# router.register(r'', views.TaskViewSet)  # Comentado hasta crear las vistas
+# La vista raíz del router ocuparía la ruta vacía usada por el listado de tareas
+router.include_root_view = False
+router.register(r'', views.TaskViewSet)
 
 urlpatterns = [
+    path('time-logs/bulk/', views.TaskTimeLogBulkIngestView.as_view(), name='time-log-bulk'),
+    path('assign/', views.TaskAssignmentView.as_view(), name='task-assign'),
     path('', include(router.urls)),
 ]
 
@@ -0,0 +1,148 @@
+"""
+Vistas para la aplicación tasks
+"""
+
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from logistica_hr.core.ingestion import SUPPORTED_FORMATS, request_payload
+from logistica_hr.core.pagination import KeysetPagination
+from .assignment import assign_pending_tasks
+from .filters import TaskBoardFilter
+from .models import Task
+from .selectors import (
+    TASK_BOARD_KEYSET, TASK_TIMELINE_KEYSET, TIMELINE_KINDS, task_board_queryset, task_timeline
+)
+from .serializers import TaskSerializer, TaskTimelineEntrySerializer
+from .services import ingest_task_time_logs
+
+
+class TaskBoardPagination(KeysetPagination):
+    """
+    Paginación del tablero por (due_date, id)
+    """
+    keyset_fields = TASK_BOARD_KEYSET
+
+
+class TaskTimelinePagination(KeysetPagination):
+    """
+    Paginación de la línea de tiempo por (occurred_at, kind, entry_id),
+    del evento más reciente al más antiguo
+    """
+    keyset_fields = TASK_TIMELINE_KEYSET
+    page_size = 50
+
+    def parse_cursor_values(self, model, values):
+        occurred_at, kind, entry_id = values
+        occurred_at = parse_datetime(occurred_at)
+        if occurred_at is None or kind not in TIMELINE_KINDS:
+            raise ValueError
+        return [occurred_at, kind, int(entry_id)]
+
+    def paginate_timeline(self, request, task_id, kinds=None, since=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        before = self.decode_cursor(request, None)
+        results = task_timeline(task_id, kinds=kinds, before=before, since=since, limit=page_size + 1)
+        self.has_next = len(results) > page_size
+        results = results[:page_size]
+        self.next_values = (
+            [results[-1][field] for field in self.keyset_fields]
+            if self.has_next else None
+        )
+        return results
+
+
+class TaskViewSet(viewsets.ModelViewSet):
+    """
+    API del tablero de tareas
+
+    Solo admite filtros respaldados por índices y un orden fijo por
+    (due_date, id); no incluye búsqueda de texto ni orden arbitrario porque
+    obligarían a leer la tabla completa.
+    """
+    queryset = Task.objects.all()
+    serializer_class = TaskSerializer
+    pagination_class = TaskBoardPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = TaskBoardFilter
+
+    def get_queryset(self):
+        if self.action == 'destroy':
+            return super().get_queryset()
+        return task_board_queryset()
+
+    def perform_create(self, serializer):
+        serializer.save(assigned_by=self.request.user)
+
+    def perform_update(self, serializer):
+        serializer.save(status_changed_by=self.request.user)
+
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        """
+        Línea de tiempo de la tarea: registros de tiempo, comentarios y
+        cambios de estado en una sola consulta
+
+        Parámetros: kind (tipos separados por coma), since (fecha ISO),
+        cursor y page_size. La existencia de la tarea solo se consulta si
+        la primera página está vacía.
+        """
+        params = request.query_params
+        kinds = [kind for kind in params.get('kind', '').split(',') if kind] or None
+        try:
+            task_id = int(pk)
+        except ValueError:
+            raise Http404
+        since = parse_datetime(params['since']) if params.get('since') else None
+        if (kinds and set(kinds) - set(TIMELINE_KINDS)) or (params.get('since') and since is None):
+            return Response(
+                {'detail': 'Parámetros de la línea de tiempo inválidos'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        paginator = TaskTimelinePagination()
+        entries = paginator.paginate_timeline(request, task_id, kinds=kinds, since=since)
+        if not entries and not params.get('cursor') and not Task.objects.active().filter(pk=task_id).exists():
+            raise Http404
+        return paginator.get_paginated_response(TaskTimelineEntrySerializer(entries, many=True).data)
+
+
+class TaskTimeLogBulkIngestView(APIView):
+    """
+    Carga masiva de registros de tiempo desde los escáneres de bodega
+    """
+
+    def post(self, request):
+        stream, file_format = request_payload(request)
+        if file_format not in SUPPORTED_FORMATS:
+            return Response(
+                {'detail': f'Formato no soportado: {file_format}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(ingest_task_time_logs(stream, file_format))
+
+
+class TaskAssignmentView(APIView):
+    """
+    Asigna las tareas pendientes sin asignar a los empleados con turno
+
+    Parámetros: batch_size (opcional) y dry_run para calcular las
+    asignaciones sin guardarlas.
+    """
+
+    def post(self, request):
+        try:
+            batch_size = int(request.data.get('batch_size') or 0) or None
+        except (TypeError, ValueError):
+            return Response(
+                {'detail': 'El parámetro batch_size debe ser un número'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+        return Response(assign_pending_tasks(batch_size, dry_run=dry_run))
@@ -2,21 +2,46 @@
 URLs principales del proyecto Logistica HR
 """
 
+from django.apps import apps
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from importlib import import_module
+
+# Aplicaciones cuyos modelos registra el admin central (logistica_hr/admin.py)
+ADMIN_APPS = [
+    'logistica_hr.users',
+    'logistica_hr.employees',
+    'logistica_hr.tasks',
+    'logistica_hr.performance',
+    'logistica_hr.reports',
+]
+
+# logistica_hr no es una aplicación instalada, por lo que autodiscover no
+# importa su admin.py; se registra antes de construir las URLs del admin
+if all(apps.is_installed(app_name) for app_name in ADMIN_APPS):
+    import_module('logistica_hr.admin')
 
 urlpatterns = [
     path('', include('logistica_hr.core.urls')),  # Página principal y navegación
     path('admin/', admin.site.urls),
     # path('api/v1/users/', include('logistica_hr.users.urls')),          # Comentado temporalmente
-    # path('api/v1/employees/', include('logistica_hr.employees.urls')),  # Comentado temporalmente
-    # path('api/v1/tasks/', include('logistica_hr.tasks.urls')),          # Comentado temporalmente
-    # path('api/v1/performance/', include('logistica_hr.performance.urls')), # Comentado temporalmente
-    # path('api/v1/reports/', include('logistica_hr.reports.urls')),      # Comentado temporalmente
 ]
 
+# Aplicaciones con API habilitada (solo si están instaladas en la configuración activa)
+API_APPS = [
+    ('api/v1/employees/', 'logistica_hr.employees'),
+    ('api/v1/tasks/', 'logistica_hr.tasks'),
+    ('api/v1/performance/', 'logistica_hr.performance'),
+    ('api/v1/reports/', 'logistica_hr.reports'),
+    ('api/v1/search/', 'logistica_hr.search'),
+]
+
+for prefix, app_name in API_APPS:
+    if apps.is_installed(app_name):
+        urlpatterns.append(path(prefix, include(f'{app_name}.urls')))
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)